@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+asyncio 提交引擎
+在单个事件循环中同时生成多个逐条提交（git 后端）的仓库：
+- 每个仓库的提交依次执行，不同仓库的 git 子进程交替运行
+- 同时运行的 git 子进程数由信号量限制
+- 子进程的标准错误被完整捕获，失败时随异常一起返回
+
+与进程池相比，多个仓库共享同一个 Python 进程，内存开销只与仓库数量线性相关。
+"""
+
+import asyncio
+import logging
+import os
+import time
+from subprocess import CalledProcessError
+
+from contribute import (
+    MAINTENANCE_STEPS, ContributionGenerator, GitCommands, _command_phase, bulk_ingest_env
+)
+from metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+# 默认同时运行的 git 子进程数
+DEFAULT_CONCURRENCY = os.cpu_count() or 4
+
+
+class AsyncGitRepository(GitCommands):
+    """基于 asyncio 子进程的 Git 仓库（逐条提交，不支持 bare）
+
+    命令与环境变量由与 GitRepository 共用的 GitCommands 构造；init_repository / commit /
+    finalize / maintain 为协程，因此不是 RepositoryBackend，只能与 AsyncContributionGenerator 一起使用。
+    """
+
+    def __init__(self, directory, user_name=None, user_email=None, metrics=None,
+                 semaphore=None):
+        self.directory = directory
+        self.path = os.path.abspath(directory)
+        self.user_name = user_name
+        self.user_email = user_email
+        self.metrics = metrics or Metrics()
+        self.bare = False
+        self.semaphore = semaphore
+        self._env = bulk_ingest_env()
+        self._touched = set()
+
+    async def init_repository(self):
+        """初始化 Git 仓库"""
+        os.makedirs(self.path, exist_ok=True)
+        for commands in self._init_commands():
+            await self._run_command(commands)
+        logger.info(f"Git 仓库初始化成功: {self.directory}")
+
+    async def commit(self, message, commit_time):
+        """以指定时间提交自上次提交以来写入的文件"""
+        if self._touched:
+            commands, paths = self._stage_command()
+            await self._run_command(commands, input=paths)
+            self._touched.clear()
+        commands, env = self._commit_command(message, commit_time)
+        await self._run_command(commands, env=env)
+
+    async def finalize(self):
+        """结束生成过程（逐条提交模式无需额外处理）"""
+
+    async def maintain(self):
+        """生成结束后执行一次仓库维护，返回各步骤耗时（秒）"""
+        timings = {}
+        for name, commands in MAINTENANCE_STEPS:
+            started = time.perf_counter()
+            await self._run_command(commands)
+            timings[name] = time.perf_counter() - started
+        logger.info(f"仓库维护完成: {self.directory}")
+        return timings
+
+    async def _run_command(self, commands, env=None, input=None):
+        """执行 Git 命令（env 为空时使用批量写入配置），失败时抛出带有标准错误内容的 CalledProcessError"""
+        semaphore = self.semaphore or _UNLIMITED
+        async with semaphore:
+            with self.metrics.timer(_command_phase(commands)):
+                with self.metrics.timer('spawn'):
+                    process = await asyncio.create_subprocess_exec(
+                        *commands, cwd=self.path, env=env or self._env,
+                        stdin=asyncio.subprocess.PIPE if input is not None else None,
+                        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+                    )
+                stdout, stderr = await process.communicate(input)
+        if process.returncode != 0:
+            message = stderr.decode('utf-8', 'replace').strip()
+            logger.error(f"命令执行失败: {' '.join(commands)}: {message}")
+            raise CalledProcessError(process.returncode, commands, stdout, stderr)
+        return stdout
+
+
+class _Unlimited:
+    """不限制并发的空信号量"""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+_UNLIMITED = _Unlimited()
+
+
+class AsyncContributionGenerator(ContributionGenerator):
+    """使用 AsyncGitRepository 的贡献生成器（计划与内容规则与 ContributionGenerator 相同）"""
+
+    backend_type = AsyncGitRepository
+
+    async def generate_contributions(self, start_date, days_before, days_after):
+        """生成贡献记录"""
+        schedule = self.plan(start_date, days_before + days_after)
+        await self.run(schedule)
+
+    async def run(self, schedule, completed=0):
+        """按计划执行提交"""
+        for commit_time, message_index in schedule.commits(completed):
+            await self._make_contribution(commit_time, message_index)
+        logger.info(f"贡献记录生成完成: {self.git_repo.directory}，总共 {self.commit_count} 次提交")
+
+    async def _make_contribution(self, commit_time, message_index=None):
+        """执行一次提交"""
+        metrics = self.git_repo.metrics
+        commit_message = self._generate_commit_message(commit_time, message_index)
+
+        with metrics.timer('file_write'):
+            entry = commit_message + '\n\n'
+            self.git_repo.write_file('README.md', self.content_model.append('README.md', entry))
+
+        with metrics.timer('commit'):
+            await self.git_repo.commit(commit_message, commit_time)
+
+        self.commit_count += 1
+        metrics.inc('commits')
+
+
+async def generate_repository(git_repo, generator, start_date, days):
+    """初始化仓库并生成 days 天的贡献记录，返回提交次数"""
+    await git_repo.init_repository()
+    await generator.generate_contributions(start_date, days, 0)
+    await git_repo.finalize()
+    await git_repo.maintain()
+    return generator.commit_count
+
+
+async def run_all(jobs, concurrency=DEFAULT_CONCURRENCY):
+    """在同一事件循环中并发执行多个任务
+
+    jobs 为返回协程的可调用对象序列，调用时传入共享的信号量；
+    返回与 jobs 顺序一致的 (结果, 异常, 耗时秒数) 列表，单个任务失败不影响其他任务。
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def guarded(job):
+        started = time.perf_counter()
+        try:
+            return await job(semaphore), None, time.perf_counter() - started
+        except Exception as e:
+            return None, e, time.perf_counter() - started
+
+    return await asyncio.gather(*(guarded(job) for job in jobs))
+
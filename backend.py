@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+仓库后端接口
+生成器只通过以下接口操作仓库，新的后端实现这些方法后即可在 BACKENDS 中注册：
+- 生命周期: init_repository / open_repository / finalize / maintain
+- 写入: write_file 暂存文件内容，commit 以指定时间提交
+- 状态: head_commit / latest_commit_time / head_state / read_file
+- 远程: has_remote / add_remote / push_changes
+
+同时提供不访问磁盘的内存后端，只以紧凑数组记录每次提交的时间与消息校验值，
+用于对计划与生成逻辑做大规模基准测试和性质测试。
+"""
+
+import hashlib
+import logging
+import os
+import zlib
+from abc import ABC, abstractmethod
+from array import array
+
+from metrics import Metrics
+from schedule import from_wall_seconds, to_wall_seconds
+
+logger = logging.getLogger(__name__)
+
+
+class RepositoryBackend(ABC):
+    """仓库后端的公共接口"""
+
+    # 是否支持不带工作区的 bare 仓库
+    supports_bare = False
+
+    def __init__(self, directory, user_name=None, user_email=None, metrics=None, bare=False):
+        if bare and not self.supports_bare:
+            raise ValueError("git 后端需要工作区，bare 模式请使用 fast-import 或 pack 后端")
+        self.directory = directory
+        self.path = os.path.abspath(directory)
+        self.user_name = user_name
+        self.user_email = user_email
+        self.metrics = metrics or Metrics()
+        # bare 仓库没有工作区和暂存区，文件内容只以 Git 对象的形式写入
+        self.bare = bare
+
+    @abstractmethod
+    def init_repository(self):
+        """创建新的空仓库"""
+
+    @abstractmethod
+    def open_repository(self, discard_changes=False):
+        """打开已有仓库，新提交接在当前分支之后
+
+        discard_changes 为真时（续跑）可以丢弃中断时遗留的未提交更改，
+        否则有未提交的更改时应抛出 ValueError。
+        """
+
+    @abstractmethod
+    def write_file(self, path, content):
+        """写入文件的完整内容，在下一次提交时生效"""
+
+    @abstractmethod
+    def commit(self, message, commit_time):
+        """以指定时间提交自上次提交以来写入的文件"""
+
+    def finalize(self):
+        """结束生成过程，使全部提交对外可见（逐条提交的后端无需额外处理）"""
+
+    def maintain(self, incremental=False):
+        """生成结束后执行一次仓库维护（incremental 为真时只处理新增部分），返回各步骤耗时（秒）"""
+        return {}
+
+    @abstractmethod
+    def head_commit(self):
+        """返回 HEAD 指向的提交 ID，空仓库返回 None"""
+
+    @abstractmethod
+    def latest_commit_time(self):
+        """返回最新一次提交的作者时间（本地时间），空仓库返回 None"""
+
+    @abstractmethod
+    def head_state(self, base=None):
+        """返回 (base 之后 HEAD 包含的提交数, HEAD 的作者时间)，空仓库返回 (0, None)"""
+
+    @abstractmethod
+    def read_file(self, path):
+        """读取 HEAD 中的文件内容，文件不存在时返回 None"""
+
+    @abstractmethod
+    def has_remote(self, name='origin'):
+        """判断是否已配置指定的远程仓库"""
+
+    @abstractmethod
+    def add_remote(self, repository_url):
+        """添加远程仓库"""
+
+    @abstractmethod
+    def push_changes(self):
+        """推送更改到远程仓库"""
+
+    def create_bundle(self, path):
+        """把完整历史写入单个 bundle 文件"""
+        raise ValueError(f"{type(self).__name__} 不支持 bundle")
+
+    def import_bundle(self, path):
+        """从 bundle 文件创建仓库，返回导入的提交数"""
+        raise ValueError(f"{type(self).__name__} 不支持 bundle")
+
+
+class MemoryRepository(RepositoryBackend):
+    """内存后端：不访问磁盘，只记录提交历史
+
+    每次提交在数组中记录墙上时间秒数和提交消息的 CRC-32（共 12 字节），
+    文件只保留最新内容，百万级提交也只占用十几 MB 内存。
+    """
+
+    supports_bare = True
+
+    def __init__(self, directory='memory', user_name=None, user_email=None, metrics=None,
+                 bare=False):
+        super().__init__(directory, user_name, user_email, metrics, bare)
+        self.timestamps = array('q')
+        self.messages = array('I')
+        self.files = {}
+        self.remote = None
+        self._pending = {}
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def init_repository(self):
+        """清空已记录的历史"""
+        del self.timestamps[:]
+        del self.messages[:]
+        self.files.clear()
+        self._pending.clear()
+
+    def open_repository(self, discard_changes=False):
+        """保留已记录的历史，续跑时丢弃未提交的文件"""
+        if self._pending and not discard_changes:
+            raise ValueError("内存仓库有未提交的文件")
+        self._pending.clear()
+
+    def write_file(self, path, content):
+        """暂存文件内容"""
+        self._pending[path] = content
+
+    def commit(self, message, commit_time):
+        """记录一次提交"""
+        self.timestamps.append(to_wall_seconds(commit_time))
+        self.messages.append(zlib.crc32(message.encode('utf-8')))
+        if self._pending:
+            self.files.update(self._pending)
+            self._pending.clear()
+
+    def head_commit(self):
+        """以已记录的提交数作为 HEAD 的标识，空仓库返回 None"""
+        return str(len(self.timestamps)) if self.timestamps else None
+
+    def latest_commit_time(self):
+        """返回最新一次提交的时间，空仓库返回 None"""
+        return from_wall_seconds(self.timestamps[-1]) if self.timestamps else None
+
+    def head_state(self, base=None):
+        """返回 (base 之后的提交数, HEAD 的时间)，空仓库返回 (0, None)"""
+        if not self.timestamps:
+            return 0, None
+        return len(self.timestamps) - int(base or 0), self.latest_commit_time()
+
+    def read_file(self, path):
+        """读取最新提交中的文件内容，文件不存在时返回 None"""
+        return self.files.get(path)
+
+    def has_remote(self, name='origin'):
+        """判断是否已记录远程仓库"""
+        return name == 'origin' and self.remote is not None
+
+    def add_remote(self, repository_url):
+        """记录远程仓库链接"""
+        self.remote = repository_url
+
+    def push_changes(self):
+        """内存后端没有可推送的对象，只记录日志"""
+        logger.info(f"内存后端跳过推送: {self.remote}")
+
+    def digest(self):
+        """历史的摘要（提交时间、消息与最终文件内容），相同历史的摘要相同"""
+        sha = hashlib.sha1(self.timestamps.tobytes())
+        sha.update(self.messages.tobytes())
+        for path in sorted(self.files):
+            sha.update(f"{path}\0{self.files[path]}\0".encode('utf-8'))
+        return sha.hexdigest()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+内容模型基准测试
+模拟每次提交对 README.md 的 blob 计算（SHA-1 + zlib 压缩），
+对比 append 模式（总工作量随提交数平方增长）与 ring 模式（线性增长）
+
+用法:
+  python bench/content_growth.py
+  python bench/content_growth.py --commits 1000 5000 10000 --ring_size 100
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from content import DEFAULT_RING_SIZE, make_content_model  # noqa: E402
+from gitobjects import OBJ_BLOB, object_id  # noqa: E402
+
+
+def run(model_name, commits, ring_size):
+    """模拟指定次数的提交，返回处理的字节数与耗时"""
+    model = make_content_model(model_name, ring_size)
+    total_bytes = 0
+    started = time.perf_counter()
+    for i in range(commits):
+        entry = f"更新文档: 2023-01-01 20:{i % 60:02d}\n\n"
+        data = model.append('README.md', entry).encode('utf-8')
+        object_id(OBJ_BLOB, data)
+        zlib.compress(data)
+        total_bytes += len(data)
+    return {
+        'model': model_name,
+        'commits': commits,
+        'bytes': total_bytes,
+        'seconds': round(time.perf_counter() - started, 4),
+    }
+
+
+def main(argv=sys.argv[1:]):
+    """主函数"""
+    parser = argparse.ArgumentParser(description='内容模型基准测试')
+    parser.add_argument('--commits', type=int, nargs='+', default=[1000, 5000, 10000],
+                        help="模拟的提交次数 (默认: 1000 5000 10000)")
+    parser.add_argument('--ring_size', type=int, default=DEFAULT_RING_SIZE,
+                        help=f"ring 模式保留的记录条数 (默认: {DEFAULT_RING_SIZE})")
+    parser.add_argument('--json', action='store_true', help="以 JSON 格式输出结果")
+    args = parser.parse_args(argv)
+
+    results = [
+        run(model, commits, args.ring_size)
+        for commits in args.commits
+        for model in ('append', 'ring')
+    ]
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    print(f"{'模式':<8}{'提交数':>10}{'处理字节数':>16}{'耗时(秒)':>12}")
+    for result in results:
+        print(f"{result['model']:<8}{result['commits']:>10}"
+              f"{result['bytes']:>16}{result['seconds']:>12.4f}")
+
+
+if __name__ == '__main__':
+    main()
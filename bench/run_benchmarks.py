@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+生成器基准测试
+在真实的临时仓库中运行 ContributionGenerator 与 RealisticContributionGenerator，
+统计每秒提交数、耗时、峰值内存与最终仓库大小，并写入 JSON 以便跨版本对比
+
+每个用例在独立的子进程中执行，保证峰值内存互不影响。
+后端 memory 使用不访问磁盘的内存后端，只测量计划与生成逻辑本身的开销。
+
+用法:
+  python bench/run_benchmarks.py --output bench_results.json
+  python bench/run_benchmarks.py --days 30 365 --max_commits 1 10 --backends fast-import pack
+  python bench/run_benchmarks.py --output new.json --compare bench_results.json
+  python bench/run_benchmarks.py --days 36500 --max_commits 20 --backends memory --no_realistic
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BENCH_USER = 'bench'
+BENCH_EMAIL = 'bench@example.com'
+BENCH_START = datetime(2000, 1, 1, 20, 0)
+BENCH_SEED = 2024
+
+DEFAULT_DAYS = [30, 365, 3650]
+DEFAULT_MAX_COMMITS = [1, 10, 20]
+DEFAULT_BACKENDS = ['git', 'fast-import', 'pack']
+
+
+def directory_size(path):
+    """统计目录下所有文件的字节数"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+
+def run_case(case):
+    """在当前目录中执行一个用例并返回统计结果（在子进程中调用）"""
+    import logging
+    sys.path.insert(0, ROOT)
+    logging.disable(logging.INFO)
+
+    import contribute
+    from backend import MemoryRepository
+    from content import make_content_model
+    from generate_realistic_contributions import RealisticContributionGenerator
+
+    backend = dict(contribute.BACKENDS, memory=MemoryRepository)[case['backend']]
+    started = time.perf_counter()
+    if case['generator'] == 'contribute':
+        repo = backend('bench-repo', BENCH_USER, BENCH_EMAIL)
+        repo.init_repository()
+        generator = contribute.ContributionGenerator(
+            repo, case['max_commits'], 80, False,
+            make_content_model(case['content']), BENCH_SEED
+        )
+        generator.generate_contributions(BENCH_START, case['days'], 0)
+        repo.finalize()
+        commits = generator.commit_count
+        repo_dir = repo.path
+    else:
+        generator = RealisticContributionGenerator(
+            BENCH_USER, BENCH_EMAIL, make_content_model(case['content']), BENCH_SEED, backend
+        )
+        commits = generator.generate_realistic_pattern(case['days'])
+        repo_dir = generator.git_repo.path
+    wall = time.perf_counter() - started
+
+    return dict(
+        case,
+        commits=commits,
+        wall_seconds=round(wall, 4),
+        commits_per_second=round(commits / wall, 2) if wall else None,
+        peak_rss_kb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        children_peak_rss_kb=resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+        repo_bytes=directory_size(os.path.join(repo_dir, '.git')),
+    )
+
+
+def spawn_case(case):
+    """在独立的子进程和临时目录中执行用例"""
+    workdir = tempfile.mkdtemp(prefix='contribute-bench-')
+    try:
+        result_path = os.path.join(workdir, 'result.json')
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--case', json.dumps(case),
+             '--result', result_path],
+            cwd=workdir, check=True, stdout=subprocess.DEVNULL
+        )
+        with open(result_path, encoding='utf-8') as file:
+            return json.load(file)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def build_cases(args):
+    """根据参数展开用例矩阵"""
+    cases = []
+    for days in args.days:
+        for backend in args.backends:
+            for max_commits in args.max_commits:
+                cases.append({'generator': 'contribute', 'backend': backend, 'days': days,
+                              'max_commits': max_commits, 'content': args.content})
+        if args.realistic:
+            cases.append({'generator': 'realistic', 'backend': 'git', 'days': days,
+                          'max_commits': None, 'content': args.content})
+    return cases
+
+
+def case_key(result):
+    """用例的唯一标识"""
+    return (result['generator'], result['backend'], result['days'],
+            result['max_commits'], result['content'])
+
+
+def print_results(results, baseline=None):
+    """以表格形式输出结果，提供基线时附带每秒提交数的变化"""
+    previous = {case_key(item): item for item in (baseline or [])}
+    print(f"{'生成器':<12}{'后端':<13}{'天数':>6}{'最大提交':>9}{'提交数':>9}"
+          f"{'耗时(秒)':>11}{'提交/秒':>11}{'峰值内存KB':>12}{'仓库字节':>12}{'变化':>9}")
+    for result in results:
+        change = ''
+        old = previous.get(case_key(result))
+        if old and old.get('commits_per_second') and result['commits_per_second']:
+            change = f"{result['commits_per_second'] / old['commits_per_second'] - 1:+.1%}"
+        print(f"{result['generator']:<12}{result['backend']:<13}{result['days']:>6}"
+              f"{str(result['max_commits'] or '-'):>9}{result['commits']:>9}"
+              f"{result['wall_seconds']:>11.3f}{result['commits_per_second'] or 0:>11.1f}"
+              f"{result['peak_rss_kb']:>12}{result['repo_bytes']:>12}{change:>9}")
+
+
+def environment():
+    """记录运行环境，便于对比不同机器或版本的结果"""
+    git_version = subprocess.run(['git', '--version'], capture_output=True, text=True).stdout
+    try:
+        revision = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT,
+                                  capture_output=True, text=True).stdout.strip()
+    except OSError:
+        revision = None
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'git': git_version.strip(),
+        'revision': revision,
+    }
+
+
+def main(argv=sys.argv[1:]):
+    """主函数"""
+    parser = argparse.ArgumentParser(description='生成器基准测试')
+    parser.add_argument('--days', type=int, nargs='+', default=DEFAULT_DAYS,
+                        help=f"时间范围天数 (默认: {' '.join(map(str, DEFAULT_DAYS))})")
+    parser.add_argument('--max_commits', type=int, nargs='+', default=DEFAULT_MAX_COMMITS,
+                        help=f"每天最大提交次数 (默认: {' '.join(map(str, DEFAULT_MAX_COMMITS))})")
+    parser.add_argument('--backends', nargs='+', default=DEFAULT_BACKENDS,
+                        help=f"仓库后端 (默认: {' '.join(DEFAULT_BACKENDS)})")
+    parser.add_argument('--content', default='append', help="内容模式 (默认: append)")
+    parser.add_argument('--no_realistic', dest='realistic', action='store_false',
+                        help="跳过真实模式生成器")
+    parser.add_argument('--output', help="结果 JSON 文件路径")
+    parser.add_argument('--compare', help="用于对比的历史结果 JSON 文件")
+    parser.add_argument('--case', help=argparse.SUPPRESS)
+    parser.add_argument('--result', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.case:
+        with open(args.result, 'w', encoding='utf-8') as file:
+            json.dump(run_case(json.loads(args.case)), file)
+        return
+
+    results = []
+    for case in build_cases(args):
+        print(f"运行: {case}", file=sys.stderr)
+        results.append(spawn_case(case))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)['results']
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump({'environment': environment(), 'results': results},
+                      file, ensure_ascii=False, indent=2)
+        print(f"结果已写入: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+生成结果缓存
+以 (生成配置, 随机种子, 缓存版本) 的哈希为键，在本地目录中保存生成仓库的 packfile：
+- 相同配置再次生成时，直接把缓存的 pack 链接到新仓库并写入分支引用，无需重新生成
+- 每个条目记录提交数与分支头，命中时更新条目的修改时间
+- 缓存总大小超过上限时，按最近使用时间淘汰最旧的条目
+
+只有显式指定随机种子时缓存才有意义（未指定时每次运行的种子不同）。
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from subprocess import Popen, CalledProcessError
+
+logger = logging.getLogger(__name__)
+
+# 生成结果的格式版本，生成规则变化导致相同配置的历史不同时递增
+CACHE_VERSION = 1
+
+# 默认的缓存大小上限（MB）
+DEFAULT_CACHE_SIZE = 1024
+
+META_FILE = 'meta.json'
+
+# 不影响提交历史的配置项，不参与缓存键的计算（各后端生成的提交完全相同）
+IGNORED_SETTINGS = ('backend', 'repository', 'bare', 'base')
+
+
+def _git(commands, cwd):
+    """执行 Git 命令并返回标准输出"""
+    process = Popen(['git'] + commands, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=cwd)
+    stdout, stderr = process.communicate()
+    if process.returncode != 0:
+        raise CalledProcessError(process.returncode, ['git'] + commands, stdout, stderr)
+    return stdout.decode('utf-8').strip()
+
+
+def _global_identity():
+    """未显式指定用户信息时提交使用的全局 Git 身份"""
+    identity = []
+    for key in ('user.name', 'user.email'):
+        try:
+            identity.append(_git(['config', key], os.getcwd()))
+        except CalledProcessError:
+            identity.append(None)
+    return identity
+
+
+def cache_key(settings, user_name=None, user_email=None):
+    """计算生成配置的缓存键"""
+    config = {key: value for key, value in settings.items() if key not in IGNORED_SETTINGS}
+    if not (user_name and user_email):
+        config['identity'] = _global_identity()
+    config.update(user_name=user_name, user_email=user_email, version=CACHE_VERSION,
+                  timezone=[time.timezone, time.altzone, list(time.tzname)])
+    data = json.dumps(config, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+class HistoryCache:
+    """生成结果的本地缓存（按大小淘汰最近最少使用的条目）"""
+
+    def __init__(self, directory, max_size=DEFAULT_CACHE_SIZE):
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_size * 1024 * 1024
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _entry(self, key):
+        """缓存条目的目录"""
+        return os.path.join(self.directory, key)
+
+    def restore(self, key, directory, bare=False):
+        """缓存命中时在 directory 创建仓库并恢复历史，返回提交数；未命中返回 None"""
+        entry = self._entry(key)
+        try:
+            with open(os.path.join(entry, META_FILE), encoding='utf-8') as file:
+                meta = json.load(file)
+        except FileNotFoundError:
+            return None
+
+        path = os.path.abspath(directory)
+        os.makedirs(path, exist_ok=True)
+        _git(['init', '-q', '-b', 'main'] + (['--bare'] if bare else []), path)
+        git_dir = path if bare else os.path.join(path, '.git')
+        pack_dir = os.path.join(git_dir, 'objects', 'pack')
+        for name in meta['packs']:
+            # pack 文件不会被修改，优先使用硬链接
+            try:
+                os.link(os.path.join(entry, name), os.path.join(pack_dir, name))
+            except OSError:
+                shutil.copyfile(os.path.join(entry, name), os.path.join(pack_dir, name))
+        with open(os.path.join(git_dir, 'refs', 'heads', 'main'), 'w', encoding='utf-8') as file:
+            file.write(meta['head'] + '\n')
+        if not bare:
+            _git(['reset', '--hard', '-q'], path)
+
+        os.utime(os.path.join(entry, META_FILE))
+        logger.info(f"从缓存恢复仓库: {key[:12]}，共 {meta['commits']} 次提交")
+        return meta['commits']
+
+    def store(self, key, directory, commits):
+        """保存仓库的 packfile（存在松散对象或多个 pack 时先重新打包），并按大小淘汰旧条目"""
+        if os.path.exists(self._entry(key)):
+            return
+        path = os.path.abspath(directory)
+        git_dir = os.path.join(path, _git(['rev-parse', '--git-dir'], path))
+        pack_dir = os.path.join(git_dir, 'objects', 'pack')
+        stats = dict(line.split(': ') for line in _git(['count-objects', '-v'], path).splitlines())
+        if int(stats['count']) or int(stats['packs']) != 1:
+            _git(['repack', '-a', '-d', '-q'], path)
+        packs = sorted(name for name in os.listdir(pack_dir) if name.endswith(('.pack', '.idx')))
+
+        staging = tempfile.mkdtemp(prefix='tmp-', dir=self.directory)
+        try:
+            for name in packs:
+                shutil.copyfile(os.path.join(pack_dir, name), os.path.join(staging, name))
+            meta = {'head': _git(['rev-parse', 'HEAD'], path), 'commits': commits,
+                    'packs': packs, 'version': CACHE_VERSION}
+            with open(os.path.join(staging, META_FILE), 'w', encoding='utf-8') as file:
+                json.dump(meta, file)
+            # 先在临时目录写完再改名，中断或并发写入不会留下不完整的条目
+            os.rename(staging, self._entry(key))
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            if not os.path.exists(self._entry(key)):
+                raise
+            return
+        logger.info(f"已写入缓存: {key[:12]}")
+        self.evict(keep=key)
+
+    def evict(self, keep=None):
+        """缓存总大小超过上限时，按最近使用时间从旧到新删除条目（keep 除外）"""
+        entries = []
+        total = 0
+        for name in os.listdir(self.directory):
+            meta = os.path.join(self.directory, name, META_FILE)
+            if not os.path.exists(meta):
+                continue
+            entry = self._entry(name)
+            size = sum(os.path.getsize(os.path.join(entry, file)) for file in os.listdir(entry))
+            entries.append((os.path.getmtime(meta), name, size))
+            total += size
+        for _, name, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            shutil.rmtree(self._entry(name), ignore_errors=True)
+            total -= size
+            logger.info(f"缓存超出上限，已淘汰: {name[:12]}")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+提交内容模型
+决定每次提交时文件内容如何变化：
+- append: 每条记录追加到文件末尾，文件随提交数线性增长（原有行为）
+- ring: 每个文件只保留最近 N 条记录，每次提交的 blob 大小保持不变
+"""
+
+from collections import deque
+
+# 环形模式默认保留的记录条数
+DEFAULT_RING_SIZE = 100
+
+
+class AppendContent:
+    """追加模式：文件保留全部历史记录"""
+
+    def __init__(self):
+        self._files = {}
+
+    def append(self, path, entry):
+        """追加一条记录并返回文件的完整内容"""
+        text = self._files.get(path, '') + entry
+        self._files[path] = text
+        return text
+
+    def extend(self, path, entries):
+        """依次追加多条记录（用于恢复状态，不返回内容）"""
+        self._files[path] = self._files.get(path, '') + ''.join(entries)
+
+
+class RingContent:
+    """环形模式：文件只保留最近 size 条记录"""
+
+    def __init__(self, size=DEFAULT_RING_SIZE):
+        if size < 1:
+            raise ValueError("ring_size 必须大于 0")
+        self.size = size
+        self._files = {}
+
+    def append(self, path, entry):
+        """追加一条记录（超出容量时丢弃最早的记录）并返回文件的完整内容"""
+        ring = self._files.get(path)
+        if ring is None:
+            ring = self._files[path] = deque(maxlen=self.size)
+        ring.append(entry)
+        return ''.join(ring)
+
+    def extend(self, path, entries):
+        """依次追加多条记录（用于恢复状态，不返回内容）"""
+        ring = self._files.get(path)
+        if ring is None:
+            ring = self._files[path] = deque(maxlen=self.size)
+        ring.extend(entries)
+
+
+# 可选的内容模型
+CONTENT_MODELS = {
+    'append': AppendContent,
+    'ring': RingContent,
+}
+
+
+def make_content_model(name, ring_size=DEFAULT_RING_SIZE):
+    """根据名称创建内容模型"""
+    if name not in CONTENT_MODELS:
+        raise ValueError(f"未知的内容模式: {name}")
+    if name == 'ring':
+        return RingContent(ring_size)
+    return CONTENT_MODELS[name]()
@@ -9,24 +9,71 @@ GitHub 贡献图生成器
 """
 
 import argparse
+import copy
 import os
+import random
 import sys
+import time
+from collections import deque
 from datetime import datetime, timedelta
-from random import randint, choice
+from itertools import islice
 import subprocess
 from subprocess import Popen, CalledProcessError
 import logging
 
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('contribute.log', encoding='utf-8')
-    ]
+from backend import RepositoryBackend
+from cache import DEFAULT_CACHE_SIZE, HistoryCache, cache_key
+from content import CONTENT_MODELS, DEFAULT_RING_SIZE, AppendContent, make_content_model
+from journal import Journal
+from logsetup import add_verbosity_arguments, log_level, log_session
+from metrics import Metrics
+from progress import DEFAULT_INTERVAL, PROGRESS_MODES, ProgressReporter
+from schedule import from_wall_seconds, plan_contributions, plan_target
+from target import day_counts, grid_start, load_target
+from gitobjects import (
+    OBJ_BLOB, OBJ_COMMIT,
+    PackWriter, TreeCache, encode_commit, read_index_file, write_index_file
 )
+
+# 日志只在 main() 中配置，导入本模块不会创建日志文件
 logger = logging.getLogger(__name__)
+LOG_FILE = 'contribute.log'
+
+# 追加模式下空仓库默认补充的天数
+DEFAULT_APPEND_DAYS = 365
+
+# 追加模式下未在命令行指定时沿用续跑日志中配置的生成参数
+APPEND_INHERITED_SETTINGS = ('backend', 'max_commits', 'frequency', 'no_weekends', 'content',
+                             'ring_size', 'bare')
+
+# Git 无法表示 1970 年之前的提交时间（留出一天给时区偏移）
+EARLIEST_COMMIT_DATE = datetime(1970, 1, 2)
+
+# 并行计算对象时每个分片的最少提交数，以及每个工作进程平均分到的分片数
+MIN_SHARD_COMMITS = 1000
+SHARDS_PER_WORKER = 4
+
+# 生成期间通过 GIT_CONFIG_COUNT 注入的批量写入配置：关闭自动 gc、钩子和提交签名，
+# 对象 fsync 改为批量模式。只作用于本次运行启动的 git 子进程，不写入仓库或全局配置
+BULK_INGEST_CONFIG = (
+    ('gc.auto', '0'),
+    ('maintenance.auto', 'false'),
+    ('core.hooksPath', os.devnull),
+    ('commit.gpgSign', 'false'),
+    ('core.fsyncMethod', 'batch'),
+)
+
+# 生成结束后执行一次的仓库维护步骤
+MAINTENANCE_STEPS = (
+    ('repack', ['git', 'repack', '-a', '-d', '-q']),
+    ('commit-graph', ['git', 'commit-graph', 'write', '--reachable']),
+)
+
+# 追加与续跑时只处理新增的对象：打包松散对象（不合并已有的 pack），commit-graph 追加一层
+INCREMENTAL_MAINTENANCE_STEPS = (
+    ('repack', ['git', 'repack', '-d', '-q']),
+    ('commit-graph', ['git', 'commit-graph', 'write', '--reachable', '--split']),
+)
 
 # 默认提交消息模板
 COMMIT_MESSAGES = [
@@ -43,28 +90,83 @@ COMMIT_MESSAGES = [
 ]
 
 
-class GitRepository:
+def bulk_ingest_env(**extra):
+    """返回附加批量写入配置的子进程环境变量（保留环境中已有的 GIT_CONFIG_* 配置）"""
+    env = dict(os.environ, **extra)
+    offset = int(env.get('GIT_CONFIG_COUNT') or 0)
+    for index, (key, value) in enumerate(BULK_INGEST_CONFIG, offset):
+        env[f'GIT_CONFIG_KEY_{index}'] = key
+        env[f'GIT_CONFIG_VALUE_{index}'] = value
+    env['GIT_CONFIG_COUNT'] = str(offset + len(BULK_INGEST_CONFIG))
+    return env
+
+
+class GitCommands:
+    """逐条提交的 Git 命令构造（同步后端 GitRepository 与 asyncio 后端共用）
+
+    使用者需提供 path、bare、user_name、user_email、_env（子进程环境变量）
+    与 _touched（自上次提交以来写入过的文件）属性，并自行执行返回的命令。
+    """
+    
+    def _init_commands(self):
+        """初始化仓库并配置用户信息的命令列表"""
+        init = ['git', 'init', '-b', 'main'] + (['--bare'] if self.bare else [])
+        return [init] + self._user_config_commands()
+    
+    def _user_config_commands(self):
+        """写入仓库级用户信息配置的命令列表"""
+        commands = []
+        if self.user_name:
+            commands.append(['git', 'config', 'user.name', self.user_name])
+        if self.user_email:
+            commands.append(['git', 'config', 'user.email', self.user_email])
+        return commands
+    
+    def write_file(self, path, content):
+        """写入工作区文件的完整内容"""
+        file_path = os.path.join(self.path, path)
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(file_path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        self._touched.add(path)
+    
+    def _stage_command(self):
+        """暂存写入过的文件的命令与标准输入内容"""
+        # 只把写入过的路径交给 update-index，避免 git add . 每次扫描整个工作区
+        paths = ''.join(f'{path}\0' for path in sorted(self._touched))
+        return ['git', 'update-index', '--add', '-z', '--stdin'], paths.encode('utf-8')
+    
+    def _commit_command(self, message, commit_time):
+        """以指定时间提交的命令与环境变量"""
+        # 提交者时间与作者时间保持一致，保证各后端生成的历史形态相同
+        date = commit_time.strftime('%Y-%m-%d %H:%M:%S')
+        env = dict(self._env, GIT_COMMITTER_DATE=date)
+        return ['git', 'commit', '-m', message, '--date', date], env
+
+
+class GitRepository(GitCommands, RepositoryBackend):
     """Git 仓库管理类"""
     
-    def __init__(self, directory, user_name=None, user_email=None):
-        self.directory = directory
-        self.user_name = user_name
-        self.user_email = user_email
+    # 逐条提交依赖工作区和暂存区，不支持 bare 仓库
+    supports_bare = False
+    
+    def __init__(self, directory, user_name=None, user_email=None, metrics=None, bare=False):
+        super().__init__(directory, user_name, user_email, metrics, bare)
+        # 本仓库启动的所有 git 子进程都使用批量写入配置
+        self._env = bulk_ingest_env()
+        # 自上次提交以来写入过的文件（相对路径），提交时只更新这些索引条目
+        self._touched = set()
         
     def init_repository(self):
         """初始化 Git 仓库"""
         try:
-            os.makedirs(self.directory, exist_ok=True)
-            os.chdir(self.directory)
-            
-            # 初始化 Git 仓库
-            self._run_command(['git', 'init', '-b', 'main'])
+            os.makedirs(self.path, exist_ok=True)
             
-            # 配置用户信息
-            if self.user_name:
-                self._run_command(['git', 'config', 'user.name', self.user_name])
-            if self.user_email:
-                self._run_command(['git', 'config', 'user.email', self.user_email])
+            # 初始化 Git 仓库并配置用户信息
+            for commands in self._init_commands():
+                self._run_command(commands)
                 
             logger.info(f"Git 仓库初始化成功: {self.directory}")
             
@@ -72,6 +174,78 @@ class GitRepository:
             logger.error(f"初始化仓库失败: {e}")
             raise
     
+    def open_repository(self, discard_changes=False):
+        """打开已有的 Git 仓库
+
+        discard_changes 为真时（续跑，续跑日志证明工作区由本程序写入）丢弃中断时遗留的
+        未提交更改；否则工作区有未提交的更改时拒绝打开，避免覆盖用户的修改。
+        """
+        try:
+            self._run_command(['git', 'rev-parse', '--git-dir'])
+            self._configure_user()
+            if discard_changes:
+                if self.head_commit() and not self.bare:
+                    self._run_command(['git', 'reset', '--hard', '-q'])
+            else:
+                self._check_clean_worktree()
+            logger.info(f"Git 仓库打开成功: {self.directory}")
+        except Exception as e:
+            logger.error(f"打开仓库失败: {e}")
+            raise
+    
+    def _check_clean_worktree(self):
+        """工作区有未提交的更改（含未跟踪的文件）时抛出 ValueError"""
+        if not self.bare and self._read_command(['git', 'status', '--porcelain']):
+            raise ValueError(f"仓库 {self.directory} 的工作区有未提交的更改，"
+                             "请先提交或还原后再执行")
+    
+    def head_commit(self):
+        """返回 HEAD 指向的提交 ID，空仓库返回 None"""
+        try:
+            return self._read_command(['git', 'rev-parse', '--verify', '-q', 'HEAD'])
+        except CalledProcessError:
+            return None
+    
+    def latest_commit_time(self):
+        """返回最新一次提交的作者时间（本地时间），空仓库返回 None"""
+        if not self.head_commit():
+            return None
+        date = self._read_command([
+            'git', 'log', '-1', '--format=%ad', '--date=format:%Y-%m-%d %H:%M:%S'
+        ])
+        return datetime.strptime(date, '%Y-%m-%d %H:%M:%S')
+    
+    def head_state(self, base=None):
+        """返回 (base 之后 HEAD 包含的提交数, HEAD 的作者时间)，空仓库返回 (0, None)"""
+        head_time = self.latest_commit_time()
+        if head_time is None:
+            return 0, None
+        revision = f'{base}..HEAD' if base else 'HEAD'
+        count = int(self._read_command(['git', 'rev-list', '--count', revision]))
+        return count, head_time
+    
+    def read_file(self, path):
+        """读取工作区文件内容（bare 仓库读取 HEAD 中的版本），文件不存在时返回 None"""
+        if self.bare:
+            try:
+                return self._read_command(['git', 'show', f'HEAD:{path}'], strip=False)
+            except CalledProcessError:
+                return None
+        try:
+            with open(os.path.join(self.path, path), encoding='utf-8') as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+    
+    def has_remote(self, name='origin'):
+        """判断是否已配置指定的远程仓库"""
+        return name in self._read_command(['git', 'remote']).split()
+    
+    def _configure_user(self):
+        """写入仓库级的用户信息配置"""
+        for commands in self._user_config_commands():
+            self._run_command(commands)
+    
     def add_remote(self, repository_url):
         """添加远程仓库"""
         try:
@@ -82,6 +256,60 @@ class GitRepository:
             logger.error(f"添加远程仓库失败: {e}")
             raise
     
+    def commit(self, message, commit_time):
+        """以指定时间提交自上次提交以来写入的文件"""
+        if self._touched:
+            commands, paths = self._stage_command()
+            self._run_command(commands, input=paths)
+            self._touched.clear()
+        commands, env = self._commit_command(message, commit_time)
+        self._run_command(commands, env=env)
+    
+    def maintain(self, incremental=False):
+        """生成结束后执行一次仓库维护（重新打包、写出 commit-graph），返回各步骤耗时（秒）
+
+        incremental 为真时（追加、续跑）只处理新增的对象，耗时与新增的提交数相关。
+        """
+        timings = {}
+        for name, commands in INCREMENTAL_MAINTENANCE_STEPS if incremental else MAINTENANCE_STEPS:
+            started = time.perf_counter()
+            self._run_command(commands)
+            timings[name] = time.perf_counter() - started
+        logger.info("仓库维护完成: " + "，".join(
+            f"{name} {seconds:.2f} 秒" for name, seconds in timings.items()
+        ))
+        return timings
+    
+    def create_bundle(self, path):
+        """把 main 分支的完整历史写入单个 bundle 文件"""
+        if not self.head_commit():
+            raise ValueError("仓库中没有提交，无法创建 bundle")
+        try:
+            self._run_command(['git', 'bundle', 'create', '-q', os.path.abspath(path), 'main'])
+            logger.info(f"bundle 写入成功: {path} ({os.path.getsize(path)} 字节)")
+        except Exception as e:
+            logger.error(f"创建 bundle 失败: {e}")
+            raise
+    
+    def import_bundle(self, path):
+        """从 bundle 文件创建仓库（bare 仓库不检出工作区），返回导入的提交数"""
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            for commands in self._init_commands():
+                self._run_command(commands)
+            self._run_command(['git', 'bundle', 'verify', '-q', os.path.abspath(path)])
+            # 新仓库的 main 分支尚未诞生，允许直接写入当前分支
+            self._run_command(['git', 'fetch', '-q', '--update-head-ok', os.path.abspath(path),
+                               'main:main'])
+            if not self.bare:
+                self._run_command(['git', 'reset', '--hard', '-q'])
+            commits = self.head_state()[0]
+            logger.info(f"从 bundle 导入成功: {path}，共 {commits} 次提交")
+            return commits
+        except Exception as e:
+            logger.error(f"导入 bundle 失败: {e}")
+            raise
+    
     def push_changes(self):
         """推送更改到远程仓库"""
         try:
@@ -91,81 +319,565 @@ class GitRepository:
             logger.error(f"推送更改失败: {e}")
             raise
     
-    def _run_command(self, commands):
-        """执行 Git 命令"""
+    def _run_command(self, commands, env=None, input=None):
+        """执行 Git 命令（input 不为空时写入标准输入，env 为空时使用批量写入配置）"""
         try:
-            process = Popen(commands, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            process.wait()
+            with self.metrics.timer(_command_phase(commands)):
+                with self.metrics.timer('spawn'):
+                    process = Popen(commands, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                    stdin=subprocess.PIPE if input is not None else None,
+                                    cwd=self.path, env=env or self._env)
+                if input is not None:
+                    process.communicate(input)
+                else:
+                    process.wait()
             if process.returncode != 0:
                 raise CalledProcessError(process.returncode, commands)
         except CalledProcessError as e:
             logger.error(f"命令执行失败: {' '.join(commands)}")
             raise
+    
+    def _read_command(self, commands, strip=True):
+        """执行 Git 命令并返回标准输出（strip 为 False 时保留首尾空白）"""
+        process = Popen(commands, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                        cwd=self.path, env=self._env)
+        stdout, _ = process.communicate()
+        if process.returncode != 0:
+            raise CalledProcessError(process.returncode, commands)
+        output = stdout.decode('utf-8')
+        return output.strip() if strip else output
+    
+    def _resolve_identity(self):
+        """获取提交者身份，未显式指定时读取 Git 配置"""
+        try:
+            name = self.user_name or self._read_command(['git', 'config', 'user.name'])
+            email = self.user_email or self._read_command(['git', 'config', 'user.email'])
+        except CalledProcessError:
+            raise ValueError("未配置 Git 用户信息，请使用 --user_name 和 --user_email 指定")
+        return name, email
+
+
+def _command_phase(commands):
+    """命令对应的指标阶段名称，如 git_update_index、git_commit"""
+    if len(commands) > 1 and commands[0] == 'git':
+        return 'git_' + commands[1].replace('-', '_')
+    return 'command'
+
+
+def format_git_timestamp(commit_time):
+    """将本地时间转换为 Git 原始时间格式: <秒级时间戳> <+HHMM>"""
+    aware = commit_time.astimezone()
+    offset = int(aware.utcoffset().total_seconds()) // 60
+    sign = '+' if offset >= 0 else '-'
+    offset = abs(offset)
+    return f"{int(aware.timestamp())} {sign}{offset // 60:02d}{offset % 60:02d}"
+
+
+class FastImportRepository(GitRepository):
+    """基于 git fast-import 的流式仓库后端
+    
+    所有提交通过同一个长驻的 git fast-import 进程写入，
+    避免每次提交都启动 git update-index / git commit 子进程。
+    """
+    
+    # 每隔多少次提交执行一次 checkpoint，使已写入的提交在进程中断后仍然保留
+    checkpoint_interval = 5000
+    supports_bare = True
+    
+    def __init__(self, directory, user_name=None, user_email=None, metrics=None, bare=False):
+        super().__init__(directory, user_name, user_email, metrics, bare)
+        self._process = None
+        self._identity = None
+        self._pending = {}
+        self._mark = 0
+        self._has_head = False
+    
+    def init_repository(self):
+        """初始化 Git 仓库并启动 fast-import 进程"""
+        super().init_repository()
+        self._start_stream()
+    
+    def open_repository(self, discard_changes=False):
+        """打开已有的 Git 仓库，新提交接在当前分支之后"""
+        super().open_repository(discard_changes)
+        self._has_head = self.head_commit() is not None
+        self._start_stream()
+    
+    def _start_stream(self):
+        """启动 fast-import 进程"""
+        self._identity = '{} <{}>'.format(*self._resolve_identity())
+        self._process = Popen(
+            ['git', 'fast-import', '--quiet', '--done'],
+            stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            cwd=self.path, env=self._env
+        )
+    
+    def write_file(self, path, content):
+        """暂存文件内容，在下一次提交时写入流"""
+        self._pending[path] = content.encode('utf-8')
+    
+    def commit(self, message, commit_time):
+        """向 fast-import 流写入一次提交"""
+        self._mark += 1
+        timestamp = format_git_timestamp(commit_time)
+        message = (message + '\n').encode('utf-8')
+        
+        chunks = [
+            f"commit refs/heads/main\nmark :{self._mark}\n".encode('utf-8'),
+            f"author {self._identity} {timestamp}\n".encode('utf-8'),
+            f"committer {self._identity} {timestamp}\n".encode('utf-8'),
+            f"data {len(message)}\n".encode('utf-8'), message, b'\n',
+        ]
+        if self._mark > 1:
+            chunks.append(f"from :{self._mark - 1}\n".encode('utf-8'))
+        elif self._has_head:
+            chunks.append(b"from refs/heads/main^0\n")
+        for path, data in self._pending.items():
+            chunks.append(f"M 100644 inline {path}\ndata {len(data)}\n".encode('utf-8'))
+            chunks.append(data)
+            chunks.append(b'\n')
+        chunks.append(b'\n')
+        if self.checkpoint_interval and self._mark % self.checkpoint_interval == 0:
+            chunks.append(b'checkpoint\n\n')
+        
+        self._process.stdin.write(b''.join(chunks))
+        self._pending.clear()
+    
+    def finalize(self):
+        """关闭 fast-import 流并检出工作区（bare 仓库无需检出）"""
+        if self._process is None:
+            return
+        self._process.stdin.write(b'done\n')
+        self._process.stdin.close()
+        stderr = self._process.stderr.read()
+        self._process.wait()
+        returncode = self._process.returncode
+        self._process = None
+        if returncode != 0:
+            logger.error(f"fast-import 执行失败: {stderr.decode('utf-8', 'replace').strip()}")
+            raise CalledProcessError(returncode, ['git', 'fast-import'])
+        
+        # fast-import 只写入对象和引用，需要同步工作区与暂存区
+        if self._mark and not self.bare:
+            self._run_command(['git', 'reset', '--hard', '-q'])
+        logger.info(f"fast-import 写入完成，共 {self._mark} 次提交")
+
+
+def _quote_config_value(value):
+    """转义 Git 配置文件中的字符串值"""
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+class PackRepository(GitRepository):
+    """纯 Python 仓库后端
+    
+    在进程内计算 blob/tree/commit 对象并直接写出 packfile，
+    生成过程中不启动任何 git 子进程。
+    """
+    
+    supports_bare = True
+    
+    def __init__(self, directory, user_name=None, user_email=None, metrics=None, bare=False):
+        super().__init__(directory, user_name, user_email, metrics, bare)
+        self._git_dir = None
+        self._writer = None
+        self._identity = None
+        self._files = {}
+        # 按目录缓存 tree ID，提交时只重新写入包含改动文件的目录
+        self._tree = TreeCache()
+        self._dirty = {}
+        self._head = None
+        self._commit_total = 0
+    
+    def init_repository(self):
+        """创建仓库目录结构并准备 pack 写入器"""
+        try:
+            self._git_dir = self.path if self.bare else os.path.join(self.path, '.git')
+            
+            for subdir in ('objects/info', 'objects/pack', 'refs/heads', 'refs/tags'):
+                os.makedirs(os.path.join(self._git_dir, subdir), exist_ok=True)
+            self._write_git_file('HEAD', 'ref: refs/heads/main\n')
+            
+            config = [
+                '[core]',
+                '\trepositoryformatversion = 0',
+                '\tfilemode = true',
+                f'\tbare = {str(self.bare).lower()}',
+            ]
+            if not self.bare:
+                config.append('\tlogallrefupdates = true')
+            if self.user_name or self.user_email:
+                config.append('[user]')
+                if self.user_name:
+                    config.append(f'\tname = {_quote_config_value(self.user_name)}')
+                if self.user_email:
+                    config.append(f'\temail = {_quote_config_value(self.user_email)}')
+            self._write_git_file('config', '\n'.join(config) + '\n')
+            
+            self._start_writer()
+            logger.info(f"Git 仓库初始化成功: {self.directory}")
+            
+        except Exception as e:
+            logger.error(f"初始化仓库失败: {e}")
+            raise
+    
+    def open_repository(self, discard_changes=False):
+        """打开已有仓库，从分支引用和暂存区索引（bare 仓库为 HEAD 的目录树）恢复当前目录树"""
+        try:
+            self._git_dir = self.path if self.bare else os.path.join(self.path, '.git')
+            # 结束时会重新写出工作区，只有续跑时才允许覆盖未提交的更改
+            if not discard_changes:
+                self._check_clean_worktree()
+            
+            # 清理中断时遗留的未完成 pack
+            for name in os.listdir(self.pack_dir):
+                if name.startswith('tmp_pack_'):
+                    os.remove(os.path.join(self.pack_dir, name))
+            
+            head = self._read_ref('refs/heads/main')
+            if head:
+                self._head = bytes.fromhex(head)
+                if self.bare:
+                    self._files = self._read_head_tree()
+                else:
+                    self._files = dict(read_index_file(os.path.join(self._git_dir, 'index')))
+                self._tree = TreeCache(self._files)
+            self._start_writer()
+            logger.info(f"Git 仓库打开成功: {self.directory}")
+        except Exception as e:
+            logger.error(f"打开仓库失败: {e}")
+            raise
+    
+    def _read_head_tree(self):
+        """读取 HEAD 目录树中的全部文件: {路径: blob ID}"""
+        output = self._read_command(['git', 'ls-tree', '-r', '-z', 'HEAD'], strip=False)
+        files = {}
+        for line in filter(None, output.split('\0')):
+            info, path = line.split('\t', 1)
+            files[path] = bytes.fromhex(info.split()[2])
+        return files
+    
+    def _start_writer(self):
+        """解析提交者身份并创建 pack 写入器"""
+        self._identity = '{} <{}>'.format(*self._resolve_identity())
+        self._writer = PackWriter(self.pack_dir)
+    
+    def _read_ref(self, name):
+        """读取分支引用（兼容 packed-refs），不存在时返回 None"""
+        path = os.path.join(self._git_dir, name)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as file:
+                return file.read().strip()
+        packed = os.path.join(self._git_dir, 'packed-refs')
+        if os.path.exists(packed):
+            with open(packed, encoding='utf-8') as file:
+                for line in file:
+                    parts = line.split()
+                    if len(parts) == 2 and parts[1] == name:
+                        return parts[0]
+        return None
+    
+    def write_file(self, path, content):
+        """写入 blob 对象并记录到下一次提交的目录树"""
+        data = content.encode('utf-8')
+        self._files[path] = sha = self._writer.add(OBJ_BLOB, data)
+        self._tree.set(path, sha)
+        if not self.bare:
+            self._dirty[path] = data
+    
+    def commit(self, message, commit_time):
+        """写入 tree 与 commit 对象"""
+        self.commit_tree(self._tree.write(self._writer.add), message, commit_time)
+    
+    def commit_tree(self, tree, message, commit_time):
+        """以已写入的 tree 对象创建提交，父提交为当前 HEAD"""
+        signature = f"{self._identity} {format_git_timestamp(commit_time)}"
+        body = encode_commit(
+            tree, [self._head] if self._head else [], signature, signature, message + '\n'
+        )
+        self._head = self._writer.add(OBJ_COMMIT, body)
+        self._commit_total += 1
+    
+    @property
+    def pack_dir(self):
+        """pack 文件所在目录"""
+        return os.path.join(self._git_dir, 'objects', 'pack')
+    
+    def snapshot_files(self):
+        """返回当前目录树的副本 {相对路径: blob SHA-1}"""
+        return dict(self._files)
+    
+    def adopt_file(self, path, sha, content):
+        """记录已由其他 pack 写入的文件 blob，使其出现在后续提交和检出的工作区中"""
+        self._files[path] = sha
+        self._tree.set(path, sha)
+        if not self.bare:
+            self._dirty[path] = content
+    
+    def finalize(self):
+        """写出 packfile、更新分支引用并检出工作区（bare 仓库只写出对象和引用）"""
+        if self._writer is None:
+            return
+        self._writer.finish()
+        self._writer = None
+        if self._head is None:
+            return
+        self._write_git_file('refs/heads/main', self._head.hex() + '\n')
+        if not self.bare:
+            self._write_worktree()
+        logger.info(f"packfile 写入完成，共 {self._commit_total} 次提交")
+    
+    def _write_worktree(self):
+        """直接写出本次更新的工作区文件和暂存区索引，使仓库处于干净状态"""
+        for path, data in self._dirty.items():
+            file_path = os.path.join(self.path, path)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, 'wb') as file:
+                file.write(data)
+        self._dirty.clear()
+        index_entries = [
+            (path, sha, os.stat(os.path.join(self.path, path)))
+            for path, sha in self._files.items()
+        ]
+        write_index_file(os.path.join(self._git_dir, 'index'), index_entries)
+    
+    def _write_git_file(self, name, content):
+        """写入 Git 目录（bare 仓库为仓库根目录）下的文件"""
+        with open(os.path.join(self._git_dir, name), 'w', encoding='utf-8') as file:
+            file.write(content)
+    
+    def _resolve_identity(self):
+        """获取提交者身份，无法读取 Git 配置时使用系统用户"""
+        try:
+            return super()._resolve_identity()
+        except (OSError, ValueError):
+            # 只在回退时需要，延迟导入以缩短命令行启动时间
+            import getpass
+            import socket
+            name = self.user_name or getpass.getuser()
+            return name, self.user_email or f"{name}@{socket.gethostname()}"
+
+
+# 可选的仓库后端（MemoryRepository 不写入磁盘，只供基准测试与性质测试直接使用，不在命令行中提供）
+BACKENDS = {
+    'git': GitRepository,
+    'fast-import': FastImportRepository,
+    'pack': PackRepository,
+}
+
+
+def format_commit_message(commit_time, message_index):
+    """根据消息模板编号生成提交消息"""
+    return COMMIT_MESSAGES[message_index].format(date=commit_time.strftime('%Y-%m-%d %H:%M'))
+
+
+def shard_bounds(start, end, workers):
+    """将第 start 到 end 次提交划分为分片，返回 [(开始, 结束), ...]"""
+    size = max(MIN_SHARD_COMMITS, -(-(end - start) // (workers * SHARDS_PER_WORKER)))
+    return [(low, min(low + size, end)) for low in range(start, end, size)]
+
+
+def _hash_shard(pack_dir, files, content_model, timestamps, messages, skip):
+    """计算一个分片中每次提交的 blob 与 tree 对象（在工作进程中调用）
+
+    timestamps/messages 的前 skip 项为分片之前的提交，只用于重建内容模型的状态。
+    对象写入工作进程自己的 packfile，
+    返回 (tree SHA-1 依次拼接, 最后的 README blob SHA-1, 最后的 README 内容, 耗时)。
+    """
+    started = time.perf_counter()
+    entries = (
+        format_commit_message(from_wall_seconds(seconds), message_index) + '\n\n'
+        for seconds, message_index in zip(timestamps, messages)
+    )
+    content_model.extend('README.md', islice(entries, skip))
+    writer = PackWriter(pack_dir)
+    tree = TreeCache(files)
+    trees = bytearray()
+    for entry in entries:
+        data = content_model.append('README.md', entry).encode('utf-8')
+        blob = writer.add(OBJ_BLOB, data)
+        tree.set('README.md', blob)
+        trees += tree.write(writer.add)
+    writer.finish()
+    return bytes(trees), blob, data, time.perf_counter() - started
+
+
+def plan_schedule(start_date, days, max_commits=10, frequency=80, no_weekends=False,
+                  seed=None, target=None):
+    """计算 ContributionGenerator 的提交计划（target 为每天的提交次数时按目标图案计划）"""
+    if target is not None:
+        return plan_target(start_date, target[:days], len(COMMIT_MESSAGES), seed)
+    return plan_contributions(start_date, days, max_commits, frequency, no_weekends,
+                              len(COMMIT_MESSAGES), seed)
+
+
+def plan_from_settings(settings):
+    """根据续跑日志中的配置重建提交计划"""
+    return plan_schedule(
+        datetime.fromisoformat(settings['start_date']), settings['days'],
+        settings['max_commits'], settings['frequency'], settings['no_weekends'],
+        settings['seed'], settings.get('target')
+    )
 
 
 class ContributionGenerator:
     """贡献生成器类"""
     
-    def __init__(self, git_repo, max_commits=10, frequency=80, no_weekends=False):
+    # 可使用的仓库类型（命令方法为同步方法的后端）
+    backend_type = RepositoryBackend
+    
+    def __init__(self, git_repo, max_commits=10, frequency=80, no_weekends=False,
+                 content_model=None, seed=None, target=None):
+        if not isinstance(git_repo, self.backend_type):
+            raise TypeError(f"{type(self).__name__} 需要 {self.backend_type.__name__}，"
+                            f"不能使用 {type(git_repo).__name__}")
         self.git_repo = git_repo
         self.max_commits = max_commits
         self.frequency = frequency
         self.no_weekends = no_weekends
+        self.content_model = content_model or AppendContent()
+        self.seed = seed
+        # 计划之外的随机选择也由同一个种子驱动，保证相同配置生成相同的历史
+        self.rng = random.Random(seed)
+        # 目标图案模式下每天的提交次数（为空时按频率随机计划）
+        self.target = target
         self.commit_count = 0
         
+    def plan(self, start_date, days):
+        """计算完整的提交计划"""
+        with self.git_repo.metrics.timer('plan'):
+            return plan_schedule(start_date, days, self.max_commits, self.frequency,
+                                 self.no_weekends, self.seed, self.target)
+    
     def generate_contributions(self, start_date, days_before, days_after):
         """生成贡献记录"""
         logger.info(f"开始生成贡献记录，时间范围: {start_date} 前后 {days_before}/{days_after} 天")
         
-        for day in (start_date + timedelta(n) for n in range(days_before + days_after)):
-            if self._should_commit_on_day(day):
-                commits_today = self._get_commits_for_day()
-                for commit_time in (day + timedelta(minutes=m) for m in range(commits_today)):
-                    self._make_contribution(commit_time)
+        schedule = self.plan(start_date, days_before + days_after)
+        self.run(schedule)
+    
+    def run(self, schedule, completed=0, workers=1, progress=None):
+        """按计划执行提交，completed 为已完成的提交数（续跑时跳过）
+
+        workers 大于 1 时（仅 pack 后端）由多个进程并行计算 blob/tree 对象。
+        progress 为 ProgressReporter 时报告进度、速度与预计剩余时间。
+        """
+        logger.info(f"提交计划: {schedule.days} 天，共 {len(schedule)} 次提交")
+        if progress:
+            progress.start(completed)
+        if workers > 1:
+            self._run_sharded(schedule, completed, workers, progress)
+        else:
+            for index, (commit_time, message_index) in enumerate(schedule.commits(completed), completed + 1):
+                self._make_contribution(commit_time, message_index)
+                if progress:
+                    progress.update(index, commit_time)
+        if progress:
+            last = from_wall_seconds(schedule.timestamps[-1]) if len(schedule) else None
+            progress.finish(len(schedule), last)
         
         logger.info(f"贡献记录生成完成，总共 {self.commit_count} 次提交")
     
-    def _should_commit_on_day(self, day):
-        """判断是否应该在指定日期提交"""
-        # 检查是否跳过周末
-        if self.no_weekends and day.weekday() >= 5:
-            return False
+    def _run_sharded(self, schedule, completed, workers, progress=None):
+        """分片并行计算对象，再在当前进程中按顺序串联提交链"""
+        # 进程池只在并行模式下使用，延迟导入以缩短命令行启动时间
+        from concurrent.futures import ProcessPoolExecutor
+        
+        git_repo = self.git_repo
+        # 任务参数在提交后才被序列化，先复制一份不会被串联过程修改的初始状态
+        files = git_repo.snapshot_files()
+        content_model = copy.deepcopy(self.content_model)
+        # ring 模式只需分片之前的 size 条记录即可重建状态，append 模式需要全部记录
+        window = getattr(self.content_model, 'size', None)
+        
+        shards = shard_bounds(completed, len(schedule), workers)
+        logger.info(f"并行计算对象: {len(shards)} 个分片，{workers} 个进程")
+        
+        def submit(low, high):
+            context = completed if window is None else max(completed, low - window)
+            return executor.submit(
+                _hash_shard, git_repo.pack_dir, files, content_model,
+                *schedule.window(context, high), low - context
+            )
+        
+        def stitch(start, trees):
+            """按顺序创建一个分片的提交，依次返回每次提交追加的记录"""
+            commits = schedule.commits(start, start + len(trees) // 20)
+            for position, (commit_time, message_index) in enumerate(commits):
+                commit_message = format_commit_message(commit_time, message_index)
+                git_repo.commit_tree(trees[position * 20:position * 20 + 20],
+                                     commit_message, commit_time)
+                self.commit_count += 1
+                if progress:
+                    progress.update(start + position + 1, commit_time)
+                yield commit_message + '\n\n'
         
-        # 根据频率决定是否提交
-        return randint(0, 100) < self.frequency
+        # 同时在途的分片数有限，已完成但尚未串联的结果不会无限堆积
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for low, high in shards:
+                pending.append((low, submit(low, high)))
+                if len(pending) < workers * 2:
+                    continue
+                self._stitch_shard(pending.popleft(), stitch)
+            while pending:
+                self._stitch_shard(pending.popleft(), stitch)
     
-    def _get_commits_for_day(self):
-        """获取当天的提交次数"""
-        max_c = max(1, min(20, self.max_commits))
-        return randint(1, max_c)
+    def _stitch_shard(self, item, stitch):
+        """等待一个分片的计算结果并串联其提交"""
+        start, future = item
+        trees, blob, data, seconds = future.result()
+        metrics = self.git_repo.metrics
+        metrics.observe('hash_shard', seconds)
+        with metrics.timer('stitch'):
+            self.content_model.extend('README.md', stitch(start, trees))
+            self.git_repo.adopt_file('README.md', blob, data)
+        metrics.inc('commits', len(trees) // 20)
     
-    def _make_contribution(self, commit_time):
+    def restore_content(self, readme):
+        """根据已有的 README.md 内容恢复内容模型的状态"""
+        if readme:
+            entries = readme.split('\n\n')
+            self.content_model.extend('README.md', (entry + '\n\n' for entry in entries[:-1]))
+            if entries[-1]:
+                self.content_model.extend('README.md', [entries[-1]])
+    
+    def resume_position(self, schedule, base=None):
+        """校验仓库 HEAD 与提交计划一致，返回已完成的提交数"""
+        count, head_time = self.git_repo.head_state(base)
+        if count > len(schedule) or (
+                count and head_time != from_wall_seconds(schedule.timestamps[count - 1])):
+            raise ValueError("仓库 HEAD 与续跑日志中的提交计划不一致")
+        return count
+    
+    def _make_contribution(self, commit_time, message_index=None):
         """执行一次提交"""
         try:
-            # 创建或更新 README.md 文件
-            readme_path = os.path.join(os.getcwd(), 'README.md')
-            with open(readme_path, 'a', encoding='utf-8') as file:
-                file.write(self._generate_commit_message(commit_time) + '\n\n')
+            metrics = self.git_repo.metrics
+            commit_message = self._generate_commit_message(commit_time, message_index)
             
-            # 添加文件到暂存区
-            self.git_repo._run_command(['git', 'add', '.'])
+            # 更新 README.md 文件
+            with metrics.timer('file_write'):
+                entry = commit_message + '\n\n'
+                self.git_repo.write_file('README.md', self.content_model.append('README.md', entry))
             
             # 提交更改
-            commit_message = self._generate_commit_message(commit_time)
-            self.git_repo._run_command([
-                'git', 'commit', '-m', f'"{commit_message}"',
-                '--date', commit_time.strftime('"%Y-%m-%d %H:%M:%S"')
-            ])
+            with metrics.timer('commit'):
+                self.git_repo.commit(commit_message, commit_time)
             
             self.commit_count += 1
+            metrics.inc('commits')
             
         except Exception as e:
             logger.error(f"提交失败: {e}")
             raise
     
-    def _generate_commit_message(self, date):
-        """生成提交消息"""
-        template = choice(COMMIT_MESSAGES)
+    def _generate_commit_message(self, date, message_index=None):
+        """生成提交消息（未指定模板编号时随机选择）"""
+        if message_index is None:
+            template = self.rng.choice(COMMIT_MESSAGES)
+        else:
+            template = COMMIT_MESSAGES[message_index]
         return template.format(date=date.strftime('%Y-%m-%d %H:%M'))
 
 
@@ -179,58 +891,253 @@ def validate_arguments(args):
         raise ValueError("max_commits 必须在 1-20 之间")
     if not (0 <= args.frequency <= 100):
         raise ValueError("frequency 必须在 0-100 之间")
+    if args.ring_size < 1:
+        raise ValueError("ring_size 必须大于 0")
+    if args.workers < 1:
+        raise ValueError("workers 必须大于 0")
+    if args.cache_size < 1:
+        raise ValueError("cache_size 必须大于 0")
+    if args.progress_interval <= 0:
+        raise ValueError("progress_interval 必须大于 0")
+    if args.target and args.append:
+        raise ValueError("--target 不能与 --append 一起使用")
+
+
+def build_settings(args, start_date, days):
+    """根据命令行参数生成本次运行的配置，写入续跑日志后可完整重建提交计划"""
+    seed = args.seed if args.seed is not None else random.SystemRandom().randrange(2 ** 32)
+    return {
+        'backend': args.backend,
+        'repository': args.repository,
+        'start_date': start_date.isoformat(),
+        'days': days,
+        'max_commits': args.max_commits,
+        'frequency': args.frequency,
+        'no_weekends': args.no_weekends,
+        'content': args.content,
+        'ring_size': args.ring_size,
+        'seed': seed,
+        'bare': args.bare,
+        'target': None,
+        'base': None,
+    }
+
+
+def inherited_settings(directory):
+    """追加模式沿用的生成参数（仓库中没有可读的续跑日志时返回空字典）"""
+    try:
+        settings = Journal.load(directory).settings
+    except ValueError:
+        return {}
+    return {name: settings[name] for name in APPEND_INHERITED_SETTINGS if name in settings}
+
+
+def evening(moment):
+    """当天的 20:00（秒与微秒清零，同一天内的多次运行得到相同的提交时间）"""
+    return moment.replace(hour=20, minute=0, second=0, microsecond=0)
+
+
+def repository_directory(repository):
+    """根据远程仓库链接确定本地目录名称"""
+    start = repository.rfind('/') + 1
+    end = repository.rfind('.')
+    return repository[start:end]
+
+
+def append_range(latest, curr_date):
+    """计算追加模式的时间范围：从最新提交的次日到昨天，返回 (开始时间, 天数)"""
+    today = evening(curr_date)
+    if latest is None:
+        return today - timedelta(days=DEFAULT_APPEND_DAYS), DEFAULT_APPEND_DAYS
+    days = max(0, (curr_date.date() - latest.date()).days - 1)
+    return today - timedelta(days=days), days
+
+
+def export_metrics(metrics, args):
+    """按命令行参数导出运行指标"""
+    logger.info(f"阶段耗时: {metrics.summary()}")
+    if args.metrics_out:
+        metrics.write_json(args.metrics_out)
+    if args.prometheus_out:
+        metrics.write_prometheus(args.prometheus_out)
+
+
+def generate_history(args, settings, git_repo, start_date, curr_date, journal,
+                     journal_directory):
+    """按配置规划并执行提交（续跑时 journal 为已加载的日志），返回仓库中的总提交数"""
+    # 创建贡献生成器
+    generator = ContributionGenerator(
+        git_repo, 
+        settings['max_commits'], 
+        settings['frequency'], 
+        settings['no_weekends'],
+        make_content_model(settings['content'], settings['ring_size']),
+        settings['seed'],
+        settings.get('target')
+    )
+    
+    if args.append:
+        # 只规划最新提交之后缺少的日期
+        start_date, days = append_range(git_repo.latest_commit_time(), curr_date)
+        settings.update(start_date=start_date.isoformat(), days=days,
+                        base=git_repo.head_commit())
+        logger.info(f"追加模式: 从 {start_date.date()} 开始补充 {days} 天")
+    
+    if args.resume:
+        # 直接映射日志中保存的提交计划，没有计划文件时按配置重新计算
+        schedule = journal.load_schedule()
+        if schedule is None:
+            schedule = generator.plan(start_date, settings['days'])
+        completed = generator.resume_position(schedule, settings['base'])
+        logger.info(f"从第 {completed + 1} 次提交继续，剩余 {len(schedule) - completed} 次")
+    else:
+        # 计算提交计划
+        schedule = generator.plan(start_date, settings['days'])
+        journal = Journal.create(journal_directory, settings)
+        journal.save_schedule(schedule)
+        completed = 0
+    if args.resume or args.append:
+        generator.restore_content(git_repo.read_file('README.md'))
+    
+    # 生成贡献记录
+    progress = None
+    if args.progress:
+        progress = ProgressReporter(len(schedule), args.progress,
+                                    interval=args.progress_interval)
+    generator.run(schedule, completed, args.workers, progress)
+    git_repo.finalize()
+    # 提交全部写入仓库后才记录完成数；续跑位置始终以仓库 HEAD 为准
+    journal.record(completed + generator.commit_count)
+    journal.close()
+    # 没有新提交时无需维护；追加与续跑只维护新增部分，不重新打包整个历史
+    if not args.no_maintenance and generator.commit_count:
+        git_repo.maintain(incremental=bool(args.resume or args.append))
+    return completed + generator.commit_count
 
 
 def main(def_args=sys.argv[1:]):
     """主函数"""
+    # 解析命令行参数
+    args = parse_arguments(def_args)
+    with log_session(LOG_FILE, log_level(args)):
+        generate_repository(args)
+
+
+def generate_repository(args):
+    """按命令行参数生成仓库，失败时以状态码 1 退出"""
+    metrics = Metrics()
     try:
-        # 解析命令行参数
-        args = parse_arguments(def_args)
+        if args.metrics_out:
+            args.metrics_out = os.path.abspath(args.metrics_out)
+        if args.prometheus_out:
+            args.prometheus_out = os.path.abspath(args.prometheus_out)
+        if args.output_bundle:
+            args.output_bundle = os.path.abspath(args.output_bundle)
         validate_arguments(args)
         
         # 获取当前时间
         curr_date = datetime.now()
         
-        # 确定目录名称
-        if args.repository:
-            start = args.repository.rfind('/') + 1
-            end = args.repository.rfind('.')
-            directory = args.repository[start:end]
+        journal = None
+        if args.resume:
+            # 续跑: 从日志恢复配置
+            directory = args.resume
+            journal = Journal.load(directory)
+            settings = journal.settings
+            start_date = datetime.fromisoformat(settings['start_date'])
+        elif args.from_bundle:
+            # 导入: 从 bundle 文件创建仓库，目录默认使用 bundle 的文件名
+            directory = repository_directory(args.repository) if args.repository else \
+                os.path.splitext(os.path.basename(args.from_bundle))[0]
+            start_date = curr_date
+            settings = build_settings(args, start_date, 0)
+        elif args.append:
+            # 追加: 打开已有仓库后再确定时间范围
+            directory = args.append
+            start_date = curr_date
+            settings = build_settings(args, start_date, 0)
         else:
-            directory = 'repository-' + curr_date.strftime('%Y-%m-%d-%H-%M-%S')
-        
-        # 创建 Git 仓库
-        git_repo = GitRepository(directory, args.user_name, args.user_email)
-        git_repo.init_repository()
+            # 确定目录名称
+            if args.repository:
+                directory = repository_directory(args.repository)
+            else:
+                directory = 'repository-' + curr_date.strftime('%Y-%m-%d-%H-%M-%S')
+            if args.target:
+                # 目标图案: 从贡献图显示范围的第一天开始，每天只提交所需的最少次数；
+                # 与其他模式一样只计划到昨天，不生成未来日期的提交
+                start_date = grid_start(evening(curr_date))
+                target = day_counts(load_target(args.target), (evening(curr_date) - start_date).days)
+                settings = build_settings(args, start_date, len(target))
+                settings['target'] = target
+            else:
+                start_date = evening(curr_date) - timedelta(days=args.days_before)
+                if start_date < EARLIEST_COMMIT_DATE:
+                    raise ValueError("Git 不支持 1970 年之前的提交时间，请减小 days_before"
+                                     "（可以用 days_after 向后延伸时间范围）")
+                settings = build_settings(args, start_date, args.days_before + args.days_after)
+        repository = settings['repository']
+        journal_directory = os.path.abspath(directory)
+        if args.workers > 1 and settings['backend'] != 'pack':
+            raise ValueError("--workers 仅支持 pack 后端")
         
-        # 创建贡献生成器
-        generator = ContributionGenerator(
-            git_repo, 
-            args.max_commits, 
-            args.frequency, 
-            args.no_weekends
+        # 创建 Git 仓库后端
+        git_repo = BACKENDS[settings['backend']](
+            directory, args.user_name, args.user_email, metrics, settings.get('bare', False)
         )
         
-        # 计算开始日期
-        start_date = curr_date.replace(hour=20, minute=0) - timedelta(days=args.days_before)
+        # 相同配置与种子的生成结果直接从缓存恢复
+        cache = key = restored = None
+        if args.cache and not (args.resume or args.append or args.from_bundle):
+            if args.seed is None:
+                logger.warning("未指定 --seed，本次不使用缓存")
+            else:
+                cache = HistoryCache(args.cache, args.cache_size)
+                key = cache_key(settings, args.user_name, args.user_email)
+                restored = cache.restore(key, git_repo.path, git_repo.bare)
+        
+        if args.resume or args.append:
+            # 追加到用户已有的仓库时不丢弃其未提交的更改
+            git_repo.open_repository(discard_changes=bool(args.resume))
+        elif restored is None and not args.from_bundle:
+            git_repo.init_repository()
         
-        # 生成贡献记录
-        generator.generate_contributions(start_date, args.days_before, args.days_after)
+        if args.from_bundle:
+            total = git_repo.import_bundle(args.from_bundle)
+        elif restored is not None:
+            # 缓存命中: 只需配置用户信息并写入本次运行的续跑日志
+            git_repo._configure_user()
+            journal = Journal.create(journal_directory, settings)
+            journal.record(restored)
+            journal.close()
+            total = restored
+        else:
+            total = generate_history(args, settings, git_repo, start_date, curr_date,
+                                     journal, journal_directory)
+            if cache:
+                cache.store(key, git_repo.path, total)
+        
+        if args.output_bundle:
+            git_repo.create_bundle(args.output_bundle)
         
         # 推送到远程仓库
-        if args.repository:
-            git_repo.add_remote(args.repository)
+        if repository:
+            if not ((args.resume or args.append) and git_repo.has_remote()):
+                git_repo.add_remote(repository)
             git_repo.push_changes()
         
         print('\n🎉 仓库生成 \033[6;30;42m成功完成\033[0m!')
         print(f'📁 本地目录: {directory}')
-        if args.repository:
-            print(f'🌐 远程仓库: {args.repository}')
-        print(f'📊 总提交数: {generator.commit_count}')
+        if repository:
+            print(f'🌐 远程仓库: {repository}')
+        if args.output_bundle:
+            print(f'📦 bundle 文件: {args.output_bundle}')
+        print(f'📊 总提交数: {total}')
         
     except Exception as e:
         logger.error(f"程序执行失败: {e}")
         sys.exit(1)
+    finally:
+        export_metrics(metrics, args)
 
 
 def parse_arguments(argsval):
@@ -271,9 +1178,76 @@ def parse_arguments(argsval):
     parser.add_argument('-da', '--days_after', type=int, default=0,
                         help="从当前日期往后多少天继续提交 (默认: 0)")
     
+    parser.add_argument('-b', '--backend', choices=sorted(BACKENDS), default='git',
+                        help="仓库写入后端: git 逐条提交，fast-import 单进程流式写入，"
+                             "pack 纯 Python 直接写出 packfile (默认: git)")
+    
+    parser.add_argument('-c', '--content', choices=sorted(CONTENT_MODELS), default='append',
+                        help="README 内容模式: append 持续追加，ring 只保留最近的记录 (默认: append)")
+    
+    parser.add_argument('-rs', '--ring_size', type=int, default=DEFAULT_RING_SIZE,
+                        help=f"ring 模式保留的记录条数 (默认: {DEFAULT_RING_SIZE})")
+    
+    parser.add_argument('-s', '--seed', type=int,
+                        help="随机种子，相同种子生成相同的提交计划")
+    
+    parser.add_argument('-t', '--target', type=str, metavar='PATH',
+                        help="目标图案文件（53×7 强度网格，文本或 PNG），每天只生成达到对应颜色深浅所需的最少提交")
+    
+    parser.add_argument('--bare', action='store_true', default=False,
+                        help="生成 bare 仓库，不写出工作区和暂存区，仅 fast-import / pack 后端")
+    
+    parser.add_argument('--no_maintenance', action='store_true', default=False,
+                        help="生成结束后不执行仓库维护（repack 与 commit-graph）")
+    
+    parser.add_argument('--cache', type=str, metavar='DIRECTORY',
+                        help="生成结果缓存目录，相同配置与 --seed 再次生成时直接从缓存恢复")
+    
+    parser.add_argument('--cache_size', type=int, default=DEFAULT_CACHE_SIZE, metavar='MB',
+                        help=f"缓存总大小上限，超出时淘汰最久未使用的条目 (默认: {DEFAULT_CACHE_SIZE} MB)")
+    
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help="并行计算 Git 对象的进程数，仅 pack 后端 (默认: 1)")
+    
+    parser.add_argument('--output_bundle', type=str, metavar='PATH',
+                        help="生成结束后把完整历史写入单个 git bundle 文件（在推送之前）")
+    
+    parser.add_argument('--progress', choices=PROGRESS_MODES,
+                        help="报告生成进度、速度与预计剩余时间: line 单行刷新，json 每个周期输出一行 JSON（写入标准错误）")
+    
+    parser.add_argument('--progress_interval', type=float, default=DEFAULT_INTERVAL, metavar='SECONDS',
+                        help=f"进度报告周期 (默认: {DEFAULT_INTERVAL} 秒)")
+    
+    parser.add_argument('--metrics_out', type=str, metavar='PATH',
+                        help="将各阶段耗时与计数写入 JSON 文件")
+    
+    parser.add_argument('--prometheus_out', type=str, metavar='PATH',
+                        help="将指标写入 Prometheus textfile collector 格式的文件 (*.prom)")
+    
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--resume', type=str, metavar='DIRECTORY',
+                      help="从中断的仓库目录继续生成（其余生成参数从续跑日志读取）")
+    mode.add_argument('--append', type=str, metavar='DIRECTORY',
+                      help="在已有仓库中补充最新提交之后到昨天的贡献记录（适合每日定时任务）")
+    mode.add_argument('--from_bundle', type=str, metavar='BUNDLE',
+                      help="从 git bundle 文件创建仓库（不生成新的提交）")
+    
+    add_verbosity_arguments(parser)
+    
     parser.add_argument('--version', action='version', version='1.0.0')
     
-    return parser.parse_args(argsval)
+    args = parser.parse_args(argsval)
+    if args.append:
+        # 追加到本程序生成的仓库时，命令行未指定的生成参数沿用续跑日志中的配置
+        saved = inherited_settings(args.append)
+        if saved:
+            parser.set_defaults(**saved)
+            args = parser.parse_args(argsval)
+    # 续跑时 bare 与后端从续跑日志读取；导入 bundle 时同样由后端创建仓库
+    if args.bare and not args.resume and not BACKENDS[args.backend].supports_bare:
+        parser.error(f"--bare 需要 --backend=fast-import 或 pack（{args.backend} 后端需要工作区），"
+                     "--from_bundle 导入 bare 仓库时也需要指定")
+    return args
 
 
 if __name__ == "__main__":
@@ -0,0 +1,328 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+批量仓库生成
+根据清单文件（JSON / CSV / YAML）并发生成多个仓库：
+- 每个仓库在进程池中独立生成，并发数由 --jobs 限制
+- 单个仓库失败不影响其他仓库，失败原因记录在汇总报告中
+- 结束后输出整体吞吐量（提交/秒）汇总，可选写出 JSON 报告
+- --engine=async 时改为在单个进程的 asyncio 事件循环中生成（仅支持 git 后端的
+  contribute 模式），并发的 git 子进程数由 --concurrency 限制
+
+YAML 清单需要安装 PyYAML，JSON 与 CSV 只依赖标准库。
+
+用法:
+  python fleet.py manifest.json --jobs 8 --report fleet_report.json
+  python fleet.py manifest.json --engine async --concurrency 16
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from logging.handlers import QueueHandler
+
+import async_engine
+from content import CONTENT_MODELS, DEFAULT_RING_SIZE, make_content_model
+from contribute import BACKENDS, LOG_FILE, ContributionGenerator, evening
+from generate_realistic_contributions import RealisticContributionGenerator
+from logsetup import add_verbosity_arguments, log_level, log_session
+
+logger = logging.getLogger(__name__)
+
+# 贡献模式
+PATTERNS = ('contribute', 'realistic')
+
+# 执行引擎
+ENGINES = ('process', 'async')
+
+# 清单字段的默认值，directory 为必填项
+DEFAULTS = {
+    'user_name': None,
+    'user_email': None,
+    'days': 365,
+    'frequency': 80,
+    'max_commits': 10,
+    'no_weekends': False,
+    'pattern': 'contribute',
+    'backend': 'git',
+    'content': 'append',
+    'ring_size': DEFAULT_RING_SIZE,
+    'seed': None,
+    'bare': False,
+}
+
+INT_FIELDS = ('days', 'frequency', 'max_commits', 'ring_size', 'seed')
+
+
+def _to_bool(value):
+    """将清单中的布尔值（CSV 中为字符串）转换为 bool"""
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'y')
+    return bool(value)
+
+
+def normalize_entry(entry):
+    """补全默认值、转换类型并校验一条清单记录"""
+    if not entry.get('directory'):
+        raise ValueError("清单记录缺少 directory")
+    unknown = set(entry) - set(DEFAULTS) - {'directory'}
+    if unknown:
+        raise ValueError(f"未知的清单字段: {', '.join(sorted(unknown))}")
+
+    # CSV 中的空单元格视为未填写
+    values = {key: value for key, value in entry.items() if value not in ('', None)}
+    result = dict(DEFAULTS, **values)
+    result['directory'] = os.path.abspath(result['directory'])
+    for key in INT_FIELDS:
+        if result[key] is not None:
+            result[key] = int(result[key])
+    result['no_weekends'] = _to_bool(result['no_weekends'])
+    result['bare'] = _to_bool(result['bare'])
+
+    if result['pattern'] not in PATTERNS:
+        raise ValueError(f"未知的贡献模式: {result['pattern']}")
+    if result['backend'] not in BACKENDS:
+        raise ValueError(f"未知的仓库后端: {result['backend']}")
+    if result['bare'] and not BACKENDS[result['backend']].supports_bare:
+        raise ValueError("bare 模式仅支持 fast-import 和 pack 后端")
+    if result['content'] not in CONTENT_MODELS:
+        raise ValueError(f"未知的内容模式: {result['content']}")
+    if result['days'] < 0:
+        raise ValueError("days 不能为负数")
+    if not 1 <= result['max_commits'] <= 20:
+        raise ValueError("max_commits 必须在 1-20 之间")
+    if not 0 <= result['frequency'] <= 100:
+        raise ValueError("frequency 必须在 0-100 之间")
+    return result
+
+
+def _read_entries(path):
+    """按扩展名读取清单中的原始记录"""
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, encoding='utf-8', newline='') as file:
+        if extension == '.csv':
+            return list(csv.DictReader(file))
+        if extension in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("读取 YAML 清单需要安装 PyYAML (pip install pyyaml)")
+            data = yaml.safe_load(file)
+        elif extension == '.json':
+            data = json.load(file)
+        else:
+            raise ValueError(f"不支持的清单格式: {path}")
+
+    # 顶层可以是记录列表，也可以是 {"repositories": [...]}
+    if isinstance(data, dict):
+        data = data.get('repositories')
+    if not isinstance(data, list):
+        raise ValueError(f"清单应为仓库记录列表: {path}")
+    return data
+
+
+def load_manifest(path):
+    """读取并校验清单，返回规范化后的记录列表"""
+    entries = []
+    directories = set()
+    for number, entry in enumerate(_read_entries(path), 1):
+        try:
+            entry = normalize_entry(entry)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"清单第 {number} 条记录无效: {e}")
+        if entry['directory'] in directories:
+            raise ValueError(f"清单第 {number} 条记录的目录重复: {entry['directory']}")
+        directories.add(entry['directory'])
+        entries.append(entry)
+    return entries
+
+
+def _start_date(days):
+    """contribute 模式的起始时间：days 天前的 20:00"""
+    return evening(datetime.now()) - timedelta(days=days)
+
+
+def _new_result(entry):
+    """单个仓库的初始结果"""
+    return {'directory': entry['directory'], 'pattern': entry['pattern'],
+            'backend': entry['backend'], 'commits': 0, 'error': None}
+
+
+def generate_repository(entry):
+    """生成单个仓库并返回结果（在工作进程中调用，异常记录在结果中）"""
+    started = time.perf_counter()
+    result = _new_result(entry)
+    try:
+        content_model = make_content_model(entry['content'], entry['ring_size'])
+        if entry['pattern'] == 'realistic':
+            generator = RealisticContributionGenerator(
+                entry['user_name'], entry['user_email'], content_model, entry['seed'],
+                entry['backend'], entry['bare']
+            )
+            generator.generate_realistic_pattern(entry['days'], directory=entry['directory'])
+        else:
+            git_repo = BACKENDS[entry['backend']](
+                entry['directory'], entry['user_name'], entry['user_email'], bare=entry['bare']
+            )
+            git_repo.init_repository()
+            generator = ContributionGenerator(
+                git_repo, entry['max_commits'], entry['frequency'], entry['no_weekends'],
+                content_model, entry['seed']
+            )
+            generator.generate_contributions(_start_date(entry['days']), entry['days'], 0)
+            git_repo.finalize()
+            git_repo.maintain()
+        result['commits'] = generator.commit_count
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def _init_worker():
+    """工作进程只输出警告及以上级别的日志，避免逐日日志刷屏
+
+    父进程的日志队列在子进程中没有监听线程，改为直接写入标准错误。
+    """
+    logging.disable(logging.INFO)
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, QueueHandler):
+            root.removeHandler(handler)
+            root.addHandler(logging.StreamHandler())
+
+
+def _async_job(entry):
+    """构造 asyncio 引擎中生成单个仓库的任务"""
+    async def job(semaphore):
+        if entry['pattern'] != 'contribute' or entry['backend'] != 'git':
+            raise ValueError("async 引擎仅支持 git 后端的 contribute 模式")
+        git_repo = async_engine.AsyncGitRepository(
+            entry['directory'], entry['user_name'], entry['user_email'], semaphore=semaphore
+        )
+        generator = async_engine.AsyncContributionGenerator(
+            git_repo, entry['max_commits'], entry['frequency'], entry['no_weekends'],
+            make_content_model(entry['content'], entry['ring_size']), entry['seed']
+        )
+        return await async_engine.generate_repository(
+            git_repo, generator, _start_date(entry['days']), entry['days']
+        )
+    return job
+
+
+def run_fleet_async(entries, concurrency=async_engine.DEFAULT_CONCURRENCY):
+    """在单个事件循环中并发生成清单中的仓库，返回汇总报告"""
+    started = time.perf_counter()
+    outcomes = asyncio.run(async_engine.run_all(
+        [_async_job(entry) for entry in entries], concurrency
+    ))
+    results = []
+    for entry, (commits, error, seconds) in zip(entries, outcomes):
+        result = _new_result(entry)
+        result['seconds'] = round(seconds, 4)
+        if error:
+            result['error'] = f"{type(error).__name__}: {error}"
+            logger.error(f"生成失败: {result['directory']}: {result['error']}")
+        else:
+            result['commits'] = commits
+        results.append(result)
+    return _summarize(results, time.perf_counter() - started, concurrency)
+
+
+def run_fleet(entries, jobs=None):
+    """使用最多 jobs 个进程并发生成清单中的仓库，返回汇总报告"""
+    started = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor:
+        futures = {executor.submit(generate_repository, entry): entry for entry in entries}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                # 工作进程异常退出等无法在进程内捕获的错误
+                result = {'directory': futures[future]['directory'], 'commits': 0,
+                          'error': f"{type(e).__name__}: {e}", 'seconds': None}
+            if result['error']:
+                logger.error(f"生成失败: {result['directory']}: {result['error']}")
+            else:
+                logger.info(f"生成完成: {result['directory']} ({result['commits']} 次提交)")
+            results.append(result)
+
+    order = {entry['directory']: index for index, entry in enumerate(entries)}
+    results.sort(key=lambda result: order[result['directory']])
+    return _summarize(results, time.perf_counter() - started, jobs or os.cpu_count())
+
+
+def _summarize(results, wall, jobs):
+    """汇总各仓库的结果"""
+    commits = sum(result['commits'] for result in results)
+    failed = sum(1 for result in results if result['error'])
+    return {
+        'repositories': len(results),
+        'succeeded': len(results) - failed,
+        'failed': failed,
+        'commits': commits,
+        'wall_seconds': round(wall, 4),
+        'commits_per_second': round(commits / wall, 2) if wall else None,
+        'jobs': jobs,
+        'results': results,
+    }
+
+
+def print_report(report):
+    """输出汇总报告"""
+    for result in report['results']:
+        status = f"❌ {result['error']}" if result['error'] else '✅'
+        print(f"{result['directory']}: {result['commits']} 次提交 {status}")
+    print(f"\n📊 仓库: {report['repositories']} (成功 {report['succeeded']}，失败 {report['failed']})")
+    print(f"📊 总提交数: {report['commits']}，耗时 {report['wall_seconds']:.2f} 秒，"
+          f"{report['commits_per_second'] or 0:.1f} 次提交/秒（并发 {report['jobs']}）")
+
+
+def main(argv=sys.argv[1:]):
+    """主函数"""
+    parser = argparse.ArgumentParser(description='根据清单批量生成仓库')
+    parser.add_argument('manifest', help="清单文件路径 (.json / .csv / .yaml)")
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help="最大并发进程数 (默认: CPU 核数)")
+    parser.add_argument('--engine', choices=ENGINES, default='process',
+                        help="执行引擎: 进程池或单进程 asyncio (默认: process)")
+    parser.add_argument('--concurrency', type=int, default=async_engine.DEFAULT_CONCURRENCY,
+                        help="async 引擎同时运行的 git 子进程数 (默认: CPU 核数)")
+    parser.add_argument('--report', help="汇总报告 JSON 文件路径")
+    add_verbosity_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("jobs 必须大于 0")
+    if args.concurrency < 1:
+        parser.error("concurrency 必须大于 0")
+
+    with log_session(LOG_FILE, log_level(args)):
+        try:
+            entries = load_manifest(args.manifest)
+        except (OSError, ValueError) as e:
+            logger.error(f"读取清单失败: {e}")
+            sys.exit(1)
+
+        if args.engine == 'async':
+            report = run_fleet_async(entries, args.concurrency)
+        else:
+            report = run_fleet(entries, args.jobs)
+        print_report(report)
+        if args.report:
+            with open(args.report, 'w', encoding='utf-8') as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+            print(f"报告已写入: {args.report}")
+        if report['failed']:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
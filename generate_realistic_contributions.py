@@ -7,24 +7,23 @@
 - 每隔 4-8 天中断一次（模拟休息日或项目暂停）
 """
 
-import os
+import argparse
 import sys
 import random
 from datetime import datetime, timedelta
-from subprocess import Popen, CalledProcessError
-import subprocess
 import logging
 
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('realistic_contributions.log', encoding='utf-8')
-    ]
-)
+from contribute import BACKENDS
+from content import CONTENT_MODELS, AppendContent, make_content_model
+from logsetup import add_verbosity_arguments, log_level, log_session
+from schedule import plan_realistic
+
+# 日志只在 main() 中配置，导入本模块不会创建日志文件
 logger = logging.getLogger(__name__)
+LOG_FILE = 'realistic_contributions.log'
+
+# 默认日志级别下每隔多少天输出一次进度汇总（-v 时逐日输出）
+SUMMARY_INTERVAL_DAYS = 30
 
 # 提交消息模板
 COMMIT_MESSAGES = [
@@ -54,23 +53,35 @@ COMMIT_MESSAGES = [
 class RealisticContributionGenerator:
     """真实贡献模式生成器"""
     
-    def __init__(self, user_name=None, user_email=None):
+    def __init__(self, user_name=None, user_email=None, content_model=None, seed=None,
+                 backend='git', bare=False):
         self.user_name = user_name
         self.user_email = user_email
+        self.content_model = content_model or AppendContent()
+        self.seed = seed
+        # 文件更新与消息选择也由同一个种子驱动，保证相同配置生成相同的历史
+        self.rng = random.Random(seed)
+        self.backend = backend
+        self.bare = bare
         self.commit_count = 0
         self.directory = None
+        self.git_repo = None
         
-    def generate_realistic_pattern(self, days=365, repository=None):
-        """生成真实贡献模式"""
+    def generate_realistic_pattern(self, days=365, repository=None, directory=None):
+        """生成真实贡献模式（directory 为空时按仓库链接或当前时间命名）"""
         # 创建目录
-        self.directory = f'realistic-contributions-{datetime.now().strftime("%Y-%m-%d-%H-%M-%S")}'
-        if repository:
+        self.directory = directory or f'realistic-contributions-{datetime.now().strftime("%Y-%m-%d-%H-%M-%S")}'
+        if repository and not directory:
             start = repository.rfind('/') + 1
             end = repository.rfind('.')
             self.directory = repository[start:end]
         
-        # 初始化仓库
-        self._init_repository()
+        # 初始化仓库（按路径操作，不切换进程工作目录）
+        backend = BACKENDS[self.backend] if isinstance(self.backend, str) else self.backend
+        self.git_repo = backend(
+            self.directory, self.user_name, self.user_email, bare=self.bare
+        )
+        self.git_repo.init_repository()
         
         # 生成贡献模式
         current_date = datetime.now()
@@ -78,82 +89,43 @@ class RealisticContributionGenerator:
         
         logger.info(f"开始生成真实贡献模式，时间范围: {start_date.date()} 到 {current_date.date()}")
         
-        current_day = start_date
-        consecutive_days = 0
+        schedule = plan_realistic(start_date, current_date, len(COMMIT_MESSAGES), self.seed)
+        logger.info(f"提交计划完成: {schedule.days} 天，共 {len(schedule)} 次提交")
         
-        while current_day <= current_date:
-            # 决定是否中断（每隔4-8天）
-            if consecutive_days >= random.randint(4, 8):
-                # 中断期：1-3天
-                break_days = random.randint(1, 3)
-                logger.info(f"中断期: {current_day.date()} 到 {(current_day + timedelta(days=break_days-1)).date()} ({break_days} 天)")
-                current_day += timedelta(days=break_days)
-                consecutive_days = 0
-                continue
-            
-            # 生成当天的提交
-            commits_today = random.randint(1, 5)
-            self._generate_daily_commits(current_day, commits_today)
-            
-            consecutive_days += 1
-            current_day += timedelta(days=1)
+        for index, (day, commits) in enumerate(schedule.iter_days(), 1):
+            if commits:
+                self._generate_daily_commits(day, commits)
+            if index % SUMMARY_INTERVAL_DAYS == 0:
+                logger.info(f"已生成至 {day.date()}: {index}/{schedule.days} 天，"
+                            f"累计 {self.commit_count} 次提交")
+        self.git_repo.finalize()
+        self.git_repo.maintain()
         
         logger.info(f"真实贡献模式生成完成，总共 {self.commit_count} 次提交")
         
         # 推送到远程仓库
         if repository:
-            self._push_to_remote(repository)
+            self.git_repo.add_remote(repository)
+            self.git_repo.push_changes()
         
         return self.commit_count
     
-    def _init_repository(self):
-        """初始化 Git 仓库"""
-        try:
-            os.makedirs(self.directory, exist_ok=True)
-            os.chdir(self.directory)
-            
-            # 初始化 Git 仓库
-            self._run_command(['git', 'init', '-b', 'main'])
-            
-            # 配置用户信息
-            if self.user_name:
-                self._run_command(['git', 'config', 'user.name', self.user_name])
-            if self.user_email:
-                self._run_command(['git', 'config', 'user.email', self.user_email])
-                
-            logger.info(f"Git 仓库初始化成功: {self.directory}")
-            
-        except Exception as e:
-            logger.error(f"初始化仓库失败: {e}")
-            raise
-    
-    def _generate_daily_commits(self, date, commit_count):
-        """生成一天的提交"""
-        logger.info(f"生成 {date.date()} 的 {commit_count} 次提交")
+    def _generate_daily_commits(self, date, commits):
+        """生成一天的提交，commits 为计划中的 [(提交时间, 消息编号), ...]"""
+        logger.debug(f"生成 {date.date()} 的 {len(commits)} 次提交")
         
-        for i in range(commit_count):
-            # 随机选择提交时间（9:00-23:00）
-            hour = random.randint(9, 23)
-            minute = random.randint(0, 59)
-            commit_time = date.replace(hour=hour, minute=minute)
-            
-            self._make_commit(commit_time)
+        for commit_time, message_index in commits:
+            self._make_commit(commit_time, message_index)
     
-    def _make_commit(self, commit_time):
+    def _make_commit(self, commit_time, message_index=None):
         """执行一次提交"""
         try:
             # 创建或更新文件
             self._update_file(commit_time)
             
-            # 添加文件到暂存区
-            self._run_command(['git', 'add', '.'])
-            
             # 提交更改
-            commit_message = self._generate_commit_message(commit_time)
-            self._run_command([
-                'git', 'commit', '-m', f'"{commit_message}"',
-                '--date', commit_time.strftime('"%Y-%m-%d %H:%M:%S"')
-            ])
+            commit_message = self._generate_commit_message(commit_time, message_index)
+            self.git_repo.commit(commit_message, commit_time)
             
             self.commit_count += 1
             
@@ -164,50 +136,39 @@ class RealisticContributionGenerator:
     def _update_file(self, date):
         """更新文件内容"""
         # 更新 README.md
-        readme_path = os.path.join(os.getcwd(), 'README.md')
-        with open(readme_path, 'a', encoding='utf-8') as file:
-            file.write(f"贡献记录: {date.strftime('%Y-%m-%d %H:%M')}\n\n")
+        self._write_file('README.md', f"贡献记录: {date.strftime('%Y-%m-%d %H:%M')}\n\n")
         
         # 随机更新其他文件
-        if random.random() < 0.3:  # 30% 概率更新其他文件
+        if self.rng.random() < 0.3:  # 30% 概率更新其他文件
             files = ['src/main.py', 'src/utils.py', 'tests/test_main.py', 'docs/README.md']
             for file_path in files:
-                if random.random() < 0.2:  # 20% 概率更新每个文件
-                    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-                    with open(file_path, 'a', encoding='utf-8') as f:
-                        f.write(f"# 更新于 {date.strftime('%Y-%m-%d %H:%M')}\n")
+                if self.rng.random() < 0.2:  # 20% 概率更新每个文件
+                    self._write_file(file_path, f"# 更新于 {date.strftime('%Y-%m-%d %H:%M')}\n")
     
-    def _generate_commit_message(self, date):
-        """生成提交消息"""
-        import random
-        template = random.choice(COMMIT_MESSAGES)
-        return template.format(date=date.strftime('%Y-%m-%d %H:%M'))
+    def _write_file(self, path, entry):
+        """按内容模型写入一条记录"""
+        self.git_repo.write_file(path, self.content_model.append(path, entry))
     
-    def _run_command(self, commands):
-        """执行 Git 命令"""
-        try:
-            process = Popen(commands, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            process.wait()
-            if process.returncode != 0:
-                raise CalledProcessError(process.returncode, commands)
-        except CalledProcessError as e:
-            logger.error(f"命令执行失败: {' '.join(commands)}")
-            raise
-    
-    def _push_to_remote(self, repository):
-        """推送到远程仓库"""
-        try:
-            self._run_command(['git', 'remote', 'add', 'origin', repository])
-            self._run_command(['git', 'branch', '-M', 'main'])
-            self._run_command(['git', 'push', '-u', 'origin', 'main'])
-            logger.info("更改推送成功")
-        except Exception as e:
-            logger.error(f"推送失败: {e}")
-            raise
+    def _generate_commit_message(self, date, message_index=None):
+        """生成提交消息（未指定模板编号时随机选择）"""
+        if message_index is None:
+            template = self.rng.choice(COMMIT_MESSAGES)
+        else:
+            template = COMMIT_MESSAGES[message_index]
+        return template.format(date=date.strftime('%Y-%m-%d %H:%M'))
 
 
-def main():
+def main(argv=sys.argv[1:]):
     """主函数"""
+    parser = argparse.ArgumentParser(description='真实贡献模式生成器（交互式输入生成参数）')
+    add_verbosity_arguments(parser)
+    args = parser.parse_args(argv)
+    with log_session(LOG_FILE, log_level(args)):
+        run_interactive()
+
+
+def run_interactive():
+    """交互式读取生成参数并生成仓库"""
     print("🎯 真实贡献模式生成器")
     print("=" * 50)
     
@@ -221,11 +182,17 @@ def main():
     repository = input("请输入远程仓库链接 (可选，留空仅生成本地): ").strip()
     repository = repository if repository else None
     
+    content = input("请选择内容模式 append/ring (默认 append): ").strip() or 'append'
+    if content not in CONTENT_MODELS:
+        print(f"❌ 未知的内容模式: {content}")
+        return
+    
     print(f"\n📊 生成配置:")
     print(f"   天数: {days}")
     print(f"   用户: {user_name or '使用全局配置'}")
     print(f"   邮箱: {user_email or '使用全局配置'}")
     print(f"   仓库: {repository or '仅生成本地'}")
+    print(f"   内容: {content}")
     print(f"   模式: 每天 1-5 次提交，每隔 4-8 天中断一次")
     
     confirm = input("\n确认开始生成? (y/N): ").strip().lower()
@@ -235,7 +202,9 @@ def main():
     
     try:
         # 创建生成器
-        generator = RealisticContributionGenerator(user_name, user_email)
+        generator = RealisticContributionGenerator(
+            user_name, user_email, make_content_model(content)
+        )
         
         # 生成贡献
         total_commits = generator.generate_realistic_pattern(days, repository)
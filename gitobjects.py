@@ -0,0 +1,385 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Git 对象编码工具
+在进程内计算 blob/tree/commit 对象，并直接写出 packfile、pack 索引和暂存区索引，
+整个过程不依赖 git 可执行文件
+"""
+
+import hashlib
+import io
+import os
+import struct
+import tempfile
+import zlib
+from collections import OrderedDict
+
+# pack 中的对象类型编号
+OBJ_COMMIT = 1
+OBJ_TREE = 2
+OBJ_BLOB = 3
+
+TYPE_NAMES = {
+    OBJ_COMMIT: b'commit',
+    OBJ_TREE: b'tree',
+    OBJ_BLOB: b'blob',
+}
+
+# tree 条目模式
+MODE_FILE = b'100644'
+MODE_TREE = b'40000'
+
+# PackWriter 在内存中记住的最近对象数，用于跳过连续提交间未变化的子目录 tree
+DEDUP_CACHE_SIZE = 4096
+
+# 索引记录不超过该字节数时在内存中排序，否则分桶写入临时文件
+SORT_IN_MEMORY_BYTES = 4 << 20
+
+# pack 索引记录: SHA-1、CRC32、对象在 pack 中的偏移
+_RECORD = struct.Struct('>20sIQ')
+
+
+def object_id(obj_type, data):
+    """计算对象的 SHA-1（20 字节）"""
+    header = b'%s %d\0' % (TYPE_NAMES[obj_type], len(data))
+    return hashlib.sha1(header + data).digest()
+
+
+def encode_tree(entries):
+    """编码 tree 对象内容，entries 为 (模式, 名称, SHA-1) 序列"""
+    # Git 按名称排序，子目录名视为带有结尾的 '/'
+    def sort_key(entry):
+        mode, name, _ = entry
+        return name + b'/' if mode == MODE_TREE else name
+
+    return b''.join(
+        mode + b' ' + name + b'\0' + sha
+        for mode, name, sha in sorted(entries, key=sort_key)
+    )
+
+
+class _TreeNode:
+    """目录树中的一个目录：条目为 {名称: blob SHA-1 或子目录}，sha 为缓存的 tree ID"""
+
+    __slots__ = ('entries', 'sha')
+
+    def __init__(self):
+        self.entries = {}
+        self.sha = None
+
+
+class TreeCache:
+    """按目录缓存 tree 对象 ID 的目录树（Merkle 树）
+
+    set() 只把变化的文件所在目录及其上级目录标记为失效，
+    write() 只重新编码并写入失效的目录，未变化的子目录直接复用缓存的 tree ID。
+    每次提交只修改少数文件时，计算量与改动路径的深度相关，而不是与文件总数相关。
+    """
+
+    def __init__(self, files=()):
+        self._root = _TreeNode()
+        for path, sha in dict(files).items():
+            self.set(path, sha)
+
+    def set(self, path, sha):
+        """记录文件的 blob SHA-1"""
+        parts = path.split('/')
+        node = self._root
+        nodes = [node]
+        for part in parts[:-1]:
+            child = node.entries.get(part)
+            if not isinstance(child, _TreeNode):
+                child = node.entries[part] = _TreeNode()
+            node = child
+            nodes.append(node)
+        if node.entries.get(parts[-1]) == sha:
+            return
+        node.entries[parts[-1]] = sha
+        for node in nodes:
+            node.sha = None
+
+    def write(self, add):
+        """写入失效目录的 tree 对象，返回根 tree 的 SHA-1
+
+        add 为写入对象的函数（如 PackWriter.add），签名为 add(类型, 内容) -> SHA-1。
+        """
+        def write_node(node):
+            if node.sha is None:
+                entries = []
+                for name, value in node.entries.items():
+                    if isinstance(value, _TreeNode):
+                        entries.append((MODE_TREE, name.encode('utf-8'), write_node(value)))
+                    else:
+                        entries.append((MODE_FILE, name.encode('utf-8'), value))
+                node.sha = add(OBJ_TREE, encode_tree(entries))
+            return node.sha
+
+        return write_node(self._root)
+
+
+def write_tree(add, files):
+    """根据 {相对路径: blob SHA-1} 逐层写入全部 tree 对象，返回根 tree 的 SHA-1
+
+    add 为写入对象的函数（如 PackWriter.add），签名为 add(类型, 内容) -> SHA-1。
+    连续提交时使用 TreeCache 只重新写入变化的目录。
+    """
+    return TreeCache(files).write(add)
+
+
+def encode_commit(tree, parents, author, committer, message):
+    """编码 commit 对象内容"""
+    lines = [b'tree ' + tree.hex().encode('ascii')]
+    lines.extend(b'parent ' + parent.hex().encode('ascii') for parent in parents)
+    lines.append(b'author ' + author.encode('utf-8'))
+    lines.append(b'committer ' + committer.encode('utf-8'))
+    return b'\n'.join(lines) + b'\n\n' + message.encode('utf-8')
+
+
+def _pack_object_header(obj_type, size):
+    """编码 pack 对象头（类型 + 变长大小）"""
+    byte = (obj_type << 4) | (size & 0x0f)
+    size >>= 4
+    header = bytearray()
+    while size:
+        header.append(byte | 0x80)
+        byte = size & 0x7f
+        size >>= 7
+    header.append(byte)
+    return bytes(header)
+
+
+class PackWriter:
+    """流式 packfile 写入器
+
+    对象以非增量形式逐个压缩写入临时文件，finish() 时补写对象数量、
+    校验和，并生成对应的 .idx 索引文件。
+
+    内存占用与对象数量无关：每个对象的索引记录（SHA-1、CRC32、偏移）顺序写入
+    临时文件，finish() 时按 SHA-1 首字节分桶排序后流式写出 .idx；
+    去重只保留最近 dedup_cache 个对象，超出窗口的重复对象在排序时发现并从 pack 中剔除。
+    """
+
+    def __init__(self, pack_dir, compression=zlib.Z_DEFAULT_COMPRESSION,
+                 dedup_cache=DEDUP_CACHE_SIZE):
+        self.pack_dir = pack_dir
+        self.compression = compression
+        self.dedup_cache = dedup_cache
+        self._count = 0
+        self._recent = OrderedDict()
+        os.makedirs(pack_dir, exist_ok=True)
+        fd, self._temp_path = tempfile.mkstemp(dir=pack_dir, prefix='tmp_pack_')
+        self._file = os.fdopen(fd, 'w+b')
+        self._file.write(b'PACK' + struct.pack('>II', 2, 0))
+        self._offset = 12
+        self._records = tempfile.TemporaryFile(dir=pack_dir, prefix='tmp_pack_')
+
+    @property
+    def object_count(self):
+        """已写入的对象数量"""
+        return self._count
+
+    def add(self, obj_type, data):
+        """写入一个对象并返回其 SHA-1，最近写入过的重复对象只写一次"""
+        sha = object_id(obj_type, data)
+        if sha in self._recent:
+            self._recent.move_to_end(sha)
+            return sha
+        record = _pack_object_header(obj_type, len(data)) + zlib.compress(data, self.compression)
+        self._file.write(record)
+        self._records.write(_RECORD.pack(sha, zlib.crc32(record), self._offset))
+        self._recent[sha] = None
+        if len(self._recent) > self.dedup_cache:
+            self._recent.popitem(last=False)
+        self._count += 1
+        self._offset += len(record)
+        return sha
+
+    def finish(self):
+        """完成 pack 写入，返回 pack 文件路径（无对象时返回 None）"""
+        if not self._count:
+            self._file.close()
+            self._records.close()
+            os.remove(self._temp_path)
+            return None
+
+        buckets, duplicates = self._sort_records()
+        if duplicates:
+            for bucket in buckets:
+                bucket.close()
+            self._drop_records(duplicates)
+            buckets, _ = self._sort_records()
+        self._records.close()
+        count = sum(_bucket_size(bucket) for bucket in buckets)
+
+        # 补写对象数量后重新计算整个文件的校验和
+        self._file.seek(8)
+        self._file.write(struct.pack('>I', count))
+        self._file.seek(0)
+        digest = hashlib.sha1()
+        for chunk in iter(lambda: self._file.read(1 << 20), b''):
+            digest.update(chunk)
+        checksum = digest.digest()
+        self._file.write(checksum)
+        self._file.close()
+
+        base = os.path.join(self.pack_dir, 'pack-' + checksum.hex())
+        try:
+            self._write_index(base + '.idx', buckets, checksum)
+        finally:
+            for bucket in buckets:
+                bucket.close()
+        os.replace(self._temp_path, base + '.pack')
+        return base + '.pack'
+
+    def _sort_records(self):
+        """按 SHA-1 首字节将索引记录分到 256 个临时文件，并在每个桶内排序
+
+        返回 (桶文件列表, 重复对象的偏移集合)，重复对象保留最先写入的一份。
+        """
+        # 记录总量不大时桶放在内存中，避免创建 256 个临时文件
+        self._records.seek(0, os.SEEK_END)
+        if self._records.tell() <= SORT_IN_MEMORY_BYTES:
+            buckets = [io.BytesIO() for _ in range(256)]
+        else:
+            buckets = [tempfile.TemporaryFile(dir=self.pack_dir, prefix='tmp_pack_')
+                       for _ in range(256)]
+        pending = [bytearray() for _ in range(256)]
+        self._records.seek(0)
+        for chunk in iter(lambda: self._records.read(_RECORD.size * 4096), b''):
+            for pos in range(0, len(chunk), _RECORD.size):
+                first = chunk[pos]
+                pending[first] += chunk[pos:pos + _RECORD.size]
+                if len(pending[first]) >= 1 << 16:
+                    buckets[first].write(pending[first])
+                    pending[first].clear()
+
+        duplicates = set()
+        for bucket, data in zip(buckets, pending):
+            bucket.write(data)
+            bucket.seek(0)
+            records = sorted(_RECORD.iter_unpack(bucket.read()), key=lambda r: (r[0], r[2]))
+            unique = []
+            for record in records:
+                if unique and unique[-1][0] == record[0]:
+                    duplicates.add(record[2])
+                else:
+                    unique.append(record)
+            bucket.seek(0)
+            bucket.truncate()
+            bucket.write(b''.join(_RECORD.pack(*record) for record in unique))
+        return buckets, duplicates
+
+    def _drop_records(self, offsets):
+        """重写 pack 与索引记录，剔除位于指定偏移的重复对象"""
+        fd, temp_path = tempfile.mkstemp(dir=self.pack_dir, prefix='tmp_pack_')
+        packed = os.fdopen(fd, 'w+b')
+        packed.write(b'PACK' + struct.pack('>II', 2, 0))
+        records = tempfile.TemporaryFile(dir=self.pack_dir, prefix='tmp_pack_')
+
+        # 对象按写入顺序排列，每个对象的长度为与下一对象偏移之差
+        def copy(record, end):
+            sha, crc, offset = record
+            if offset not in offsets:
+                self._file.seek(offset)
+                records.write(_RECORD.pack(sha, crc, packed.tell()))
+                packed.write(self._file.read(end - offset))
+
+        previous = None
+        self._records.seek(0)
+        for chunk in iter(lambda: self._records.read(_RECORD.size * 4096), b''):
+            for record in _RECORD.iter_unpack(chunk):
+                if previous:
+                    copy(previous, record[2])
+                previous = record
+        copy(previous, self._offset)
+
+        self._file.close()
+        self._records.close()
+        os.replace(temp_path, self._temp_path)
+        self._file = packed
+        self._records = records
+        self._offset = packed.tell()
+        self._count -= len(offsets)
+
+    def _write_index(self, path, buckets, pack_checksum):
+        """按桶依次流式写出 version 2 格式的 pack 索引"""
+        digest = hashlib.sha1()
+
+        def write(data):
+            digest.update(data)
+            file.write(data)
+
+        fanout = []
+        total = 0
+        for bucket in buckets:
+            total += _bucket_size(bucket)
+            fanout.append(total)
+
+        large_offsets = []
+        with open(path, 'wb') as file:
+            write(b'\377tOc' + struct.pack('>I', 2) + struct.pack('>256I', *fanout))
+            for bucket in buckets:
+                bucket.seek(0)
+                write(b''.join(sha for sha, _, _ in _RECORD.iter_unpack(bucket.read())))
+            for bucket in buckets:
+                bucket.seek(0)
+                write(b''.join(struct.pack('>I', crc)
+                               for _, crc, _ in _RECORD.iter_unpack(bucket.read())))
+            for bucket in buckets:
+                bucket.seek(0)
+                offsets = []
+                for _, _, offset in _RECORD.iter_unpack(bucket.read()):
+                    if offset < 0x80000000:
+                        offsets.append(offset)
+                    else:
+                        offsets.append(0x80000000 | len(large_offsets))
+                        large_offsets.append(offset)
+                write(struct.pack(f'>{len(offsets)}I', *offsets))
+            write(struct.pack(f'>{len(large_offsets)}Q', *large_offsets))
+            write(pack_checksum)
+            file.write(digest.digest())
+
+
+def _bucket_size(bucket):
+    """桶文件中的记录数"""
+    bucket.seek(0, os.SEEK_END)
+    return bucket.tell() // _RECORD.size
+
+
+def write_index_file(path, entries):
+    """写出 version 2 格式的暂存区索引，entries 为 (相对路径, SHA-1, os.stat 结果) 序列"""
+    mask = 0xFFFFFFFF
+    records = []
+    for name, sha, st in sorted(entries, key=lambda entry: entry[0].encode('utf-8')):
+        name = name.encode('utf-8')
+        record = struct.pack(
+            '>10I',
+            int(st.st_ctime) & mask, st.st_ctime_ns % 1000000000,
+            int(st.st_mtime) & mask, st.st_mtime_ns % 1000000000,
+            st.st_dev & mask, st.st_ino & mask, 0o100644,
+            st.st_uid & mask, st.st_gid & mask, st.st_size & mask,
+        ) + sha + struct.pack('>H', min(len(name), 0xFFF)) + name
+        # 条目以 NUL 结尾并补齐到 8 字节边界
+        records.append(record + b'\0' * (8 - len(record) % 8))
+
+    content = b'DIRC' + struct.pack('>II', 2, len(records)) + b''.join(records)
+    with open(path, 'wb') as file:
+        file.write(content + hashlib.sha1(content).digest())
+
+
+def read_index_file(path):
+    """读取 version 2 格式的暂存区索引，返回 [(相对路径, SHA-1), ...]"""
+    with open(path, 'rb') as file:
+        content = file.read()
+    signature, version, count = struct.unpack('>4sII', content[:12])
+    if signature != b'DIRC' or version != 2:
+        raise ValueError(f"不支持的索引格式: {path}")
+
+    entries = []
+    pos = 12
+    for _ in range(count):
+        sha = content[pos + 40:pos + 60]
+        name_end = content.index(b'\0', pos + 62)
+        entries.append((content[pos + 62:name_end].decode('utf-8'), sha))
+        pos += (name_end - pos) // 8 * 8 + 8
+    return entries
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+续跑日志
+在仓库的 .git/contribute 目录（bare 仓库为 contribute 目录）中记录本次生成的配置与进度：
+- journal.json: 重建提交计划所需的全部参数（含随机种子）
+- progress: 最近一次运行结束时仓库中的提交数（仅供查看；续跑位置以仓库 HEAD 为准，
+  生成过程中不逐次写入）
+- schedule: 二进制提交计划，续跑时直接映射，无需重新计算
+"""
+
+import json
+import os
+
+from schedule import load_schedule, write_schedule
+
+JOURNAL_DIR = os.path.join('.git', 'contribute')
+BARE_JOURNAL_DIR = 'contribute'
+JOURNAL_FILE = 'journal.json'
+PROGRESS_FILE = 'progress'
+SCHEDULE_FILE = 'schedule'
+JOURNAL_VERSION = 1
+
+
+def journal_path(directory):
+    """日志目录：普通仓库在 .git 目录下，bare 仓库直接在仓库根目录下"""
+    directory = os.path.abspath(directory)
+    if not os.path.isdir(os.path.join(directory, '.git')) and \
+            os.path.isfile(os.path.join(directory, 'HEAD')):
+        return os.path.join(directory, BARE_JOURNAL_DIR)
+    return os.path.join(directory, JOURNAL_DIR)
+
+
+class Journal:
+    """生成过程的续跑日志"""
+
+    def __init__(self, directory, settings):
+        self.path = journal_path(directory)
+        self.settings = settings
+        self._fd = None
+
+    @classmethod
+    def create(cls, directory, settings):
+        """为新的生成过程创建日志"""
+        journal = cls(directory, settings)
+        os.makedirs(journal.path, exist_ok=True)
+        data = dict(settings, version=JOURNAL_VERSION)
+        with open(os.path.join(journal.path, JOURNAL_FILE), 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False, indent=2)
+        journal.record(0)
+        return journal
+
+    @classmethod
+    def load(cls, directory):
+        """读取已有仓库中的日志"""
+        path = os.path.join(journal_path(directory), JOURNAL_FILE)
+        if not os.path.exists(path):
+            raise ValueError(f"未找到续跑日志: {path}")
+        with open(path, encoding='utf-8') as file:
+            settings = json.load(file)
+        if settings.pop('version', None) != JOURNAL_VERSION:
+            raise ValueError(f"不支持的续跑日志版本: {path}")
+        return cls(directory, settings)
+
+    @property
+    def completed(self):
+        """最近一次运行结束时记录的提交数（中断的运行不更新）"""
+        try:
+            with open(os.path.join(self.path, PROGRESS_FILE), 'rb') as file:
+                return int(file.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def save_schedule(self, schedule):
+        """保存本次生成的提交计划"""
+        write_schedule(schedule, os.path.join(self.path, SCHEDULE_FILE))
+
+    def load_schedule(self):
+        """映射保存的提交计划，旧版本日志没有计划文件时返回 None"""
+        try:
+            return load_schedule(os.path.join(self.path, SCHEDULE_FILE))
+        except FileNotFoundError:
+            return None
+
+    def record(self, completed):
+        """记录仓库中的提交数（定长覆盖写，不做 fsync）"""
+        if self._fd is None:
+            self._fd = os.open(os.path.join(self.path, PROGRESS_FILE), os.O_WRONLY | os.O_CREAT, 0o644)
+        os.pwrite(self._fd, b'%012d\n' % completed, 0)
+
+    def close(self):
+        """关闭进度文件"""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
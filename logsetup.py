@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+命令行日志配置
+只在命令行入口的 main() 中配置日志，导入模块不会创建日志文件：
+- 日志记录经 QueueHandler 放入队列，由 QueueListener 的后台线程写入控制台和日志文件，
+  生成过程中的线程不等待磁盘写入
+- -q 只输出警告和错误，-v 输出调试信息（如真实模式的逐日记录），默认输出阶段信息与周期汇总
+- 调用方（或测试框架）已经配置了根日志记录器时保持原样，与 logging.basicConfig 一致
+"""
+
+import logging
+import sys
+from contextlib import contextmanager
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+
+def add_verbosity_arguments(parser):
+    """添加 -v/--verbose 与 -q/--quiet 参数"""
+    parser.add_argument('-v', '--verbose', action='count', default=0,
+                        help="输出更详细的日志（如逐日的提交记录）")
+    parser.add_argument('-q', '--quiet', action='store_true', default=False,
+                        help="只输出警告和错误日志")
+
+
+def log_level(args):
+    """根据命令行参数确定日志级别"""
+    if args.quiet:
+        return logging.WARNING
+    return logging.DEBUG if args.verbose else logging.INFO
+
+
+@contextmanager
+def log_session(log_file, level=logging.INFO):
+    """在 with 块内把根日志记录器的输出经队列交给后台线程写入控制台和 log_file"""
+    root = logging.getLogger()
+    if root.handlers:
+        yield
+        return
+
+    from logging.handlers import QueueHandler, QueueListener
+    from queue import SimpleQueue
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler(sys.stdout),
+                logging.FileHandler(log_file, encoding='utf-8', delay=True)]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    queue = SimpleQueue()
+    listener = QueueListener(queue, *handlers)
+    queue_handler = QueueHandler(queue)
+    previous_level = root.level
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    listener.start()
+    try:
+        yield
+    finally:
+        # 先移除队列处理器再停止监听线程，停止时会写完队列中剩余的记录
+        root.removeHandler(queue_handler)
+        root.setLevel(previous_level)
+        listener.stop()
+        for handler in handlers:
+            handler.close()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+运行指标
+按阶段统计生成过程的耗时（直方图）和计数，运行结束后导出为 JSON 或
+Prometheus textfile collector 格式
+"""
+
+import json
+import os
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# 直方图分桶上限（秒）
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 10.0)
+
+PROMETHEUS_PREFIX = 'contribute'
+
+
+class Histogram:
+    """固定分桶的耗时直方图"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        """记录一次观测值"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """返回 [(分桶上限, 累计次数), ...]，最后一项上限为 +Inf"""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def to_dict(self):
+        """转换为可序列化的字典"""
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else 0.0,
+            'buckets': {
+                ('+Inf' if bound == float('inf') else str(bound)): total
+                for bound, total in self.cumulative()
+            },
+        }
+
+
+class Metrics:
+    """单次运行的指标集合"""
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self.started = time.perf_counter()
+
+    def inc(self, name, value=1):
+        """增加计数器"""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, seconds):
+        """记录一次阶段耗时"""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name):
+        """统计代码块耗时"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def to_dict(self):
+        """转换为可序列化的字典"""
+        return {
+            'wall_seconds': round(time.perf_counter() - self.started, 6),
+            'counters': dict(self.counters),
+            'phases': {name: hist.to_dict() for name, hist in sorted(self.histograms.items())},
+        }
+
+    def summary(self):
+        """按总耗时排序的阶段摘要，如 'git_commit 12.30s (55%)'"""
+        wall = time.perf_counter() - self.started
+        phases = sorted(self.histograms.items(), key=lambda item: item[1].sum, reverse=True)
+        return ', '.join(
+            f"{name} {hist.sum:.2f}s ({hist.sum / wall:.0%})" if wall else name
+            for name, hist in phases
+        )
+
+    def write_json(self, path):
+        """写出 JSON 格式的指标"""
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_dict(), file, ensure_ascii=False, indent=2)
+
+    def write_prometheus(self, path):
+        """写出 Prometheus textfile collector 格式的指标（先写临时文件再原子替换）"""
+        name = f'{PROMETHEUS_PREFIX}_phase_seconds'
+        lines = [
+            f'# HELP {name} 生成过程各阶段耗时',
+            f'# TYPE {name} histogram',
+        ]
+        for phase, hist in sorted(self.histograms.items()):
+            for bound, total in hist.cumulative():
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{name}_bucket{{phase="{phase}",le="{le}"}} {total}')
+            lines.append(f'{name}_sum{{phase="{phase}"}} {hist.sum:.6f}')
+            lines.append(f'{name}_count{{phase="{phase}"}} {hist.count}')
+        for counter, value in sorted(self.counters.items()):
+            lines.append(f'# TYPE {PROMETHEUS_PREFIX}_{counter}_total counter')
+            lines.append(f'{PROMETHEUS_PREFIX}_{counter}_total {value}')
+        lines.append(f'# TYPE {PROMETHEUS_PREFIX}_wall_seconds gauge')
+        lines.append(f'{PROMETHEUS_PREFIX}_wall_seconds {time.perf_counter() - self.started:.6f}')
+
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write('\n'.join(lines) + '\n')
+        os.replace(temp_path, path)
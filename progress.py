@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+生成进度报告
+在执行提交计划时报告已完成的提交数、最近一段时间的提交速度、预计剩余时间
+以及正在生成的日期：
+- line: 在终端中原地刷新的单行进度
+- json: 每个报告周期输出一行 JSON，便于其他程序读取
+
+每次提交只做一次整数比较；只有提交数达到下一个检查点时才读取时钟，
+检查间隔按实际速度调整为每个报告周期约检查 CHECKS_PER_INTERVAL 次。
+"""
+
+import json
+import sys
+import time
+from collections import deque
+
+PROGRESS_MODES = ('line', 'json')
+
+# 默认报告周期（秒）与计算速度的滑动窗口（秒）
+DEFAULT_INTERVAL = 1.0
+DEFAULT_WINDOW = 10.0
+
+# 每个报告周期内读取时钟的次数
+CHECKS_PER_INTERVAL = 10
+
+
+def format_duration(seconds):
+    """将秒数格式化为 HH:MM:SS"""
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class ProgressReporter:
+    """提交计划的进度报告器（计划总数已知）"""
+
+    def __init__(self, total, mode='line', stream=None, interval=DEFAULT_INTERVAL,
+                 window=DEFAULT_WINDOW, clock=time.monotonic):
+        if mode not in PROGRESS_MODES:
+            raise ValueError(f"未知的进度输出方式: {mode}")
+        self.total = total
+        self.mode = mode
+        self.stream = stream or sys.stderr
+        self.interval = interval
+        self.window = window
+        self.clock = clock
+        self.done = 0
+        self._started = None
+        self._last_report = None
+        self._next_check = 0
+        self._stride = 1
+        self._samples = deque()
+
+    def start(self, done=0):
+        """开始计时，done 为已完成的提交数（续跑时不计入速度）"""
+        now = self.clock()
+        self.done = done
+        self._started = self._last_report = now
+        self._samples.append((now, done))
+        self._next_check = done + self._stride
+
+    def update(self, done, commit_time=None):
+        """记录已完成 done 次提交（commit_time 为刚完成的提交时间），到达报告周期时输出"""
+        if done < self._next_check:
+            return
+        now = self.clock()
+        self.done = done
+        samples = self._samples
+        elapsed = now - samples[-1][0]
+        if elapsed > 0 and elapsed >= self.interval / CHECKS_PER_INTERVAL:
+            # 根据最近一次检查以来的速度调整检查间隔
+            rate = (done - samples[-1][1]) / elapsed
+            self._stride = max(1, int(rate * self.interval / CHECKS_PER_INTERVAL))
+            samples.append((now, done))
+            while len(samples) > 2 and now - samples[0][0] > self.window:
+                samples.popleft()
+        else:
+            # 距离上次检查的时间太短，加倍检查间隔（开始时或速度变快时）
+            self._stride *= 2
+        self._next_check = done + self._stride
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            self._report(now, commit_time)
+
+    def finish(self, done, commit_time=None):
+        """输出最终进度（单行模式结束当前行）"""
+        if self._started is None:
+            return
+        self.done = done
+        self._report(self.clock(), commit_time, final=True)
+        if self.mode == 'line':
+            self.stream.write('\n')
+            self.stream.flush()
+
+    def rate(self, now):
+        """滑动窗口内的平均速度（次/秒）"""
+        first_time, first_done = self._samples[0]
+        if now <= first_time:
+            return 0.0
+        return (self.done - first_done) / (now - first_time)
+
+    def snapshot(self, now, commit_time=None):
+        """当前进度的统计数据"""
+        rate = self.rate(now)
+        remaining = self.total - self.done
+        return {
+            'done': self.done,
+            'total': self.total,
+            'percent': round(100 * self.done / self.total, 2) if self.total else 100.0,
+            'rate': round(rate, 1),
+            'eta_seconds': round(remaining / rate, 1) if rate else None,
+            'elapsed_seconds': round(now - self._started, 3),
+            'date': commit_time.date().isoformat() if commit_time else None,
+        }
+
+    def _report(self, now, commit_time, final=False):
+        """按输出方式写出一次进度"""
+        data = self.snapshot(now, commit_time)
+        if self.mode == 'json':
+            self.stream.write(json.dumps(dict(data, final=final)) + '\n')
+        else:
+            eta = format_duration(data['eta_seconds']) if data['eta_seconds'] is not None else '--:--:--'
+            line = (f"进度 {data['done']}/{data['total']} ({data['percent']:.1f}%) | "
+                    f"{data['rate']:.0f} 次/秒 | 剩余 {eta}")
+            if data['date']:
+                line += f" | 当前日期 {data['date']}"
+            # 清除上一次输出的剩余字符
+            self.stream.write('\r' + line + '\033[K')
+        self.stream.flush()
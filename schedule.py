@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+提交计划
+在执行任何 Git 操作之前一次性计算完整的提交计划：
+- 每天的提交次数
+- 每次提交的时间（本地墙上时间的秒数）
+- 每次提交使用的消息模板编号
+
+时间以“本地墙上时间秒数”保存，即把本地时间当作 UTC 计算出的秒数，
+与 git commit --date "YYYY-mm-dd HH:MM:SS" 的解释方式一致，不受夏令时影响。
+
+计划以三个紧凑数组保存（每次提交 9 字节），可以写入二进制计划文件，
+之后通过 mmap 直接映射为数组视图，执行时无需复制或重新计算：
+
+    头部 32 字节: 魔数 b'CSCH'、版本 (uint32)、起始时间 (int64)、天数 (uint64)、提交数 (uint64)
+    每天的提交次数: uint16 × 天数，补齐到 8 字节边界
+    提交时间: int64 × 提交数
+    消息编号: uint8 × 提交数
+
+所有整数均为小端序。
+"""
+
+import mmap
+import os
+import random
+import struct
+import sys
+from array import array
+from datetime import datetime, timedelta
+from itertools import islice
+
+EPOCH = datetime(1970, 1, 1)
+SECONDS_PER_DAY = 86400
+
+# 计划文件格式
+SCHEDULE_MAGIC = b'CSCH'
+SCHEDULE_VERSION = 1
+SCHEDULE_HEADER = struct.Struct('<4sIqQQ')
+
+# 一次抽取的消息编号个数，避免百万级计划生成同样长度的临时列表
+MESSAGE_CHUNK = 65536
+
+# 真实模式参数
+REALISTIC_COMMITS_PER_DAY = (1, 5)
+REALISTIC_WORK_DAYS = (4, 8)
+REALISTIC_BREAK_DAYS = (1, 3)
+REALISTIC_HOURS = (9, 23)
+
+
+def to_wall_seconds(moment):
+    """将本地时间转换为墙上时间秒数"""
+    return (moment - EPOCH) // timedelta(seconds=1)
+
+
+def from_wall_seconds(seconds):
+    """将墙上时间秒数转换为本地时间"""
+    return EPOCH + timedelta(seconds=seconds)
+
+
+class Schedule:
+    """提交计划（按天的提交次数 + 按提交的时间与消息编号）
+
+    day_counts / timestamps / messages 为 array（'H' / 'q' / 'B'），
+    从计划文件加载时为映射到文件的同类型 memoryview。
+    """
+
+    __slots__ = ('start', 'day_counts', 'timestamps', 'messages')
+
+    def __init__(self, start, day_counts, timestamps, messages):
+        self.start = start
+        self.day_counts = day_counts
+        self.timestamps = timestamps
+        self.messages = messages
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    @property
+    def days(self):
+        """计划覆盖的天数"""
+        return len(self.day_counts)
+
+    def commits(self, start=0, stop=None):
+        """依次返回第 start 到 stop 次提交的 (提交时间, 消息编号)"""
+        pairs = zip(self.timestamps, self.messages)
+        for seconds, message_index in islice(pairs, start, stop):
+            yield from_wall_seconds(seconds), message_index
+
+    def iter_days(self):
+        """依次返回 (日期, 当天的 [(提交时间, 消息编号), ...])"""
+        position = 0
+        for day, count in enumerate(self.day_counts):
+            end = position + count
+            yield from_wall_seconds(self.start + day * SECONDS_PER_DAY), [
+                (from_wall_seconds(self.timestamps[i]), self.messages[i])
+                for i in range(position, end)
+            ]
+            position = end
+
+    def window(self, start, stop):
+        """复制第 start 到 stop 次提交的 (时间数组, 消息编号数组)，可以传给工作进程"""
+        return (_copy_array('q', self.timestamps[start:stop]),
+                _copy_array('B', self.messages[start:stop]))
+
+
+def _copy_array(typecode, values):
+    """把 array 或 memoryview 复制为新的 array"""
+    result = array(typecode)
+    result.frombytes(memoryview(values).cast('B'))
+    return result
+
+
+def _little_endian(typecode, values):
+    """小端序平台直接返回原数组，其他平台返回翻转字节序后的副本（双向通用）"""
+    if sys.byteorder == 'little':
+        return values
+    result = _copy_array(typecode, values)
+    result.byteswap()
+    return result
+
+
+def write_schedule(schedule, path):
+    """把提交计划写入二进制计划文件（先写临时文件再改名）"""
+    header = SCHEDULE_HEADER.pack(SCHEDULE_MAGIC, SCHEDULE_VERSION, schedule.start,
+                                  schedule.days, len(schedule))
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as file:
+        file.write(header)
+        file.write(_little_endian('H', schedule.day_counts))
+        file.write(bytes(-(schedule.days * 2) % 8))
+        file.write(_little_endian('q', schedule.timestamps))
+        file.write(schedule.messages)
+    os.replace(temp_path, path)
+
+
+def load_schedule(path):
+    """映射计划文件，返回数组为文件视图的 Schedule（小端序平台上不复制数据）"""
+    with open(path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if size < SCHEDULE_HEADER.size:
+            raise ValueError(f"提交计划文件格式无效: {path}")
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, start, days, commits = SCHEDULE_HEADER.unpack_from(data)
+    timestamps_offset = SCHEDULE_HEADER.size + days * 2 + (-(days * 2) % 8)
+    messages_offset = timestamps_offset + commits * 8
+    if magic != SCHEDULE_MAGIC or version != SCHEDULE_VERSION or size != messages_offset + commits:
+        data.close()
+        raise ValueError(f"提交计划文件格式无效: {path}")
+
+    view = memoryview(data)
+    day_counts = view[SCHEDULE_HEADER.size:SCHEDULE_HEADER.size + days * 2].cast('H')
+    timestamps = view[timestamps_offset:messages_offset].cast('q')
+    return Schedule(start, _little_endian('H', day_counts), _little_endian('q', timestamps),
+                    view[messages_offset:])
+
+
+def _build_schedule(start, counts, day_offsets, message_count, rng):
+    """根据每天的提交次数与当天时间偏移生成计划"""
+    timestamps = array('q')
+    day_base = start
+    for count, offsets in zip(counts, day_offsets):
+        if count:
+            timestamps.extend([day_base + offset for offset in offsets])
+        day_base += SECONDS_PER_DAY
+    # 分段抽取与一次抽取 len(timestamps) 个的随机序列相同
+    messages = array('B')
+    for offset in range(0, len(timestamps), MESSAGE_CHUNK):
+        messages.extend(rng.choices(range(message_count),
+                                    k=min(MESSAGE_CHUNK, len(timestamps) - offset)))
+    return Schedule(start, array('H', counts), timestamps, messages)
+
+
+def plan_contributions(start_date, days, max_commits=10, frequency=80, no_weekends=False,
+                       message_count=10, seed=None):
+    """计划 ContributionGenerator 的提交
+
+    每天以 frequency% 的概率提交 1 到 max_commits 次，提交时间从
+    start_date 的时刻开始每次间隔 1 分钟。
+    """
+    rng = random.Random(seed)
+    max_c = max(1, min(20, max_commits))
+
+    active = [draw < frequency for draw in rng.choices(range(101), k=days)]
+    if no_weekends:
+        first = start_date.weekday()
+        active = [flag and (first + day) % 7 < 5 for day, flag in enumerate(active)]
+    counts = [
+        count if flag else 0
+        for count, flag in zip(rng.choices(range(1, max_c + 1), k=days), active)
+    ]
+
+    minutes = [minute * 60 for minute in range(max_c)]
+    day_offsets = (minutes[:count] for count in counts)
+    return _build_schedule(to_wall_seconds(start_date), counts, day_offsets, message_count, rng)
+
+
+def plan_target(start_date, counts, message_count=10, seed=None):
+    """按给定的每天提交次数计划提交（用于目标图案模式）
+
+    提交时间与 plan_contributions 相同，从 start_date 的时刻开始每次间隔 1 分钟。
+    """
+    rng = random.Random(seed)
+    day_offsets = ([minute * 60 for minute in range(count)] for count in counts)
+    return _build_schedule(to_wall_seconds(start_date), counts, day_offsets, message_count, rng)
+
+
+def plan_realistic(start_date, end_date, message_count=20, seed=None):
+    """计划 RealisticContributionGenerator 的提交
+
+    连续工作 4-8 天后中断 1-3 天，工作日每天 1-5 次提交，
+    提交时间随机分布在 9:00-23:59 之间并按时间排序。
+    """
+    rng = random.Random(seed)
+    start = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    days = (end_date.date() - start.date()).days + 1
+
+    # 交替的工作期与中断期，平均每段 8 天，一次性抽取足够的段
+    segments = days // 5 + 2
+    work = rng.choices(range(REALISTIC_WORK_DAYS[0], REALISTIC_WORK_DAYS[1] + 1), k=segments)
+    rest = rng.choices(range(REALISTIC_BREAK_DAYS[0], REALISTIC_BREAK_DAYS[1] + 1), k=segments)
+    active = []
+    for work_days, break_days in zip(work, rest):
+        active += [True] * work_days + [False] * break_days
+    del active[days:]
+
+    low, high = REALISTIC_COMMITS_PER_DAY
+    counts = [
+        count if flag else 0
+        for count, flag in zip(rng.choices(range(low, high + 1), k=days), active)
+    ]
+
+    seconds_of_day = range(REALISTIC_HOURS[0] * 3600, (REALISTIC_HOURS[1] + 1) * 3600, 60)
+    draws = iter(rng.choices(seconds_of_day, k=sum(counts)))
+    day_offsets = (sorted(next(draws) for _ in range(count)) for count in counts)
+    return _build_schedule(to_wall_seconds(start), counts, day_offsets, message_count, rng)
@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+贡献图目标图案
+读取 53×7 的强度网格（文本或 PNG），计算每天所需的最少提交次数：
+- 每列对应一周（周日到周六），每行对应一周中的一天
+- 强度分为 0-4 五级，网格中的最大强度对应贡献图最深的颜色
+- 贡献图的颜色深浅取决于当天提交数相对于最多一天的比例，
+  因此只需让最多的一天达到能区分所用等级的最小提交数
+
+文本格式: 每行一个星期几，字符 0-4 表示强度，空格或 . 表示 0，# 表示 4
+PNG 格式: 每个像素一天，颜色越深强度越高（透明像素为 0），仅支持 8 位非隔行图片
+"""
+
+import struct
+import zlib
+from datetime import timedelta
+
+# 贡献图的行数（周日到周六）、最多列数（周数）与最高强度
+GRID_ROWS = 7
+GRID_COLUMNS = 53
+MAX_LEVEL = 4
+
+TEXT_LEVELS = {' ': 0, '.': 0, '#': MAX_LEVEL}
+TEXT_LEVELS.update({str(level): level for level in range(MAX_LEVEL + 1)})
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# PNG 颜色类型对应的每像素通道数
+PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+
+def load_target(path):
+    """读取目标图案，返回 7 行等宽的强度网格（缺少的行和列补 0）"""
+    with open(path, 'rb') as file:
+        data = file.read()
+    if data.startswith(PNG_SIGNATURE):
+        grid = _png_levels(data)
+    else:
+        grid = _text_levels(data.decode('utf-8'))
+    return _normalize_grid(grid)
+
+
+def _text_levels(text):
+    """解析文本网格"""
+    rows = text.splitlines()
+    while rows and not rows[-1].strip():
+        rows.pop()
+    grid = []
+    for number, row in enumerate(rows, 1):
+        try:
+            grid.append([TEXT_LEVELS[char] for char in row.rstrip()])
+        except KeyError as e:
+            raise ValueError(f"目标图案第 {number} 行包含无效字符: {e.args[0]!r}")
+    return grid
+
+
+def _png_levels(data):
+    """解析 PNG 网格：按像素的深浅量化为 0-4 级"""
+    width, height, pixels = _decode_png(data)
+    grid = []
+    for y in range(height):
+        row = []
+        for x in range(width):
+            luminance, alpha = pixels[y][x]
+            intensity = (255 - luminance) * alpha / 255
+            row.append(round(intensity * MAX_LEVEL / 255))
+        grid.append(row)
+    return grid
+
+
+def _decode_png(data):
+    """解码 8 位非隔行 PNG，返回 (宽, 高, 每行 [(灰度, 透明度), ...])"""
+    pos = len(PNG_SIGNATURE)
+    header = None
+    palette = []
+    transparency = b''
+    compressed = []
+    while pos < len(data):
+        length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        pos += length + 12
+        if kind == b'IHDR':
+            header = struct.unpack('>IIBBBBB', body)
+        elif kind == b'PLTE':
+            palette = [tuple(body[i:i + 3]) for i in range(0, len(body), 3)]
+        elif kind == b'tRNS':
+            transparency = body
+        elif kind == b'IDAT':
+            compressed.append(body)
+        elif kind == b'IEND':
+            break
+    if header is None:
+        raise ValueError("无效的 PNG 文件: 缺少 IHDR")
+    width, height, depth, color_type, _, _, interlace = header
+    if depth != 8 or interlace or color_type not in PNG_CHANNELS:
+        raise ValueError("仅支持 8 位非隔行的 PNG 图片")
+
+    channels = PNG_CHANNELS[color_type]
+    stride = width * channels
+    raw = zlib.decompress(b''.join(compressed))
+    rows = []
+    previous = bytearray(stride)
+    for y in range(height):
+        start = y * (stride + 1)
+        row = _unfilter(raw[start], bytearray(raw[start + 1:start + 1 + stride]),
+                        previous, channels)
+        rows.append([
+            _pixel(row[x * channels:(x + 1) * channels], color_type, palette, transparency)
+            for x in range(width)
+        ])
+        previous = row
+    return width, height, rows
+
+
+def _unfilter(kind, row, previous, bpp):
+    """还原一行扫描线的 PNG 过滤"""
+    for i in range(len(row)):
+        left = row[i - bpp] if i >= bpp else 0
+        up = previous[i]
+        if kind == 1:
+            row[i] = (row[i] + left) & 0xff
+        elif kind == 2:
+            row[i] = (row[i] + up) & 0xff
+        elif kind == 3:
+            row[i] = (row[i] + (left + up) // 2) & 0xff
+        elif kind == 4:
+            upper_left = previous[i - bpp] if i >= bpp else 0
+            estimate = left + up - upper_left
+            distances = (abs(estimate - left), abs(estimate - up), abs(estimate - upper_left))
+            row[i] = (row[i] + (left, up, upper_left)[distances.index(min(distances))]) & 0xff
+        elif kind != 0:
+            raise ValueError(f"无效的 PNG 过滤类型: {kind}")
+    return row
+
+
+def _pixel(values, color_type, palette, transparency):
+    """将像素转换为 (灰度, 透明度)"""
+    if color_type == 3:
+        index = values[0]
+        values = palette[index] + ((transparency[index],) if index < len(transparency) else (255,))
+    elif color_type == 0:
+        values = (values[0],) * 3 + (255,)
+    elif color_type == 4:
+        values = (values[0],) * 3 + (values[1],)
+    elif color_type == 2:
+        values = tuple(values) + (255,)
+    red, green, blue, alpha = values
+    return (299 * red + 587 * green + 114 * blue) // 1000, alpha
+
+
+def _normalize_grid(grid):
+    """校验网格尺寸并补齐为 7 行等宽"""
+    if len(grid) > GRID_ROWS:
+        raise ValueError(f"目标图案最多 {GRID_ROWS} 行（周日到周六），实际 {len(grid)} 行")
+    width = max((len(row) for row in grid), default=0)
+    if width > GRID_COLUMNS:
+        raise ValueError(f"目标图案最多 {GRID_COLUMNS} 列（周），实际 {width} 列")
+    if not any(any(row) for row in grid):
+        raise ValueError("目标图案为空")
+    grid = [row + [0] * (width - len(row)) for row in grid]
+    return grid + [[0] * width for _ in range(GRID_ROWS - len(grid))]
+
+
+def contribution_level(count, peak):
+    """提交 count 次的一天在贡献图中的强度等级（peak 为最多一天的提交数）"""
+    if not count:
+        return 0
+    return -(-count * MAX_LEVEL // peak)
+
+
+def level_commits(levels):
+    """计算各强度等级所需的最少提交次数 {等级: 提交次数}
+
+    网格中的最大强度视为最高等级；从 peak=1 开始寻找能让每个所用等级都有对应
+    提交次数的最小 peak（peak=4 时总能满足）。
+    """
+    top = max(levels, default=0)
+    scaled = {level: round(level * MAX_LEVEL / top) for level in set(levels) if level}
+    for peak in range(1, MAX_LEVEL + 1):
+        counts = {level: level * peak // MAX_LEVEL for level in set(scaled.values())}
+        if all(contribution_level(count, peak) == level for level, count in counts.items()):
+            break
+    result = {0: 0}
+    result.update({level: counts[target] for level, target in scaled.items()})
+    return result
+
+
+def grid_start(moment):
+    """网格第一天：moment 所在周（周日开始）往前 52 周的周日，与贡献图的显示范围一致"""
+    sunday = moment - timedelta(days=(moment.weekday() + 1) % 7)
+    return sunday - timedelta(weeks=GRID_COLUMNS - 1)
+
+
+def day_counts(grid, days=None):
+    """按日期顺序（逐列、每列周日到周六）返回每天的提交次数
+
+    days 为贡献图中能显示的天数时只返回前 days 天，最大强度也只在这些天中计算，
+    避免被截掉的日期抬高提交次数。
+    """
+    levels = [grid[row][column]
+              for column in range(len(grid[0])) for row in range(GRID_ROWS)][:days]
+    commits = level_commits(levels)
+    return [commits[level] for level in levels]
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+asyncio 提交引擎测试模块
+"""
+
+import asyncio
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from datetime import datetime
+from subprocess import CalledProcessError
+
+import async_engine
+import contribute
+import fleet
+
+START = datetime(2023, 12, 1, 20, 0)
+
+
+def git_log(directory):
+    """读取仓库历史（作者、时间、消息）"""
+    return subprocess.check_output(
+        ['git', 'log', '--format=%an|%ae|%ad|%cd|%s', '--date=iso'], cwd=directory
+    )
+
+
+class TestAsyncEngine(unittest.TestCase):
+    """asyncio 引擎测试类（使用真实 Git）"""
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """测试后的清理工作"""
+        shutil.rmtree(self.temp_dir)
+
+    def _async_job(self, name, seed, days=5):
+        async def job(semaphore):
+            git_repo = async_engine.AsyncGitRepository(
+                os.path.join(self.temp_dir, name), name, f'{name}@example.com',
+                semaphore=semaphore
+            )
+            generator = async_engine.AsyncContributionGenerator(
+                git_repo, max_commits=3, frequency=100, seed=seed
+            )
+            return await async_engine.generate_repository(git_repo, generator, START, days)
+        return job
+
+    def test_same_history_as_git_backend(self):
+        """测试与同步 git 后端生成相同的历史"""
+        repo = contribute.GitRepository(os.path.join(self.temp_dir, 'sync'), 'sync',
+                                        'sync@example.com')
+        repo.init_repository()
+        generator = contribute.ContributionGenerator(repo, max_commits=3, frequency=100, seed=9)
+        generator.generate_contributions(START, 5, 0)
+
+        [(commits, error, _)] = asyncio.run(async_engine.run_all([self._async_job('sync-a', 9)]))
+        self.assertIsNone(error)
+        self.assertEqual(commits, generator.commit_count)
+        expected = git_log(repo.path).replace(b'sync|sync@', b'sync-a|sync-a@')
+        self.assertEqual(git_log(os.path.join(self.temp_dir, 'sync-a')), expected)
+
+    def test_many_repositories_share_one_loop(self):
+        """测试多个仓库在同一事件循环中并发生成且失败互不影响"""
+        async def failing(semaphore):
+            git_repo = async_engine.AsyncGitRepository(
+                os.path.join(self.temp_dir, 'broken'), semaphore=semaphore
+            )
+            await git_repo.init_repository()
+            await git_repo._run_command(['git', 'rev-parse', '--verify', 'no-such-ref'])
+
+        jobs = [self._async_job(f'repo-{index}', index) for index in range(4)]
+        outcomes = asyncio.run(async_engine.run_all(jobs + [failing], concurrency=2))
+
+        for index, (commits, error, seconds) in enumerate(outcomes[:4]):
+            self.assertIsNone(error)
+            count = subprocess.check_output(
+                ['git', 'rev-list', '--count', 'HEAD'],
+                cwd=os.path.join(self.temp_dir, f'repo-{index}')
+            )
+            self.assertEqual(int(count), commits)
+            self.assertGreater(seconds, 0)
+        _, error, _ = outcomes[4]
+        self.assertIsInstance(error, CalledProcessError)
+        self.assertIn(b'Needed a single revision', error.stderr)
+
+    def test_fleet_async_engine(self):
+        """测试 fleet 的 async 引擎"""
+        entries = [
+            fleet.normalize_entry({'directory': os.path.join(self.temp_dir, 'a'),
+                                   'user_name': 'a', 'user_email': 'a@example.com',
+                                   'days': 5, 'frequency': 100, 'seed': 1}),
+            fleet.normalize_entry({'directory': os.path.join(self.temp_dir, 'b'),
+                                   'days': 5, 'backend': 'pack'}),
+        ]
+        report = fleet.run_fleet_async(entries, concurrency=2)
+        self.assertEqual((report['succeeded'], report['failed']), (1, 1))
+        self.assertGreater(report['commits'], 0)
+        self.assertIn('async', report['results'][1]['error'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
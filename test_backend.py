@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+仓库后端接口与内存后端测试模块
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from collections import Counter
+from datetime import datetime
+
+import contribute
+from async_engine import AsyncContributionGenerator, AsyncGitRepository
+from backend import MemoryRepository, RepositoryBackend
+from content import RingContent
+from generate_realistic_contributions import RealisticContributionGenerator
+from schedule import from_wall_seconds
+
+
+class TestRepositoryBackend(unittest.TestCase):
+    """仓库后端接口测试类"""
+
+    def test_backends_implement_interface(self):
+        """测试所有后端都实现了公共接口"""
+        for backend in list(contribute.BACKENDS.values()) + [MemoryRepository]:
+            self.assertTrue(issubclass(backend, RepositoryBackend), backend)
+
+        class Incomplete(RepositoryBackend):
+            def commit(self, message, commit_time):
+                pass
+
+        with self.assertRaises(TypeError):
+            Incomplete('incomplete')
+
+    def test_async_repository_is_not_a_backend(self):
+        """测试 asyncio 仓库（命令方法为协程）不能用于同步生成器"""
+        self.assertFalse(issubclass(AsyncGitRepository, RepositoryBackend))
+        with self.assertRaises(TypeError):
+            contribute.ContributionGenerator(AsyncGitRepository('async-repo'))
+        with self.assertRaises(TypeError):
+            AsyncContributionGenerator(MemoryRepository())
+
+    def test_bare_requires_support(self):
+        """测试不支持 bare 的后端拒绝 bare 模式"""
+        with self.assertRaises(ValueError):
+            contribute.GitRepository('repo', bare=True)
+        self.assertTrue(MemoryRepository(bare=True).bare)
+
+
+class TestMemoryRepository(unittest.TestCase):
+    """内存后端测试类"""
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+
+    def tearDown(self):
+        """测试后的清理工作"""
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir)
+
+    def _generate(self, seed, days=400, frequency=70, no_weekends=False, max_commits=12):
+        """用内存后端执行完整的生成过程，返回 (仓库, 生成器, 提交计划)"""
+        repo = MemoryRepository()
+        repo.init_repository()
+        generator = contribute.ContributionGenerator(repo, max_commits, frequency, no_weekends,
+                                                     RingContent(5), seed)
+        schedule = generator.plan(datetime(2020, 1, 1, 20, 0), days)
+        generator.run(schedule)
+        repo.finalize()
+        return repo, generator, schedule
+
+    def test_records_generated_history(self):
+        """测试内存后端记录的历史与提交计划一致，且不写入磁盘"""
+        repo, generator, schedule = self._generate(seed=5)
+        self.assertEqual(list(repo.timestamps), list(schedule.timestamps))
+        self.assertEqual(len(repo), generator.commit_count)
+        self.assertEqual(repo.read_file('README.md').count('\n\n'), 5)
+        self.assertEqual(repo.latest_commit_time(), from_wall_seconds(schedule.timestamps[-1]))
+        self.assertEqual(generator.resume_position(schedule), len(schedule))
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+        self.assertEqual(self._generate(seed=5)[0].digest(), repo.digest())
+        self.assertNotEqual(self._generate(seed=6)[0].digest(), repo.digest())
+
+    def test_schedule_properties(self):
+        """测试多组随机配置下的计划性质：时间递增、每天提交数不超过上限、周末不提交"""
+        for seed in range(20):
+            max_commits = seed % 20 + 1
+            repo, _, schedule = self._generate(seed, days=200, frequency=seed * 5,
+                                               no_weekends=seed % 2 == 0, max_commits=max_commits)
+            times = [from_wall_seconds(seconds) for seconds in repo.timestamps]
+            self.assertEqual(times, sorted(times))
+            per_day = Counter(moment.date() for moment in times)
+            self.assertLessEqual(max(per_day.values(), default=0), max_commits)
+            self.assertEqual(sum(per_day.values()), sum(schedule.day_counts))
+            if seed % 2 == 0:
+                self.assertTrue(all(day.weekday() < 5 for day in per_day))
+
+    def test_resume_and_append_on_memory_history(self):
+        """测试在已记录的历史上定位续跑位置并继续追加"""
+        repo, generator, schedule = self._generate(seed=3, days=30)
+        base = repo.head_commit()
+        repo.open_repository()
+        generator.run(schedule, len(schedule))
+        self.assertEqual(repo.head_state(base), (0, repo.latest_commit_time()))
+
+        repo.write_file('README.md', 'x')
+        repo.commit('extra', datetime(2020, 3, 1, 12, 0))
+        self.assertEqual(repo.head_state(base)[0], 1)
+        with self.assertRaises(ValueError):
+            generator.resume_position(schedule)
+
+    def test_realistic_generator_accepts_backend_class(self):
+        """测试真实模式生成器可以直接使用内存后端"""
+        generator = RealisticContributionGenerator('test-user', 'test@example.com', seed=2,
+                                                   backend=MemoryRepository)
+        commits = generator.generate_realistic_pattern(60, directory='memory')
+        self.assertGreater(commits, 0)
+        self.assertEqual(len(generator.git_repo), commits)
+        self.assertIsNotNone(generator.git_repo.read_file('README.md'))
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+生成结果缓存测试模块
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+import cache
+import contribute
+
+
+class Now(datetime):
+    """固定当前时间的 datetime"""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2024, 3, 6, 9, 30, 42)
+
+
+def rev_parse(directory, revision='HEAD'):
+    """返回仓库中指定修订的对象 ID"""
+    return subprocess.check_output(['git', 'rev-parse', revision], cwd=directory).strip()
+
+
+class TestHistoryCache(unittest.TestCase):
+    """生成结果缓存测试类（使用真实 Git）"""
+
+    ARGS = ['--days_before=20', '--frequency=100', '--max_commits=3', '--seed=8',
+            '-un', 'test-user', '-ue', 'test@example.com']
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+        self.cache_dir = os.path.join(self.temp_dir, 'cache')
+
+    def tearDown(self):
+        """测试后的清理工作"""
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir)
+
+    def _run(self, directory, args):
+        """在固定时间下生成仓库到指定目录"""
+        with patch('contribute.datetime', Now):
+            contribute.main(['--repository', f'git@example.com:user/{directory}.git',
+                             '--cache', self.cache_dir] + self.ARGS + args)
+
+    def _entries(self):
+        """缓存中的条目"""
+        return sorted(name for name in os.listdir(self.cache_dir) if not name.startswith('tmp-'))
+
+    def test_repeated_run_restores_from_cache(self):
+        """测试相同配置再次生成时从缓存恢复相同的历史"""
+        with patch('contribute.GitRepository.push_changes'), \
+                patch('contribute.GitRepository.add_remote'):
+            self._run('first', ['--backend=git', '--no_maintenance'])
+            self.assertEqual(len(self._entries()), 1)
+
+            with patch('contribute.generate_history', side_effect=AssertionError("未命中缓存")):
+                self._run('second', ['--backend=git'])
+                self._run('third', ['--backend=pack', '--bare'])
+
+        self.assertEqual(rev_parse('second'), rev_parse('first'))
+        self.assertEqual(rev_parse('third'), rev_parse('first'))
+        self.assertEqual(subprocess.check_output(['git', 'status', '--porcelain'], cwd='second'), b'')
+        with open(os.path.join('second', 'README.md'), encoding='utf-8') as f:
+            self.assertEqual(f.read(), subprocess.check_output(
+                ['git', 'show', 'HEAD:README.md'], cwd='first').decode('utf-8'))
+        fsck = subprocess.run(['git', 'fsck', '--strict'], cwd='third', capture_output=True)
+        self.assertEqual(fsck.returncode, 0, fsck.stderr)
+        # 恢复的仓库可以继续追加
+        journal = contribute.Journal.load('second')
+        self.assertEqual(journal.completed, int(subprocess.check_output(
+            ['git', 'rev-list', '--count', 'HEAD'], cwd='second')))
+
+    def test_key_depends_on_history_settings_only(self):
+        """测试缓存键只与影响历史的配置相关"""
+        args = contribute.parse_arguments(self.ARGS)
+        settings = contribute.build_settings(args, datetime(2024, 1, 1, 20, 0), 10)
+        key = cache.cache_key(settings, 'test-user', 'test@example.com')
+        self.assertEqual(cache.cache_key(dict(settings, repository='x', bare=True, base='y'),
+                                         'test-user', 'test@example.com'), key)
+        self.assertNotEqual(cache.cache_key(dict(settings, seed=9),
+                                            'test-user', 'test@example.com'), key)
+        self.assertEqual(cache.cache_key(dict(settings, backend='pack'),
+                                         'test-user', 'test@example.com'), key)
+        self.assertNotEqual(cache.cache_key(settings, 'other', 'test@example.com'), key)
+
+    def test_unseeded_run_is_not_cached(self):
+        """测试未指定种子时不使用缓存"""
+        args = [arg for arg in self.ARGS if not arg.startswith('--seed')]
+        with patch('contribute.datetime', Now):
+            contribute.main(['--cache', self.cache_dir, '--backend=pack'] + args)
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        """测试超出大小上限时淘汰最久未使用的条目"""
+        history = cache.HistoryCache(self.cache_dir)
+        for name, seed in (('a', 1), ('b', 2), ('c', 3)):
+            repo = contribute.PackRepository(name, 'test-user', 'test@example.com')
+            repo.init_repository()
+            generator = contribute.ContributionGenerator(repo, frequency=100, seed=seed)
+            generator.generate_contributions(datetime(2024, 1, 1, 20, 0), 5, 0)
+            repo.finalize()
+            history.store(name * 64, name, generator.commit_count)
+        for age, name in enumerate('abc'):
+            os.utime(os.path.join(self.cache_dir, name * 64, cache.META_FILE), (age, age))
+
+        # 命中的条目变为最近使用
+        self.assertIsNotNone(history.restore('a' * 64, 'restored'))
+        history.max_bytes = sum(
+            os.path.getsize(os.path.join(self.cache_dir, key, name))
+            for key in ('a' * 64, 'c' * 64) for name in os.listdir(os.path.join(self.cache_dir, key))
+        )
+        history.evict()
+        self.assertEqual(self._entries(), ['a' * 64, 'c' * 64])
+        self.assertIsNone(history.restore('b' * 64, 'missing'))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
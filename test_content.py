@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+提交内容模型测试模块
+"""
+
+import unittest
+
+import content
+import contribute
+
+
+class TestContentModels(unittest.TestCase):
+    """内容模型测试类"""
+
+    def test_append_keeps_all_entries(self):
+        """测试 append 模式保留全部记录"""
+        model = content.AppendContent()
+        for i in range(5):
+            text = model.append('README.md', f'{i}\n')
+        self.assertEqual(text, '0\n1\n2\n3\n4\n')
+
+    def test_ring_size_is_bounded(self):
+        """测试 ring 模式的文件大小保持不变"""
+        model = content.RingContent(3)
+        sizes = [len(model.append('README.md', f'{i % 10}\n')) for i in range(50)]
+        self.assertEqual(max(sizes), 6)
+        self.assertEqual(model.append('README.md', 'x\n'), '8\n9\nx\n')
+        self.assertEqual(model.append('docs/README.md', 'y\n'), 'y\n')
+
+    def test_make_content_model(self):
+        """测试按名称创建内容模型"""
+        self.assertIsInstance(content.make_content_model('append'), content.AppendContent)
+        ring = content.make_content_model('ring', 7)
+        self.assertEqual(ring.size, 7)
+        with self.assertRaises(ValueError):
+            content.make_content_model('unknown')
+        with self.assertRaises(ValueError):
+            content.RingContent(0)
+
+    def test_content_arguments(self):
+        """测试内容模式命令行参数"""
+        args = contribute.parse_arguments(['--content=ring', '--ring_size=20'])
+        self.assertEqual((args.content, args.ring_size), ('ring', 20))
+        with self.assertRaises(ValueError):
+            contribute.validate_arguments(contribute.parse_arguments(['--ring_size=0']))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -5,14 +5,21 @@ GitHub 贡献图生成器测试模块
 测试贡献生成器的各项功能
 """
 
+import io
 import unittest
 import tempfile
 import os
 import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stderr
 from unittest.mock import patch, MagicMock
 from datetime import datetime, timedelta
 
 import contribute
+from content import make_content_model
+from generate_realistic_contributions import RealisticContributionGenerator
+from journal import Journal
 
 
 class TestContribute(unittest.TestCase):
@@ -95,24 +102,20 @@ class TestContribute(unittest.TestCase):
         """测试贡献生成器"""
         repo = contribute.GitRepository('test-repo')
         generator = contribute.ContributionGenerator(
-            repo, max_commits=5, frequency=100, no_weekends=False
+            repo, max_commits=5, frequency=100, no_weekends=False, seed=3
         )
         
-        # 测试提交次数计算
-        commits = generator._get_commits_for_day()
-        self.assertTrue(1 <= commits <= 5)
-        
-        # 测试日期判断 - 使用正确的日期创建方法
-        from datetime import datetime, timedelta
-        today = datetime.now()
-        weekday = today - timedelta(days=today.weekday())  # 本周一
-        weekend = today + timedelta(days=(5 - today.weekday()))  # 本周六
-        
-        self.assertTrue(generator._should_commit_on_day(weekday))
+        # 测试每天的提交次数（由提交计划决定）
+        start = datetime(2024, 1, 1, 20, 0)  # 周一
+        counts = list(generator.plan(start, 28).day_counts)
+        self.assertTrue(all(0 <= count <= 5 for count in counts))
+        self.assertTrue(any(counts[5::7]) or any(counts[6::7]))
         
         # 测试周末跳过
         generator.no_weekends = True
-        self.assertFalse(generator._should_commit_on_day(weekend))
+        counts = list(generator.plan(start, 28).day_counts)
+        self.assertFalse(any(counts[5::7]) or any(counts[6::7]))
+        self.assertTrue(any(counts))
 
     def test_commit_message_generation(self):
         """测试提交消息生成"""
@@ -208,6 +211,555 @@ class TestGitRepository(unittest.TestCase):
             repo._run_command(['git', 'invalid-command'])
 
 
+class TestRepositoryBackends(unittest.TestCase):
+    """仓库后端测试类（使用真实 Git）"""
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+
+    def tearDown(self):
+        """测试后的清理工作"""
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir)
+
+    def _generate(self, backend, directory):
+        """使用指定后端生成固定随机序列的历史"""
+        os.chdir(self.temp_dir)
+        repo = backend(directory, 'test-user', 'test@example.com')
+        repo.init_repository()
+        generator = contribute.ContributionGenerator(
+            repo, max_commits=3, frequency=100, seed=2024
+        )
+        generator.generate_contributions(datetime(2023, 12, 1, 20, 0), 3, 0)
+        repo.finalize()
+        log = subprocess.check_output(
+            ['git', 'log', '--format=%an|%ae|%ad|%cd|%s', '--date=iso'],
+            cwd=os.path.join(self.temp_dir, directory)
+        )
+        with open(os.path.join(self.temp_dir, directory, 'README.md'), encoding='utf-8') as f:
+            readme = f.read()
+        return generator.commit_count, log, readme
+
+    def test_same_history_shape_as_git_backend(self):
+        """测试 fast-import 与逐条提交生成相同形态的历史"""
+        git_result = self._generate(contribute.GitRepository, 'git-repo')
+        fast_result = self._generate(contribute.FastImportRepository, 'fast-repo')
+
+        self.assertGreater(fast_result[0], 0)
+        self.assertEqual(git_result, fast_result)
+
+        status = subprocess.check_output(
+            ['git', 'status', '--porcelain'], cwd=os.path.join(self.temp_dir, 'fast-repo')
+        )
+        self.assertEqual(status, b'')
+
+    def test_pack_backend_passes_fsck(self):
+        """测试纯 Python pack 后端生成的仓库通过 git fsck"""
+        git_result = self._generate(contribute.GitRepository, 'git-repo')
+        pack_result = self._generate(contribute.PackRepository, 'pack-repo')
+        self.assertEqual(git_result, pack_result)
+
+        repo_dir = os.path.join(self.temp_dir, 'pack-repo')
+        fsck = subprocess.run(
+            ['git', 'fsck', '--strict', '--full'], cwd=repo_dir, capture_output=True
+        )
+        self.assertEqual(fsck.returncode, 0, fsck.stderr)
+        status = subprocess.check_output(['git', 'status', '--porcelain'], cwd=repo_dir)
+        self.assertEqual(status, b'')
+
+    def test_bare_repository_matches_worktree_history(self):
+        """测试 bare 模式生成与普通仓库相同的历史，且不写出工作区和暂存区"""
+        for backend in (contribute.FastImportRepository, contribute.PackRepository):
+            expected = self._generate(backend, 'worktree-repo')
+            repo_dir = os.path.join(self.temp_dir, 'bare-repo')
+            repo = backend(repo_dir, 'test-user', 'test@example.com', bare=True)
+            repo.init_repository()
+            generator = contribute.ContributionGenerator(
+                repo, max_commits=3, frequency=100, seed=2024
+            )
+            generator.generate_contributions(datetime(2023, 12, 1, 20, 0), 3, 0)
+            repo.finalize()
+
+            log = subprocess.check_output(
+                ['git', 'log', '--format=%an|%ae|%ad|%cd|%s', '--date=iso'], cwd=repo_dir
+            )
+            self.assertEqual((generator.commit_count, log, repo.read_file('README.md')), expected)
+            self.assertEqual(subprocess.check_output(
+                ['git', 'rev-parse', '--is-bare-repository'], cwd=repo_dir
+            ), b'true\n')
+            self.assertFalse(os.path.exists(os.path.join(repo_dir, 'README.md')))
+            self.assertFalse(os.path.exists(os.path.join(repo_dir, 'index')))
+            fsck = subprocess.run(['git', 'fsck', '--strict'], cwd=repo_dir, capture_output=True)
+            self.assertEqual(fsck.returncode, 0, fsck.stderr)
+            shutil.rmtree(repo_dir)
+            shutil.rmtree(os.path.join(self.temp_dir, 'worktree-repo'))
+
+        with self.assertRaises(ValueError):
+            contribute.GitRepository('bare-git', bare=True)
+
+    def test_bulk_ingest_profile_overrides_repository_config(self):
+        """测试批量写入配置绕过钩子、签名和自动 gc，并在结束时执行一次维护"""
+        repo = contribute.GitRepository('hooked-repo', 'test-user', 'test@example.com')
+        repo.init_repository()
+        repo_dir = repo.path
+        for key, value in (('commit.gpgSign', 'true'), ('gc.auto', '1'),
+                           ('user.signingKey', 'missing-key')):
+            subprocess.check_call(['git', 'config', key, value], cwd=repo_dir)
+        hook = os.path.join(repo_dir, '.git', 'hooks', 'pre-commit')
+        with open(hook, 'w') as f:
+            f.write('#!/bin/sh\nexit 1\n')
+        os.chmod(hook, 0o755)
+
+        generator = contribute.ContributionGenerator(repo, max_commits=3, frequency=100, seed=1)
+        generator.generate_contributions(datetime(2023, 12, 1, 20, 0), 3, 0)
+        timings = repo.maintain()
+
+        count = subprocess.check_output(['git', 'rev-list', '--count', 'HEAD'], cwd=repo_dir)
+        self.assertEqual(int(count), generator.commit_count)
+        self.assertEqual(sorted(timings), ['commit-graph', 'repack'])
+        self.assertEqual(repo.metrics.histograms['git_repack'].count, 1)
+        self.assertTrue(os.path.exists(
+            os.path.join(repo_dir, '.git', 'objects', 'info', 'commit-graph')))
+        loose = subprocess.check_output(['git', 'count-objects', '-v'], cwd=repo_dir)
+        self.assertIn(b'count: 0\n', loose)
+        # 配置只作用于子进程，不写入仓库配置
+        self.assertNotIn(b'hookspath', subprocess.check_output(['git', 'config', '--list'],
+                                                               cwd=repo_dir).lower())
+
+    def test_bulk_ingest_env_keeps_existing_config(self):
+        """测试批量写入配置追加在环境中已有的 GIT_CONFIG_* 之后"""
+        with patch.dict(os.environ, {'GIT_CONFIG_COUNT': '1', 'GIT_CONFIG_KEY_0': 'a.b',
+                                     'GIT_CONFIG_VALUE_0': 'c'}):
+            env = contribute.bulk_ingest_env(GIT_COMMITTER_DATE='2024-01-01 00:00:00')
+        self.assertEqual(env['GIT_CONFIG_KEY_0'], 'a.b')
+        self.assertEqual(env['GIT_CONFIG_KEY_1'], 'gc.auto')
+        self.assertEqual(int(env['GIT_CONFIG_COUNT']), len(contribute.BULK_INGEST_CONFIG) + 1)
+        self.assertEqual(env['GIT_COMMITTER_DATE'], '2024-01-01 00:00:00')
+
+    def test_bundle_round_trip(self):
+        """测试生成结果写入 bundle 后可在本地导入为相同的仓库"""
+        bundle = os.path.join(self.temp_dir, 'history.bundle')
+        contribute.main(['--days_before=15', '--frequency=100', '--max_commits=3', '--seed=4',
+                         '--backend=pack', '--bare', '--output_bundle', bundle,
+                         '-un', 'test-user', '-ue', 'test@example.com'])
+        [source] = [name for name in os.listdir(self.temp_dir) if name.startswith('repository-')]
+        head = subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=source)
+        subprocess.check_call(['git', 'bundle', 'verify', '-q', bundle], cwd=source)
+
+        # 未指定仓库时使用 bundle 文件名作为目录
+        contribute.main(['--from_bundle', bundle, '-un', 'test-user', '-ue', 'test@example.com'])
+        self.assertEqual(subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd='history'), head)
+        self.assertEqual(subprocess.check_output(['git', 'status', '--porcelain'], cwd='history'), b'')
+        self.assertTrue(os.path.exists(os.path.join('history', 'README.md')))
+
+        repo = contribute.PackRepository('imported', bare=True)
+        self.assertGreater(repo.import_bundle(bundle), 0)
+        self.assertEqual(subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd='imported'), head)
+        self.assertFalse(os.path.exists(os.path.join('imported', 'README.md')))
+
+        # git 后端需要工作区，--bare 导入在参数解析时被拒绝
+        bare_bundle = shutil.copy(bundle, os.path.join(self.temp_dir, 'bare-history.bundle'))
+        with redirect_stderr(io.StringIO()) as stderr:
+            with self.assertRaises(SystemExit):
+                contribute.main(['--from_bundle', bare_bundle, '--bare'])
+        self.assertIn('--backend=fast-import 或 pack', stderr.getvalue())
+        self.assertFalse(os.path.exists('bare-history'))
+        contribute.main(['--from_bundle', bare_bundle, '--bare', '--backend=pack',
+                         '-un', 'test-user', '-ue', 'test@example.com'])
+        self.assertEqual(subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd='bare-history'), head)
+        self.assertFalse(os.path.exists(os.path.join('bare-history', 'README.md')))
+
+        empty = contribute.GitRepository('empty')
+        empty.init_repository()
+        with self.assertRaises(ValueError):
+            empty.create_bundle('empty.bundle')
+
+    def test_commit_stages_only_written_paths(self):
+        """测试逐条提交后端只暂存写入过的文件"""
+        repo = contribute.GitRepository('git-repo', 'test-user', 'test@example.com')
+        repo.init_repository()
+        with open(os.path.join(repo.path, 'untracked.txt'), 'w', encoding='utf-8') as file:
+            file.write('不应被提交\n')
+
+        repo.write_file('README.md', 'a\n')
+        repo.write_file('src/main.py', 'b\n')
+        repo.commit('first', datetime(2023, 12, 1, 20, 0))
+        repo.write_file('src/main.py', 'c\n')
+        repo.commit('second', datetime(2023, 12, 1, 20, 1))
+
+        files = subprocess.check_output(
+            ['git', 'ls-tree', '-r', '--name-only', 'HEAD'], cwd=repo.path, text=True
+        ).split()
+        self.assertEqual(files, ['README.md', 'src/main.py'])
+        changed = subprocess.check_output(
+            ['git', 'show', '--name-only', '--format=', 'HEAD'], cwd=repo.path, text=True
+        ).split()
+        self.assertEqual(changed, ['src/main.py'])
+        self.assertEqual(repo.metrics.histograms['git_update_index'].count, 2)
+
+    def test_concurrent_generators_do_not_interfere(self):
+        """测试多个线程同时向不同目录生成仓库时互不干扰"""
+        def generate(backend, name):
+            directory = os.path.join(self.temp_dir, name)
+            repo = contribute.BACKENDS[backend](directory, name, f'{name}@example.com')
+            repo.init_repository()
+            generator = contribute.ContributionGenerator(
+                repo, max_commits=3, frequency=100, seed=7
+            )
+            generator.generate_contributions(datetime(2023, 12, 1, 20, 0), 10, 0)
+            repo.finalize()
+            return directory, generator.commit_count
+
+        jobs = [(backend, f'{backend}-{index}') for backend in contribute.BACKENDS
+                for index in range(2)]
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            results = list(executor.map(lambda job: generate(*job), jobs))
+
+        self.assertEqual(os.getcwd(), os.path.realpath(self.temp_dir))
+        for (_, name), (directory, commit_count) in zip(jobs, results):
+            authors = subprocess.check_output(
+                ['git', 'log', '--format=%an|%ae'], cwd=directory, text=True
+            ).split()
+            self.assertEqual(len(authors), commit_count)
+            self.assertEqual(set(authors), {f'{name}|{name}@example.com'})
+
+    def test_realistic_generator_uses_backend(self):
+        """测试真实模式生成器通过仓库后端提交且不切换工作目录"""
+        generator = RealisticContributionGenerator(
+            'test-user', 'test@example.com', seed=2024, backend='fast-import'
+        )
+        commits = generator.generate_realistic_pattern(20, directory='realistic-repo')
+
+        self.assertEqual(os.getcwd(), os.path.realpath(self.temp_dir))
+        self.assertGreater(commits, 0)
+        count = subprocess.check_output(
+            ['git', 'rev-list', '--count', 'HEAD'], cwd=generator.git_repo.path
+        )
+        self.assertEqual(int(count), commits)
+
+    def test_realistic_generator_is_deterministic(self):
+        """测试真实模式生成器的全部随机选择由种子决定"""
+        heads = []
+        for directory in ('realistic-a', 'realistic-b'):
+            generator = RealisticContributionGenerator(
+                'test-user', 'test@example.com', seed=7, backend='pack'
+            )
+            with patch('generate_realistic_contributions.datetime') as mock_datetime:
+                mock_datetime.now.return_value = datetime(2024, 3, 6, 9, 30)
+                generator.generate_realistic_pattern(60, directory=directory)
+            heads.append(subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=directory))
+        self.assertEqual(heads[0], heads[1])
+
+    def test_realistic_generator_pack_matches_fast_import(self):
+        """测试 pack 后端按目录缓存 tree 后，多文件历史与 fast-import 完全一致"""
+        heads = []
+        for backend in ('pack', 'fast-import'):
+            generator = RealisticContributionGenerator(
+                'test-user', 'test@example.com', seed=3, backend=backend
+            )
+            with patch('generate_realistic_contributions.datetime') as mock_datetime:
+                mock_datetime.now.return_value = datetime(2024, 3, 6, 9, 30)
+                generator.generate_realistic_pattern(90, directory=backend)
+            heads.append(subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=backend))
+        self.assertEqual(heads[0], heads[1])
+        files = subprocess.check_output(['git', 'ls-tree', '-r', '--name-only', 'HEAD'], cwd='pack')
+        self.assertIn(b'src/main.py', files.split())
+
+    def _generate_pack(self, directory, content, workers, stop=None):
+        """使用 pack 后端生成历史，stop 不为空时先生成前 stop 次提交再续写剩余部分"""
+        repo = contribute.PackRepository(directory, 'test-user', 'test@example.com')
+        repo.init_repository()
+        generator = contribute.ContributionGenerator(
+            repo, max_commits=5, frequency=90, content_model=make_content_model(content, 7),
+            seed=11
+        )
+        schedule = generator.plan(datetime(2023, 1, 1, 20, 0), 120)
+        if stop is not None:
+            for commit_time, message_index in schedule.commits(0, stop):
+                generator._make_contribution(commit_time, message_index)
+            repo.finalize()
+            repo = contribute.PackRepository(directory, 'test-user', 'test@example.com')
+            repo.open_repository()
+            generator.git_repo = repo
+            generator.content_model = make_content_model(content, 7)
+            generator.restore_content(repo.read_file('README.md'))
+        generator.run(schedule, stop or 0, workers=workers)
+        repo.finalize()
+        return subprocess.check_output(['git', 'log', '--format=%H'], cwd=repo.path)
+
+    @patch('contribute.MIN_SHARD_COMMITS', 10)
+    def test_sharded_pack_matches_sequential(self):
+        """测试分片并行计算对象生成与逐条计算完全相同的提交"""
+        for content in ('append', 'ring'):
+            sequential = self._generate_pack(f'seq-{content}', content, 1)
+            sharded = self._generate_pack(f'shard-{content}', content, 3)
+            resumed = self._generate_pack(f'resume-{content}', content, 2, stop=37)
+            self.assertGreater(len(sequential.split()), 100)
+            self.assertEqual(sharded, sequential)
+            self.assertEqual(resumed, sequential)
+
+            repo_dir = os.path.join(self.temp_dir, f'shard-{content}')
+            fsck = subprocess.run(['git', 'fsck', '--strict', '--full'], cwd=repo_dir,
+                                  capture_output=True)
+            self.assertEqual(fsck.returncode, 0, fsck.stderr)
+            status = subprocess.check_output(['git', 'status', '--porcelain'], cwd=repo_dir)
+            self.assertEqual(status, b'')
+
+    @unittest.skipUnless(os.path.exists('/proc/self/statm'), "需要 /proc 读取常驻内存")
+    def test_pack_memory_stays_flat(self):
+        """测试长时间范围生成时常驻内存不随提交数增长"""
+        page_size = os.sysconf('SC_PAGE_SIZE')
+        samples = []
+
+        def rss():
+            with open('/proc/self/statm') as file:
+                return int(file.read().split()[1]) * page_size
+
+        class SampledRepository(contribute.PackRepository):
+            def commit_tree(self, tree, message, commit_time):
+                super().commit_tree(tree, message, commit_time)
+                if self._commit_total % 500 == 0:
+                    samples.append(rss())
+
+        repo = SampledRepository('long-repo', 'test-user', 'test@example.com')
+        repo.init_repository()
+        generator = contribute.ContributionGenerator(
+            repo, max_commits=20, frequency=100, content_model=make_content_model('ring', 20),
+            seed=3
+        )
+        generator.generate_contributions(datetime(1990, 1, 1, 20, 0), 1500, 0)
+        repo.finalize()
+
+        self.assertGreaterEqual(len(samples), 20)
+        # 跳过前 1/4 的预热阶段，之后的常驻内存增长应远小于每个对象一条内存记录的开销
+        warm = samples[len(samples) // 4:]
+        self.assertLess(max(warm) - warm[0], 2 << 20, samples)
+
+    def test_start_date_before_1970_is_rejected(self):
+        """测试超出 Git 时间表示范围的起始日期被拒绝"""
+        with self.assertRaises(SystemExit):
+            contribute.main(['--days_before=36500', '--backend=pack'])
+        self.assertFalse(any(name.startswith('repository-') for name in os.listdir(self.temp_dir)))
+
+    def test_shard_bounds(self):
+        """测试分片划分覆盖全部提交且不重叠"""
+        self.assertEqual(contribute.shard_bounds(5, 2505, 1), [(5, 1005), (1005, 2005), (2005, 2505)])
+        self.assertEqual(contribute.shard_bounds(0, 0, 4), [])
+
+    def test_workers_require_pack_backend(self):
+        """测试 --workers 只能与 pack 后端一起使用"""
+        with self.assertRaises(SystemExit):
+            contribute.main(['--workers=2', '--backend=git', '--days_before=1'])
+        with self.assertRaises(ValueError):
+            contribute.validate_arguments(contribute.parse_arguments(['--workers=0']))
+
+    def test_backend_argument(self):
+        """测试后端参数解析"""
+        args = contribute.parse_arguments(['--backend=fast-import'])
+        self.assertIs(contribute.BACKENDS[args.backend], contribute.FastImportRepository)
+        self.assertEqual(contribute.parse_arguments([]).backend, 'git')
+
+
+class FixedDatetime(datetime):
+    """固定当前时间的 datetime"""
+
+    NOW = (2024, 3, 1, 9, 30, 15)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(*cls.NOW)
+
+
+class TestResume(unittest.TestCase):
+    """中断续跑测试类（使用真实 Git）"""
+
+    ARGS = ['--days_before=12', '--frequency=100', '--max_commits=3', '--seed=5',
+            '--content=ring', '--ring_size=4', '-un', 'test-user', '-ue', 'test@example.com']
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+
+    def tearDown(self):
+        """测试后的清理工作"""
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir)
+
+    def _run(self, args):
+        """在固定时间下执行主函数"""
+        os.chdir(self.temp_dir)
+        with patch('contribute.datetime', FixedDatetime):
+            contribute.main(args)
+        os.chdir(self.temp_dir)
+
+    def _directories(self):
+        """临时目录中生成的仓库目录（不含命令行写出的日志文件）"""
+        return [name for name in os.listdir(self.temp_dir) if name != contribute.LOG_FILE]
+
+    def _history(self, directory):
+        """读取仓库的提交历史与 HEAD 中的 README 内容"""
+        path = os.path.join(self.temp_dir, directory)
+        log = subprocess.check_output(['git', 'log', '--format=%ad|%cd|%s', '--date=iso'], cwd=path)
+        readme = subprocess.check_output(['git', 'show', 'HEAD:README.md'], cwd=path)
+        return log, readme.decode('utf-8')
+
+    def _check_resume(self, backend, extra=()):
+        """中断后续跑，结果应与一次性生成完全一致"""
+        original = contribute.ContributionGenerator._make_contribution
+        calls = []
+
+        def flaky(generator, *args):
+            calls.append(args)
+            if len(calls) == 7:
+                raise OSError("模拟中断")
+            return original(generator, *args)
+
+        with patch.object(contribute.ContributionGenerator, '_make_contribution', flaky):
+            with self.assertRaises(SystemExit):
+                self._run(self.ARGS + ['--backend=' + backend, *extra])
+        directory = self._directories()[0]
+        # 续跑直接映射日志中保存的提交计划，不再重新计算
+        with patch('contribute.plan_schedule', side_effect=AssertionError("重新计算了提交计划")):
+            self._run(['--resume', directory])
+
+        os.rename(directory, 'resumed')
+        self._run(self.ARGS + ['--backend=' + backend, *extra])
+        fresh = [name for name in self._directories() if name != 'resumed'][0]
+
+        self.assertEqual(self._history('resumed'), self._history(fresh))
+        # 日志只在运行结束时记录提交数，与仓库 HEAD 一致
+        self.assertEqual(Journal.load('resumed').completed, len(self._history('resumed')[0].splitlines()))
+        fsck = subprocess.run(['git', 'fsck'], cwd='resumed', capture_output=True)
+        self.assertEqual(fsck.returncode, 0, fsck.stderr)
+
+    def test_resume_git_backend(self):
+        """测试逐条提交后端的续跑"""
+        self._check_resume('git')
+
+    def test_resume_pack_backend(self):
+        """测试 pack 后端的续跑"""
+        self._check_resume('pack')
+
+    def test_resume_bare_pack_backend(self):
+        """测试 bare 模式 pack 后端的续跑"""
+        self._check_resume('pack', ['--bare'])
+        self.assertTrue(os.path.exists(os.path.join('resumed', 'contribute', 'journal.json')))
+        self.assertFalse(os.path.exists(os.path.join('resumed', 'README.md')))
+
+    def test_append_only_adds_missing_days(self):
+        """测试追加模式只补充最新提交之后的日期"""
+        self._run(self.ARGS + ['--backend=fast-import'])
+        directory = self._directories()[0]
+        before, readme_before = self._history(directory)
+
+        with patch.object(FixedDatetime, 'NOW', (2024, 3, 11, 8, 0, 0)):
+            self._run(['--append', directory, '--frequency=100', '--seed=9',
+                       '--content=ring', '--ring_size=4', '--backend=fast-import'])
+        after, readme_after = self._history(directory)
+
+        self.assertTrue(after.endswith(before))
+        new_dates = {line.split(' ')[0] for line in after[:-len(before)].decode().splitlines()}
+        self.assertEqual(new_dates, {f'2024-03-{day:02d}' for day in range(1, 11)})
+        self.assertEqual(readme_after.count('\n\n'), 4)
+        self.assertNotEqual(readme_after, readme_before)
+
+        # 当天再次执行不会产生新提交
+        with patch.object(FixedDatetime, 'NOW', (2024, 3, 11, 22, 0, 0)):
+            self._run(['--append', directory, '--backend=fast-import'])
+        self.assertEqual(self._history(directory)[0], after)
+
+    def test_append_inherits_journal_settings(self):
+        """测试追加模式沿用续跑日志中的生成参数，命令行显式指定的参数优先"""
+        self._run(self.ARGS + ['--backend=fast-import'])
+        directory = self._directories()[0]
+
+        with patch.object(FixedDatetime, 'NOW', (2024, 3, 6, 8, 0, 0)):
+            self._run(['--append', directory, '--seed=9'])
+        _, readme = self._history(directory)
+        self.assertEqual(readme.count('\n\n'), 4)
+        settings = Journal.load(directory).settings
+        self.assertEqual((settings['backend'], settings['content'], settings['ring_size'],
+                          settings['frequency'], settings['max_commits']),
+                         ('fast-import', 'ring', 4, 100, 3))
+        dates = subprocess.check_output(['git', 'log', '--format=%ad', '--date=short'],
+                                        cwd=directory).decode().split()
+        self.assertTrue({f'2024-03-{day:02d}' for day in range(1, 6)} <= set(dates))
+
+        with patch.object(FixedDatetime, 'NOW', (2024, 3, 9, 8, 0, 0)):
+            self._run(['--append', directory, '--frequency=0'])
+        self.assertEqual(Journal.load(directory).settings['frequency'], 0)
+        self.assertEqual(Journal.load(directory).settings['content'], 'ring')
+
+    def test_append_maintenance_is_incremental(self):
+        """测试追加模式只增量维护新增的对象，没有新提交时跳过维护"""
+        self._run(self.ARGS + ['--backend=pack'])
+        directory = self._directories()[0]
+        git_dir = os.path.join(self.temp_dir, directory, '.git')
+        pack_dir = os.path.join(git_dir, 'objects', 'pack')
+
+        def packs():
+            return {name for name in os.listdir(pack_dir) if name.endswith('.pack')}
+
+        before = packs()
+        self.assertEqual(len(before), 1)
+        with patch.object(FixedDatetime, 'NOW', (2024, 3, 11, 8, 0, 0)):
+            self._run(['--append', directory, '--backend=pack'])
+        # 已有的 pack 保持不变（没有重新打包整个历史），commit-graph 只追加一层
+        after = packs()
+        self.assertEqual(len(after), 2)
+        self.assertLess(before, after)
+        self.assertTrue(os.path.exists(
+            os.path.join(git_dir, 'objects', 'info', 'commit-graphs', 'commit-graph-chain')
+        ))
+
+        # 同一天再次追加没有新提交
+        with patch.object(contribute.PackRepository, 'maintain') as maintain:
+            with patch.object(FixedDatetime, 'NOW', (2024, 3, 11, 9, 0, 0)):
+                self._run(['--append', directory, '--backend=pack'])
+        maintain.assert_not_called()
+
+    def test_append_refuses_dirty_worktree(self):
+        """测试追加模式不丢弃已有仓库中未提交的更改"""
+        for backend in ('git', 'pack'):
+            self._run(self.ARGS + ['--backend=' + backend])
+            directory = self._directories()[0]
+            before = self._history(directory)[0]
+            readme = os.path.join(directory, 'README.md')
+            with open(readme, 'a', encoding='utf-8') as file:
+                file.write('未提交的修改\n')
+
+            with patch.object(FixedDatetime, 'NOW', (2024, 3, 11, 8, 0, 0)):
+                with self.assertRaises(SystemExit):
+                    self._run(['--append', directory, '--backend=' + backend])
+            with open(readme, encoding='utf-8') as file:
+                self.assertTrue(file.read().endswith('未提交的修改\n'))
+            self.assertEqual(self._history(directory)[0], before)
+            shutil.rmtree(directory)
+
+    def test_append_range(self):
+        """测试追加模式的时间范围计算"""
+        now = datetime(2024, 3, 11, 8, 0)
+        start, days = contribute.append_range(datetime(2024, 3, 8, 20, 5), now)
+        self.assertEqual((start, days), (datetime(2024, 3, 9, 20, 0), 2))
+        self.assertEqual(contribute.append_range(datetime(2024, 3, 10, 20, 0), now)[1], 0)
+        self.assertEqual(contribute.append_range(None, now)[1], contribute.DEFAULT_APPEND_DAYS)
+
+    def test_resume_rejects_mismatched_head(self):
+        """测试 HEAD 与日志不一致时拒绝续跑"""
+        self._run(self.ARGS)
+        directory = self._directories()[0]
+        subprocess.check_call(
+            ['git', 'commit', '-q', '--allow-empty', '-m', 'manual'], cwd=directory
+        )
+        with self.assertRaises(SystemExit):
+            self._run(['--resume', directory])
+
+
 if __name__ == '__main__':
     # 运行测试
     unittest.main(verbosity=2)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+批量仓库生成测试模块
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import fleet
+
+
+class TestManifest(unittest.TestCase):
+    """清单读取测试类"""
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """测试后的清理工作"""
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, name, content):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            file.write(content)
+        return path
+
+    def test_json_manifest(self):
+        """测试 JSON 清单补全默认值"""
+        path = self._write('fleet.json', json.dumps({'repositories': [
+            {'directory': 'a', 'days': 30},
+            {'directory': 'b', 'pattern': 'realistic', 'backend': 'pack'},
+        ]}))
+        entries = fleet.load_manifest(path)
+        self.assertEqual(entries[0]['days'], 30)
+        self.assertEqual(entries[0]['frequency'], 80)
+        self.assertTrue(os.path.isabs(entries[0]['directory']))
+        self.assertEqual(entries[1]['pattern'], 'realistic')
+        self.assertEqual(entries[1]['backend'], 'pack')
+
+    def test_csv_manifest(self):
+        """测试 CSV 清单的类型转换与空单元格"""
+        path = self._write('fleet.csv', (
+            'directory,user_name,days,frequency,no_weekends,seed\n'
+            'a,alice,10,50,true,\n'
+            'b,,20,,no,7\n'
+        ))
+        entries = fleet.load_manifest(path)
+        self.assertEqual((entries[0]['days'], entries[0]['frequency']), (10, 50))
+        self.assertTrue(entries[0]['no_weekends'])
+        self.assertIsNone(entries[0]['seed'])
+        self.assertIsNone(entries[1]['user_name'])
+        self.assertEqual((entries[1]['frequency'], entries[1]['seed']), (80, 7))
+        self.assertFalse(entries[1]['no_weekends'])
+
+    def test_yaml_requires_pyyaml(self):
+        """测试未安装 PyYAML 时给出明确提示"""
+        path = self._write('fleet.yaml', '- directory: a\n')
+        with patch.dict('sys.modules', {'yaml': None}):
+            with self.assertRaisesRegex(ValueError, 'PyYAML'):
+                fleet.load_manifest(path)
+
+    def test_invalid_entries(self):
+        """测试无效记录与重复目录"""
+        for entries in ([{'days': 1}], [{'directory': 'a', 'backend': 'svn'}],
+                        [{'directory': 'a', 'colour': 'red'}],
+                        [{'directory': 'a', 'frequency': 150}],
+                        [{'directory': 'a', 'bare': True}],
+                        [{'directory': 'a'}, {'directory': 'a'}]):
+            path = self._write('fleet.json', json.dumps(entries))
+            with self.assertRaises(ValueError):
+                fleet.load_manifest(path)
+
+
+class TestFleet(unittest.TestCase):
+    """并发生成测试类（使用真实 Git）"""
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """测试后的清理工作"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_run_fleet_isolates_failures(self):
+        """测试进程池并发生成，单个仓库失败不影响其他仓库"""
+        blocker = os.path.join(self.temp_dir, 'blocker')
+        with open(blocker, 'w', encoding='utf-8') as file:
+            file.write('不是目录\n')
+
+        entries = [
+            fleet.normalize_entry({'directory': os.path.join(self.temp_dir, 'one'),
+                                   'user_name': 'one', 'user_email': 'one@example.com',
+                                   'days': 10, 'frequency': 100, 'max_commits': 2, 'seed': 1}),
+            fleet.normalize_entry({'directory': os.path.join(blocker, 'repo'),
+                                   'user_name': 'bad', 'user_email': 'bad@example.com',
+                                   'days': 10}),
+            fleet.normalize_entry({'directory': os.path.join(self.temp_dir, 'two'),
+                                   'user_name': 'two', 'user_email': 'two@example.com',
+                                   'days': 20, 'pattern': 'realistic',
+                                   'backend': 'fast-import', 'seed': 2}),
+        ]
+        report = fleet.run_fleet(entries, jobs=2)
+
+        self.assertEqual((report['repositories'], report['succeeded'], report['failed']),
+                         (3, 2, 1))
+        self.assertEqual([result['directory'] for result in report['results']],
+                         [entry['directory'] for entry in entries])
+        self.assertIsNotNone(report['results'][1]['error'])
+        for result in (report['results'][0], report['results'][2]):
+            self.assertIsNone(result['error'])
+            count = subprocess.check_output(
+                ['git', 'rev-list', '--count', 'HEAD'], cwd=result['directory']
+            )
+            self.assertEqual(int(count), result['commits'])
+        self.assertEqual(report['commits'],
+                         report['results'][0]['commits'] + report['results'][2]['commits'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Git 对象编码测试模块
+将进程内计算的对象与 git 的结果进行对比
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import gitobjects
+
+
+class TestGitObjects(unittest.TestCase):
+    """Git 对象编码测试类"""
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.temp_dir = tempfile.mkdtemp()
+        subprocess.check_call(['git', 'init', '-q', self.temp_dir])
+
+    def tearDown(self):
+        """测试后的清理工作"""
+        shutil.rmtree(self.temp_dir)
+
+    def _git(self, *args, data=None):
+        """在临时仓库中执行 git 命令"""
+        return subprocess.check_output(['git', *args], cwd=self.temp_dir, input=data)
+
+    def test_blob_id_matches_git(self):
+        """测试 blob 对象 ID 与 git hash-object 一致"""
+        data = '贡献记录: 2023-12-25 14:30\n\n'.encode('utf-8')
+        expected = self._git('hash-object', '--stdin', data=data).strip().decode()
+        self.assertEqual(gitobjects.object_id(gitobjects.OBJ_BLOB, data).hex(), expected)
+
+    def test_tree_sorting(self):
+        """测试 tree 条目按 Git 规则排序"""
+        sha = gitobjects.object_id(gitobjects.OBJ_BLOB, b'')
+        tree = gitobjects.encode_tree([
+            (gitobjects.MODE_FILE, b'a.b', sha),
+            (gitobjects.MODE_TREE, b'a', sha),
+            (gitobjects.MODE_FILE, b'a-c', sha),
+        ])
+        names = []
+        pos = 0
+        while pos < len(tree):
+            end = tree.index(b'\0', pos)
+            names.append(tree[pos:end].split(b' ', 1)[1])
+            pos = end + 21
+        self.assertEqual(names, [b'a-c', b'a.b', b'a'])
+
+    def test_tree_cache_rewrites_only_changed_directories(self):
+        """测试目录树缓存与完整重建结果一致，且只重新写入改动路径上的目录"""
+        def blob(text):
+            return gitobjects.object_id(gitobjects.OBJ_BLOB, text.encode('utf-8'))
+
+        files = {f'd{i % 4}/s{i % 3}/f{i}.txt': blob(str(i)) for i in range(40)}
+        files['README.md'] = blob('readme')
+        written = []
+
+        def add(obj_type, data):
+            written.append(data)
+            return gitobjects.object_id(obj_type, data)
+
+        cache = gitobjects.TreeCache(files)
+        self.assertEqual(cache.write(add), gitobjects.write_tree(add, files))
+        for number, path in enumerate(['d1/s2/f5.txt', 'README.md', 'd3/new/g.txt', 'd0/s0/f0.txt']):
+            files[path] = blob(f'change {number}')
+            cache.set(path, files[path])
+            del written[:]
+            self.assertEqual(cache.write(add), gitobjects.write_tree(gitobjects.object_id, files))
+            # 根目录加上改动文件所在的每一级目录
+            self.assertEqual(len(written), path.count('/') + 1)
+
+        # 内容未变化时不使缓存失效
+        cache.set('README.md', files['README.md'])
+        del written[:]
+        cache.write(add)
+        self.assertEqual(written, [])
+
+    def test_pack_is_readable_by_git(self):
+        """测试写出的 pack 与索引可被 git 校验"""
+        pack_dir = os.path.join(self.temp_dir, '.git', 'objects', 'pack')
+        writer = gitobjects.PackWriter(pack_dir)
+        blob = writer.add(gitobjects.OBJ_BLOB, b'hello\n' * 100)
+        self.assertEqual(writer.add(gitobjects.OBJ_BLOB, b'hello\n' * 100), blob)
+        tree = writer.add(gitobjects.OBJ_TREE, gitobjects.encode_tree(
+            [(gitobjects.MODE_FILE, b'README.md', blob)]
+        ))
+        signature = 'tester <tester@example.com> 1700000000 +0800'
+        commit = writer.add(gitobjects.OBJ_COMMIT, gitobjects.encode_commit(
+            tree, [], signature, signature, 'initial\n'
+        ))
+        self.assertEqual(writer.object_count, 3)
+        pack_path = writer.finish()
+
+        self._git('verify-pack', pack_path[:-len('.pack')] + '.idx')
+        self.assertEqual(self._git('cat-file', '-t', commit.hex()).strip(), b'commit')
+        self.assertEqual(self._git('cat-file', 'blob', blob.hex()), b'hello\n' * 100)
+
+    def test_duplicates_beyond_cache_are_dropped(self):
+        """测试超出去重窗口的重复对象在 finish() 时被剔除（内存排序与临时文件分桶）"""
+        for limit in (gitobjects.SORT_IN_MEMORY_BYTES, 0):
+            pack_dir = os.path.join(self.temp_dir, '.git', 'objects', 'pack')
+            shutil.rmtree(pack_dir, ignore_errors=True)
+            with patch('gitobjects.SORT_IN_MEMORY_BYTES', limit):
+                writer = gitobjects.PackWriter(pack_dir, dedup_cache=2)
+                blobs = [writer.add(gitobjects.OBJ_BLOB, b'%d\n' % (i % 500)) for i in range(2000)]
+                self.assertEqual(writer.object_count, 2000)
+                pack_path = writer.finish()
+
+            self.assertEqual(writer.object_count, 500)
+            output = self._git('verify-pack', '-v', pack_path[:-len('.pack')] + '.idx')
+            self.assertIn(b'non delta: 500 objects', output)
+            self.assertEqual(self._git('cat-file', 'blob', blobs[1234].hex()), b'234\n')
+            self.assertEqual(sorted(os.listdir(pack_dir)),
+                             sorted([os.path.basename(pack_path),
+                                     os.path.basename(pack_path)[:-len('.pack')] + '.idx']))
+
+    def test_empty_pack_is_discarded(self):
+        """测试没有对象时不会留下 pack 文件"""
+        pack_dir = os.path.join(self.temp_dir, 'packs')
+        writer = gitobjects.PackWriter(pack_dir)
+        self.assertIsNone(writer.finish())
+        self.assertEqual(os.listdir(pack_dir), [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+命令行日志配置测试模块
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import logsetup
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestLogSetup(unittest.TestCase):
+    """命令行日志配置测试类"""
+
+    def setUp(self):
+        """测试前的准备工作（暂时移除测试框架安装的根日志处理器）"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = logging.getLogger()
+        self.saved = self.root.handlers[:], self.root.level
+        self.root.handlers = []
+
+    def tearDown(self):
+        """测试后的清理工作"""
+        self.root.handlers, level = self.saved
+        self.root.setLevel(level)
+        shutil.rmtree(self.temp_dir)
+
+    def test_import_does_not_create_log_files(self):
+        """测试导入模块不会在当前目录创建日志文件"""
+        env = dict(os.environ, PYTHONPATH=ROOT)
+        subprocess.check_call([sys.executable, '-c',
+                               'import contribute, generate_realistic_contributions, fleet'],
+                              cwd=self.temp_dir, env=env)
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def test_session_writes_through_queue(self):
+        """测试会话期间的日志经队列写入文件，结束后恢复根日志记录器"""
+        path = os.path.join(self.temp_dir, 'run.log')
+        with logsetup.log_session(path, logging.INFO):
+            self.assertEqual(self.root.level, logging.INFO)
+            logging.getLogger('contribute').info("阶段信息")
+            logging.getLogger('contribute').debug("逐日记录")
+        with open(path, encoding='utf-8') as file:
+            content = file.read()
+        self.assertIn('INFO - 阶段信息', content)
+        self.assertNotIn('逐日记录', content)
+        self.assertEqual(self.root.handlers, [])
+
+    def test_existing_configuration_is_kept(self):
+        """测试已配置根日志记录器时不添加处理器、不创建日志文件"""
+        handler = logging.NullHandler()
+        self.root.addHandler(handler)
+        path = os.path.join(self.temp_dir, 'run.log')
+        with logsetup.log_session(path, logging.DEBUG):
+            self.assertEqual(self.root.handlers, [handler])
+            logging.getLogger('contribute').warning("警告")
+        self.assertFalse(os.path.exists(path))
+
+    def test_verbosity_arguments(self):
+        """测试 -v / -q 对应的日志级别"""
+        parser = argparse.ArgumentParser()
+        logsetup.add_verbosity_arguments(parser)
+        self.assertEqual(logsetup.log_level(parser.parse_args([])), logging.INFO)
+        self.assertEqual(logsetup.log_level(parser.parse_args(['-v'])), logging.DEBUG)
+        self.assertEqual(logsetup.log_level(parser.parse_args(['--quiet'])), logging.WARNING)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
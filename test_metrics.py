@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+运行指标测试模块
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+import contribute
+import metrics
+
+
+class TestMetrics(unittest.TestCase):
+    """运行指标测试类"""
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """测试后的清理工作"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_histogram_buckets(self):
+        """测试直方图分桶与累计次数"""
+        hist = metrics.Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            hist.observe(value)
+        self.assertEqual(hist.cumulative(), [(0.1, 2), (1.0, 3), (float('inf'), 4)])
+        self.assertEqual(hist.to_dict()['buckets'], {'0.1': 2, '1.0': 3, '+Inf': 4})
+        self.assertAlmostEqual(hist.sum, 3.65)
+
+    def test_exports(self):
+        """测试 JSON 与 Prometheus 格式导出"""
+        run = metrics.Metrics()
+        run.inc('commits', 3)
+        with run.timer('git_add'):
+            pass
+        json_path = os.path.join(self.temp_dir, 'metrics.json')
+        prom_path = os.path.join(self.temp_dir, 'metrics.prom')
+        run.write_json(json_path)
+        run.write_prometheus(prom_path)
+
+        with open(json_path, encoding='utf-8') as f:
+            data = json.load(f)
+        self.assertEqual(data['counters'], {'commits': 3})
+        self.assertEqual(data['phases']['git_add']['count'], 1)
+
+        with open(prom_path, encoding='utf-8') as f:
+            text = f.read()
+        self.assertIn('contribute_phase_seconds_bucket{phase="git_add",le="+Inf"} 1', text)
+        self.assertIn('contribute_phase_seconds_count{phase="git_add"} 1', text)
+        self.assertIn('contribute_commits_total 3', text)
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), ['metrics.json', 'metrics.prom'])
+
+    @patch('contribute.Popen')
+    def test_run_command_is_instrumented(self, mock_popen):
+        """测试 Git 命令按子命令统计耗时"""
+        mock_process = MagicMock()
+        mock_process.returncode = 0
+        mock_popen.return_value = mock_process
+
+        repo = contribute.GitRepository('test-repo')
+        repo._run_command(['git', 'add', '.'])
+        repo._run_command(['git', 'commit', '-m', 'x'])
+        repo._run_command(['git', 'commit', '-m', 'y'])
+
+        self.assertEqual(repo.metrics.histograms['git_add'].count, 1)
+        self.assertEqual(repo.metrics.histograms['git_commit'].count, 2)
+        self.assertEqual(repo.metrics.histograms['spawn'].count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+生成进度报告测试模块
+"""
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from datetime import datetime
+
+import contribute
+import progress
+
+
+class FakeClock:
+    """每次读取前进固定步长的时钟"""
+
+    def __init__(self, step):
+        self.now = 0.0
+        self.step = step
+        self.reads = 0
+
+    def __call__(self):
+        self.reads += 1
+        return self.now
+
+    def advance(self):
+        self.now += self.step
+
+
+class TestProgressReporter(unittest.TestCase):
+    """进度报告器测试类"""
+
+    def _run(self, mode, total, step, start=0):
+        """以每次提交 step 秒的速度执行 total 次提交，返回 (报告器, 时钟, 输出)"""
+        clock = FakeClock(step)
+        stream = io.StringIO()
+        reporter = progress.ProgressReporter(total, mode, stream, interval=1.0, window=5.0,
+                                             clock=clock)
+        reporter.start(start)
+        for done in range(start + 1, total + 1):
+            clock.advance()
+            reporter.update(done, datetime(2024, 1, 1 + done // 1000 % 28))
+        reporter.finish(total, datetime(2024, 1, 28))
+        return reporter, clock, stream.getvalue()
+
+    def test_json_lines(self):
+        """测试 JSON 模式按周期输出速度、预计剩余时间与当前日期"""
+        _, _, output = self._run('json', 20000, 0.001)
+        records = [json.loads(line) for line in output.splitlines()]
+        self.assertGreaterEqual(len(records), 18)
+        middle = records[len(records) // 2]
+        self.assertAlmostEqual(middle['rate'], 1000, delta=20)
+        self.assertAlmostEqual(middle['eta_seconds'], (20000 - middle['done']) / 1000, delta=0.5)
+        self.assertTrue(middle['date'].startswith('2024-01-'))
+        self.assertEqual(records[-1]['done'], 20000)
+        self.assertEqual(records[-1]['percent'], 100.0)
+        self.assertTrue(records[-1]['final'])
+
+    def test_clock_is_read_rarely(self):
+        """测试提交速度很高时每个报告周期只读取少量几次时钟"""
+        _, clock, _ = self._run('json', 200000, 0.00001)
+        # 总耗时 2 秒，每秒约检查 CHECKS_PER_INTERVAL 次
+        self.assertLess(clock.reads, 100)
+
+    def test_line_mode_and_resume(self):
+        """测试单行模式原地刷新，续跑时已完成的提交不计入速度"""
+        reporter, _, output = self._run('line', 3000, 0.002, start=1000)
+        self.assertTrue(output.startswith('\r进度 '))
+        self.assertTrue(output.endswith('\n'))
+        self.assertNotIn('\n', output[:-1])
+        self.assertIn('进度 3000/3000 (100.0%)', output.split('\r')[-1])
+        self.assertAlmostEqual(reporter.rate(reporter.clock()), 500, delta=10)
+        self.assertEqual(progress.format_duration(3725), '01:02:05')
+
+        with self.assertRaises(ValueError):
+            progress.ProgressReporter(10, 'xml')
+
+
+class TestProgressCommandLine(unittest.TestCase):
+    """命令行进度输出测试类"""
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+
+    def tearDown(self):
+        """测试后的清理工作"""
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir)
+
+    def test_progress_json_reports_total(self):
+        """测试 --progress=json 在标准错误输出最终进度"""
+        with redirect_stderr(io.StringIO()) as output:
+            contribute.main(['--days_before=20', '--frequency=100', '--max_commits=3', '--seed=1',
+                             '--backend=pack', '--no_maintenance', '--progress=json', '--workers=2',
+                             '-un', 'test-user', '-ue', 'test@example.com'])
+        final = json.loads(output.getvalue().splitlines()[-1])
+        self.assertTrue(final['final'])
+        self.assertEqual(final['done'], final['total'])
+        self.assertGreater(final['total'], 20)
+
+        with self.assertRaises(SystemExit):
+            contribute.main(['--progress=line', '--progress_interval=0'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+提交计划测试模块
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import datetime
+
+import schedule
+
+
+class TestSchedule(unittest.TestCase):
+    """提交计划测试类"""
+
+    def test_wall_seconds_round_trip(self):
+        """测试墙上时间秒数的双向转换"""
+        moment = datetime(2023, 3, 26, 2, 30, 15)
+        self.assertEqual(schedule.from_wall_seconds(schedule.to_wall_seconds(moment)), moment)
+
+    def test_plan_contributions(self):
+        """测试基本提交计划的范围与时间"""
+        start = datetime(2023, 1, 2, 20, 0)  # 周一
+        plan = schedule.plan_contributions(start, 70, max_commits=5, frequency=100,
+                                           no_weekends=True, seed=1)
+        self.assertEqual(plan.days, 70)
+        self.assertEqual(len(plan), sum(plan.day_counts))
+        for day, count in enumerate(plan.day_counts):
+            if day % 7 >= 5:
+                self.assertEqual(count, 0)
+            else:
+                self.assertTrue(1 <= count <= 5)
+
+        days = list(plan.iter_days())
+        self.assertEqual(days[1][0], datetime(2023, 1, 3, 20, 0))
+        times = [commit_time for commit_time, _ in days[1][1]]
+        self.assertEqual(times[0], datetime(2023, 1, 3, 20, 0))
+        self.assertEqual(times[-1], datetime(2023, 1, 3, 20, len(times) - 1))
+        self.assertTrue(all(0 <= index < 10 for index in plan.messages))
+
+    def test_frequency_zero_plans_nothing(self):
+        """测试频率为 0 时没有提交"""
+        plan = schedule.plan_contributions(datetime(2023, 1, 1), 30, frequency=0, seed=1)
+        self.assertEqual(len(plan), 0)
+        self.assertEqual(list(plan.commits()), [])
+
+    def test_seed_is_deterministic(self):
+        """测试相同种子生成相同计划"""
+        start = datetime(2023, 1, 1, 20, 0)
+        first = schedule.plan_contributions(start, 100, seed=42)
+        second = schedule.plan_contributions(start, 100, seed=42)
+        self.assertEqual(first.timestamps, second.timestamps)
+        self.assertEqual(first.messages, second.messages)
+
+    def test_schedule_file_round_trip(self):
+        """测试计划文件写入后映射得到相同的计划"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, 'schedule')
+            for plan in (schedule.plan_contributions(datetime(2023, 1, 1, 20, 0), 101, seed=3),
+                         schedule.plan_contributions(datetime(2023, 1, 1, 20, 0), 5, frequency=0)):
+                schedule.write_schedule(plan, path)
+                self.assertEqual(os.path.getsize(path),
+                                 schedule.SCHEDULE_HEADER.size + -(-plan.days * 2 // 8) * 8
+                                 + len(plan) * 9)
+                loaded = schedule.load_schedule(path)
+                self.assertIsInstance(loaded.timestamps, memoryview)
+                self.assertEqual((loaded.start, loaded.days, len(loaded)),
+                                 (plan.start, plan.days, len(plan)))
+                self.assertEqual(list(loaded.commits(3)), list(plan.commits(3)))
+                self.assertEqual(list(loaded.iter_days()), list(plan.iter_days()))
+                self.assertEqual(loaded.window(2, 9), plan.window(2, 9))
+
+            with open(path, 'r+b') as file:
+                file.truncate(os.path.getsize(path) - 1)
+            with self.assertRaises(ValueError):
+                schedule.load_schedule(path)
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_plan_realistic_breaks(self):
+        """测试真实模式的工作期与中断期"""
+        plan = schedule.plan_realistic(datetime(2020, 1, 1, 15, 0), datetime(2022, 12, 31),
+                                       message_count=20, seed=7)
+        self.assertEqual(plan.days, 1096)
+
+        runs = []
+        current, length = None, 0
+        for count in plan.day_counts:
+            flag = count > 0
+            if flag == current:
+                length += 1
+            else:
+                if current is not None:
+                    runs.append((current, length))
+                current, length = flag, 1
+        for flag, length in runs[:-1]:
+            if flag:
+                self.assertTrue(4 <= length <= 8)
+            else:
+                self.assertTrue(1 <= length <= 3)
+
+        for day, commits in plan.iter_days():
+            times = [commit_time for commit_time, _ in commits]
+            self.assertEqual(times, sorted(times))
+            for commit_time in times:
+                self.assertEqual(commit_time.date(), day.date())
+                self.assertTrue(9 <= commit_time.hour <= 23)
+
+    def test_century_plan_is_fast(self):
+        """测试规划 100 年的提交计划耗时很短"""
+        started = time.perf_counter()
+        plan = schedule.plan_contributions(datetime(1925, 1, 1, 20, 0), 36500,
+                                           max_commits=20, frequency=80, seed=3)
+        elapsed = time.perf_counter() - started
+        self.assertGreater(len(plan), 100000)
+        self.assertLess(elapsed, 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
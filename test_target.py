@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+目标图案测试模块
+"""
+
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+import unittest
+import zlib
+from collections import Counter
+from datetime import datetime
+from unittest.mock import patch
+
+import contribute
+import target
+
+
+def encode_png(rows, color_type=2, filter_type=1):
+    """编码 8 位 PNG（rows 为每行的像素通道值元组列表）"""
+    def chunk(kind, body):
+        return (struct.pack('>I', len(body)) + kind + body
+                + struct.pack('>I', zlib.crc32(kind + body)))
+
+    channels = target.PNG_CHANNELS[color_type]
+    raw = bytearray()
+    previous = bytes(len(rows[0]) * channels)
+    for row in rows:
+        line = bytes(value for pixel in row for value in pixel)
+        raw.append(filter_type)
+        if filter_type == 1:
+            line = bytes((line[i] - (line[i - channels] if i >= channels else 0)) & 0xff
+                         for i in range(len(line)))
+        elif filter_type == 2:
+            line = bytes((value - up) & 0xff for value, up in zip(line, previous))
+        previous = bytes(value for pixel in row for value in pixel)
+        raw += line
+    header = struct.pack('>IIBBBBB', len(rows[0]), len(rows), 8, color_type, 0, 0, 0)
+    return (target.PNG_SIGNATURE + chunk(b'IHDR', header)
+            + chunk(b'IDAT', zlib.compress(bytes(raw))) + chunk(b'IEND', b''))
+
+
+class TestTarget(unittest.TestCase):
+    """目标图案测试类"""
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """测试后的清理工作"""
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, name, data):
+        """在临时目录中写入文件"""
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_level_commits_are_minimal(self):
+        """测试各等级所需的最少提交次数"""
+        self.assertEqual(target.level_commits([0, 4]), {0: 0, 4: 1})
+        self.assertEqual(target.level_commits([0, 2, 4]), {0: 0, 2: 1, 4: 2})
+        self.assertEqual(target.level_commits([3, 4]), {0: 0, 3: 2, 4: 3})
+        self.assertEqual(target.level_commits([1, 2, 3, 4]), {0: 0, 1: 1, 2: 2, 3: 3, 4: 4})
+        # 最大强度不足 4 时按比例放大
+        self.assertEqual(target.level_commits([0, 1, 2]), {0: 0, 1: 1, 2: 2})
+
+        for levels in ([1, 4], [1, 3, 4], [2, 3, 4], [1, 2, 4]):
+            commits = target.level_commits(levels)
+            peak = max(commits.values())
+            for level in levels:
+                # 贡献图的等级: ceil(提交数 / 最多一天的提交数 * 4)
+                self.assertEqual(-(-commits[level] * 4 // peak), level)
+
+    def test_text_grid(self):
+        """测试文本网格的解析与补齐"""
+        path = self._write('target.txt', b'#.\n 12\n\n')
+        grid = target.load_target(path)
+        self.assertEqual(len(grid), target.GRID_ROWS)
+        self.assertEqual(grid[:3], [[4, 0, 0], [0, 1, 2], [0, 0, 0]])
+        self.assertEqual(target.day_counts(grid)[:8], [4, 0, 0, 0, 0, 0, 0, 0])
+
+        # 只显示前 days 天时最大强度也只在这些天中计算
+        self.assertEqual(target.day_counts(grid, 8), [1, 0, 0, 0, 0, 0, 0, 0])
+        self.assertEqual(target.day_counts(grid, 1), [1])
+
+        for data in (b'x\n', b'\n' * 3, b'1\n' * 8, b'1' * 54):
+            with self.assertRaises(ValueError):
+                target.load_target(self._write('bad.txt', data))
+
+    def test_png_grid(self):
+        """测试 PNG 网格按颜色深浅量化（RGB 与灰度+透明度，不同过滤类型）"""
+        white, black, grey = (255, 255, 255), (0, 0, 0), (128, 128, 128)
+        rows = [[black, grey, white]] * 7
+        expected = [[4, 2, 0]] * 7
+        self.assertEqual(target.load_target(self._write('rgb.png', encode_png(rows))), expected)
+        self.assertEqual(target.load_target(
+            self._write('up.png', encode_png(rows, filter_type=2))), expected)
+
+        alpha = [[(0, 255), (0, 0), (255, 255)]] * 7
+        self.assertEqual(target.load_target(self._write('la.png', encode_png(alpha, 4))),
+                         [[4, 0, 0]] * 7)
+
+    def test_grid_start_is_sunday(self):
+        """测试网格从 52 周前的周日开始"""
+        start = target.grid_start(datetime(2024, 3, 6, 20, 0))
+        self.assertEqual(start, datetime(2023, 3, 5, 20, 0))
+        self.assertEqual(start.weekday(), 6)
+        self.assertEqual(target.grid_start(datetime(2024, 3, 3)), datetime(2023, 3, 5))
+
+    def test_target_mode_generates_only_required_commits(self):
+        """测试目标图案模式只生成所需的提交"""
+        path = self._write('target.txt', b'4.2\n.4.\n2.4\n')
+
+        class Now(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return cls(2024, 3, 6, 9, 30)
+
+        original_cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+        try:
+            with patch('contribute.datetime', Now):
+                contribute.main(['--target', path, '--backend=pack', '--no_maintenance'])
+            [directory] = [name for name in os.listdir(self.temp_dir)
+                           if name.startswith('repository-')]
+            # 命令行会在当前目录写出日志文件，在临时目录中执行
+            with self.assertRaises(SystemExit):
+                contribute.main(['--target', path, '--append', directory])
+        finally:
+            os.chdir(original_cwd)
+
+        dates = subprocess.check_output(
+            ['git', 'log', '--format=%ad', '--date=short'], cwd=os.path.join(self.temp_dir, directory)
+        ).decode().split()
+        # 网格从 2023-03-05（周日）开始，每列依次为周日、周一、周二……
+        self.assertEqual(Counter(dates), {'2023-03-05': 2, '2023-03-07': 1, '2023-03-13': 2,
+                                          '2023-03-19': 1, '2023-03-21': 2})
+
+    def test_target_mode_has_no_future_commits(self):
+        """测试完整网格只生成到昨天的提交，不生成未来日期的提交"""
+        path = self._write('full.txt', ('#' * target.GRID_COLUMNS + '\n').encode() * target.GRID_ROWS)
+
+        class Now(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return cls(2026, 10, 18, 21, 30)
+
+        original_cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+        try:
+            with patch('contribute.datetime', Now):
+                contribute.main(['--target', path, '--backend=pack', '--no_maintenance'])
+        finally:
+            os.chdir(original_cwd)
+
+        [directory] = [name for name in os.listdir(self.temp_dir) if name.startswith('repository-')]
+        dates = subprocess.check_output(
+            ['git', 'log', '--format=%ad', '--date=format:%Y-%m-%d %H:%M:%S'],
+            cwd=os.path.join(self.temp_dir, directory)
+        ).decode().splitlines()
+        moments = [datetime.strptime(date, '%Y-%m-%d %H:%M:%S') for date in dates]
+        self.assertLess(max(moments), datetime(2026, 10, 18))
+        self.assertEqual(min(moments).date(), target.grid_start(datetime(2026, 10, 18)).date())
+        # 全部为最高强度时每天只需一次提交
+        self.assertEqual(len(moments), len(set(moment.date() for moment in moments)))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+贡献日历校验测试模块
+"""
+
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import date, datetime
+from unittest.mock import patch
+
+import contribute
+import verify
+
+
+class Now(datetime):
+    """固定当前时间的 datetime"""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2024, 3, 6, 9, 30)
+
+
+class TestVerify(unittest.TestCase):
+    """贡献日历校验测试类（使用真实 Git）"""
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+        with patch('contribute.datetime', Now):
+            contribute.main(['--days_before=30', '--frequency=60', '--max_commits=4', '--seed=3',
+                             '--backend=fast-import', '--no_maintenance',
+                             '-un', 'test-user', '-ue', 'test@example.com'])
+        [directory] = [name for name in os.listdir(self.temp_dir) if name != contribute.LOG_FILE]
+        self.repo_dir = os.path.join(self.temp_dir, directory)
+
+    def tearDown(self):
+        """测试后的清理工作"""
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir)
+
+    def test_counts_match_plan(self):
+        """测试按天计数与提交计划一致"""
+        actual = verify.read_day_counts(self.repo_dir)
+        planned = verify.planned_day_counts(self.repo_dir)
+        count = subprocess.check_output(['git', 'rev-list', '--count', 'HEAD'], cwd=self.repo_dir)
+        self.assertEqual(sum(actual.counts), int(count))
+        self.assertEqual(sum(planned.counts), int(count))
+        self.assertEqual(planned.first, date(2024, 2, 5))
+        self.assertEqual(verify.diff_counts(actual, planned), [])
+
+        lines = verify.heatmap(actual, weeks=6).splitlines()
+        self.assertEqual(len(lines), 7)
+        self.assertTrue(all(len(line) == len('日 ') + 6 for line in lines))
+
+    def test_extra_commit_is_reported(self):
+        """测试计划之外的提交在对比中列出，并以非零状态退出"""
+        planned = verify.planned_day_counts(self.repo_dir)
+        day = next(day for day, count in planned.items() if count == 0)
+        env = dict(os.environ, GIT_COMMITTER_DATE=f'{day} 12:00:00')
+        subprocess.check_call(['git', 'commit', '-q', '--allow-empty', '-m', 'manual',
+                               '--date', f'{day} 12:00:00'], cwd=self.repo_dir, env=env)
+
+        differences = verify.diff_counts(verify.read_day_counts(self.repo_dir), planned)
+        self.assertEqual(differences, [(day, 0, 1)])
+        with redirect_stdout(io.StringIO()) as output:
+            with self.assertRaises(SystemExit):
+                verify.main([self.repo_dir])
+        self.assertIn(f'{day}  计划 0  实际 1', output.getvalue())
+
+    def test_repository_without_journal(self):
+        """测试没有续跑日志时跳过对比"""
+        shutil.rmtree(os.path.join(self.repo_dir, '.git', 'contribute'))
+        self.assertIsNone(verify.planned_day_counts(self.repo_dir))
+        with redirect_stdout(io.StringIO()) as output:
+            verify.main([self.repo_dir, '--list_days'])
+        self.assertIn('跳过与提交计划的对比', output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
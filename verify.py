@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+贡献日历校验
+读取已生成仓库的提交日期，输出按天的提交数、终端热力图，并与续跑日志中的
+提交计划逐日对比：
+- 以流的方式逐行读取 git log 的作者日期，只按日期计数，内存与提交数无关
+- 热力图按贡献图的规则（相对于最多一天的比例）分为 0-4 级
+- 存在续跑日志时映射其中保存的提交计划（旧日志按配置重建），列出计划与实际不一致的日期
+
+用法:
+  python verify.py repository-2024-01-01-20-00-00
+  python verify.py repos/alice --weeks 26 --list_days
+"""
+
+import argparse
+import logging
+import subprocess
+import sys
+from array import array
+from datetime import date, timedelta
+from subprocess import Popen
+
+from contribute import plan_from_settings
+from journal import Journal
+from schedule import from_wall_seconds
+from target import GRID_COLUMNS, GRID_ROWS, contribution_level
+
+logger = logging.getLogger(__name__)
+
+# 热力图各强度等级使用的字符
+HEATMAP_CHARS = '·░▒▓█'
+WEEKDAY_LABELS = '日一二三四五六'
+
+# 逐日对比时最多列出的不一致日期数
+MAX_DIFF_LINES = 20
+
+
+class DayCounts:
+    """按天的提交数（从 first 开始的连续日期）"""
+
+    def __init__(self, first, counts):
+        self.first = first
+        self.counts = counts
+
+    @property
+    def last(self):
+        """最后一天"""
+        return self.first + timedelta(days=len(self.counts) - 1)
+
+    def get(self, day):
+        """返回指定日期的提交数，超出范围时为 0"""
+        index = (day - self.first).days if self.first else -1
+        return self.counts[index] if 0 <= index < len(self.counts) else 0
+
+    def items(self):
+        """依次返回 (日期, 提交数)"""
+        for offset, count in enumerate(self.counts):
+            yield self.first + timedelta(days=offset), count
+
+
+def read_day_counts(directory):
+    """流式读取仓库全部提交的作者日期（提交者所在时区），按天计数"""
+    process = Popen(['git', 'log', '--format=%ad', '--date=short'], cwd=directory,
+                    stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    # 只按日期字符串计数，内存只与天数相关
+    by_date = {}
+    for line in process.stdout:
+        by_date[line] = by_date.get(line, 0) + 1
+    stderr = process.stderr.read()
+    process.wait()
+    if process.returncode != 0:
+        raise ValueError(f"读取提交历史失败: {stderr.decode('utf-8', 'replace').strip()}")
+
+    days = {date.fromisoformat(line.decode('ascii').strip()): count
+            for line, count in by_date.items()}
+    if not days:
+        return DayCounts(None, array('I'))
+    first = min(days)
+    counts = array('I', bytes(4 * ((max(days) - first).days + 1)))
+    for day, count in days.items():
+        counts[(day - first).days] = count
+    return DayCounts(first, counts)
+
+
+def planned_day_counts(directory):
+    """根据续跑日志重建提交计划的按天提交数，没有日志时返回 None"""
+    try:
+        journal = Journal.load(directory)
+    except ValueError:
+        return None
+    schedule = journal.load_schedule()
+    if schedule is None:
+        schedule = plan_from_settings(journal.settings)
+    return DayCounts(from_wall_seconds(schedule.start).date(), array('I', schedule.day_counts))
+
+
+def diff_counts(actual, planned):
+    """逐日对比计划覆盖的日期，返回 [(日期, 计划提交数, 实际提交数), ...]"""
+    return [(day, count, actual.get(day)) for day, count in planned.items()
+            if actual.get(day) != count]
+
+
+def heatmap(day_counts, weeks=GRID_COLUMNS):
+    """按贡献图布局（每列一周，周日到周六）渲染最后 weeks 周的热力图"""
+    last = day_counts.last
+    start = last - timedelta(days=(last.weekday() + 1) % 7, weeks=weeks - 1)
+    days = [start + timedelta(days=offset) for offset in range(weeks * GRID_ROWS)]
+    peak = max((day_counts.get(day) for day in days), default=0)
+    lines = []
+    for row in range(GRID_ROWS):
+        cells = ''.join(
+            HEATMAP_CHARS[contribution_level(day_counts.get(day), peak)] if day <= last else ' '
+            for day in days[row::GRID_ROWS]
+        )
+        lines.append(f"{WEEKDAY_LABELS[row]} {cells}")
+    return '\n'.join(lines)
+
+
+def print_report(actual, planned, weeks, list_days=False):
+    """输出校验报告，返回计划与实际不一致的天数"""
+    if actual.first is None:
+        print("仓库中没有提交")
+    else:
+        total = sum(actual.counts)
+        active = sum(1 for count in actual.counts if count)
+        print(f"📅 {actual.first} 至 {actual.last}: {total} 次提交，{active} 天有提交，"
+              f"单日最多 {max(actual.counts)} 次")
+        if list_days:
+            for day, count in actual.items():
+                if count:
+                    print(f"{day}  {count}")
+        print()
+        print(heatmap(actual, weeks))
+
+    if planned is None:
+        print("\n未找到续跑日志，跳过与提交计划的对比")
+        return 0
+    differences = diff_counts(actual, planned)
+    if not differences:
+        print(f"\n✅ 与提交计划一致（{planned.first} 至 {planned.last}）")
+        return 0
+    print(f"\n❌ 与提交计划不一致的日期: {len(differences)} 天")
+    for day, expected, count in differences[:MAX_DIFF_LINES]:
+        print(f"{day}  计划 {expected}  实际 {count}")
+    if len(differences) > MAX_DIFF_LINES:
+        print(f"... 其余 {len(differences) - MAX_DIFF_LINES} 天未列出")
+    return len(differences)
+
+
+def main(argv=sys.argv[1:]):
+    """主函数"""
+    parser = argparse.ArgumentParser(description='校验已生成仓库的贡献日历')
+    parser.add_argument('directory', help="仓库目录")
+    parser.add_argument('--weeks', type=int, default=GRID_COLUMNS,
+                        help=f"热力图显示的周数 (默认: {GRID_COLUMNS})")
+    parser.add_argument('--list_days', action='store_true', default=False,
+                        help="逐行列出每天的提交数")
+    parser.add_argument('--no_plan', action='store_true', default=False,
+                        help="不与续跑日志中的提交计划对比")
+    args = parser.parse_args(argv)
+    if args.weeks < 1:
+        parser.error("weeks 必须大于 0")
+
+    try:
+        actual = read_day_counts(args.directory)
+        planned = None if args.no_plan else planned_day_counts(args.directory)
+    except (OSError, ValueError) as e:
+        logger.error(f"校验失败: {e}")
+        sys.exit(1)
+    if print_report(actual, planned, args.weeks, args.list_days):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()